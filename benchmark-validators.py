@@ -0,0 +1,1287 @@
+#!/usr/bin/env python3
+"""
+Benchmark Script for the BlazeMetrics Frontend Validators
+=========================================================
+Regression benchmarks for the validation scripts.
+
+  suite        Generate synthetic frontends (src/ pages, App.tsx routes,
+               package.json) of increasing file count, run the three
+               validator scripts on each as subprocesses against a local
+               mock HTTP server, and report throughput, per-file and HTTP
+               latency percentiles and peak RSS. Results are written as
+               JSON; --baseline compares them with an earlier run.
+  scan         Generate large TSX files and check that link and code-block
+               extraction time grows linearly with file size.
+  content-jobs Validate the code examples of a synthetic doc tree with
+               --jobs 1, 2, 4, ... and report the speedup of the process
+               pool, for files the workers lex and files already scanned.
+  ux-patterns  Count the UX responsive/accessibility patterns over a
+               synthetic tree per check, as the checks once did, with
+               PatternCounter's one str.count per distinct pattern and with
+               AutomatonCounter's single Aho-Corasick pass.
+  link-stream  Check the external links of a synthetic tree against a local
+               HTTP server, once in phases (scan everything, then check) and
+               once streamed, comparing time to first result, total time and
+               peak memory. Then stream URLs of one host more slowly than
+               they are checked and check the requests keep --host-delay.
+  breaker      Check links on three local hosts that hang, reset every
+               connection and answer normally, with and without the per-host
+               circuit breaker, then again offline from the link cache.
+  requests     Check HEAD-refusing, empty, redirecting and duplicate URL variants
+               against a local server, with the previous strategy (full GET
+               fallback, every URL string checked) and with ranged GETs,
+               canonical URL deduplication and the redirect-target cache,
+               counting requests and body bytes served.
+  memory       Scan a link-heavy synthetic tree and compare the memory kept
+               by per-match link dicts and formatted finding strings with
+               the compact Link records and FindingLog columns.
+  sandbox      Check that sandboxed snippets cannot affect each other on a
+               reused worker, that timeouts, worker crashes and the memory
+               limit are reported, and time a few hundred snippets.
+  watch        Start validate-all's watch mode on a synthetic tree twice, with
+               a cold and then a warm manifest, and check that one edit is
+               revalidated into exactly the expected new finding.
+  bundles      Build a fixture dist/ tree with a Vite manifest, check that
+               the bundle budget checker maps chunks to routes and flags the
+               over-budget ones, that an unknown budget metric is reported
+               without checking budgets, and time serial vs threaded
+               compression.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import platform
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from validation.apiindex import BUILTIN_API
+from validation.bundles import BundleBudgetChecker
+from validation.corpus import SourceCorpus
+from validation.linkcache import LinkResultCache
+from validation.linkcheck import ExternalLinkChecker
+from validation.instrument import Instrumentation
+from validation.manifest import Manifest, validator_fingerprint
+from validation.patterns import AutomatonCounter
+from validation.report import Reporter
+from validation.sandbox import SnippetSandbox
+from validation.scripts import ROOT
+from validation.scripts import load_script
+from validation.textscan import iter_page_matches
+from validation.watch import WatchSession
+
+
+def generate_tsx(target_bytes: int) -> str:
+    """Build a synthetic page component of roughly target_bytes characters"""
+    block = '''      <section id="section-{i}" className="grid grid-cols-1 md:grid-cols-2 gap-4">
+        <Link to="/docs/metrics">Metrics guide {i}</Link>
+        <a href="https://github.com/2796gaurav/blazemetrics/issues/{i}">Issue {i}</a>
+        <img src="/images/logo.png" alt="Logo {i}" />
+        <nav aria-label="Step {i}" className="hidden md:flex lg:gap-4 xl:gap-6">
+          <button tabIndex={{0}} onKeyDown={{handleKey}} onFocus={{focus}}>Next</button>
+        </nav>
+        <p>See [the docs](/docs/getting-started) for step {i}.</p>
+        <CodeBlock code={{`from blazemetrics import BlazeMetricsClient
+client = BlazeMetricsClient()
+metrics = client.compute_metrics(candidates, references)  # {i}
+`}} />
+      </section>
+'''
+    parts = ['export default function Synthetic() {\n  return (\n    <div>\n']
+    size = len(parts[0])
+    i = 0
+    while size < target_bytes:
+        chunk = block.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append('    </div>\n  );\n}\n')
+    return ''.join(parts)
+
+
+def generate_tree(root: Path, file_count: int, min_bytes: int = 2048, max_bytes: int = 16384,
+                  seed: int = 0) -> List[Path]:
+    """Write file_count synthetic page components of varying size under root/src/pages"""
+    rng = random.Random(seed)
+    pages = root / "src" / "pages"
+    paths = []
+    for i in range(file_count):
+        directory = pages / f"group{i // 500:03d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"Page{i:05d}.tsx"
+        path.write_text(generate_tsx(rng.randint(min_bytes, max_bytes)), encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def generate_dist(root: Path, route_count: int, chunk_kb: int, heavy_routes: int,
+                  seed: int = 0) -> List[Dict[str, Any]]:
+    """Write a Vite-style dist/ (index.html, assets, .vite/manifest.json) with one lazy chunk per route
+
+    The first heavy_routes routes also import a shared chunk ten times chunk_kb
+    in size. Returns the matching route list as parse_routes would.
+    """
+    rng = random.Random(seed)
+    assets = root / "assets"
+    (root / ".vite").mkdir(parents=True, exist_ok=True)
+    assets.mkdir(parents=True, exist_ok=True)
+
+    def write_chunk(name: str, size_kb: int) -> str:
+        # Repetitive identifiers with random numbers compress roughly like minified JS
+        parts = []
+        size = 0
+        while size < size_kb * 1024:
+            part = f"const v{rng.randint(0, 99999)}=e(\"{rng.randint(0, 1 << 30):x}\",{rng.random():.6f});"
+            parts.append(part)
+            size += len(part)
+        (assets / name).write_text(''.join(parts), encoding='utf-8')
+        return f"assets/{name}"
+
+    manifest: Dict[str, Any] = {
+        "index.html": {"file": write_chunk("index-a1b2c3.js", chunk_kb * 2), "src": "index.html",
+                       "isEntry": True, "imports": ["_vendor-d4e5f6.js"], "css": []},
+        "_vendor-d4e5f6.js": {"file": write_chunk("vendor-d4e5f6.js", chunk_kb * 4)},
+        "_charts-0a1b2c.js": {"file": write_chunk("charts-0a1b2c.js", chunk_kb * 10)},
+    }
+    (assets / "index-a1b2c3.css").write_text(".a{color:red}" * 2000, encoding='utf-8')
+    manifest["index.html"]["css"].append("assets/index-a1b2c3.css")
+
+    routes = []
+    for i in range(route_count):
+        source = f"src/pages/Page{i:03d}.tsx"
+        manifest[source] = {
+            "file": write_chunk(f"Page{i:03d}-{i:06x}.js", chunk_kb),
+            "src": source,
+            "isDynamicEntry": True,
+            "imports": ["_vendor-d4e5f6.js"] + (["_charts-0a1b2c.js"] if i < heavy_routes else []),
+        }
+        routes.append({'path': f"/page-{i}", 'component': f"Page{i:03d}", 'file': source})
+
+    (root / "index.html").write_text(
+        '<!doctype html><html><head>'
+        '<script type="module" crossorigin src="/assets/index-a1b2c3.js"></script>'
+        '<link rel="modulepreload" crossorigin href="/assets/vendor-d4e5f6.js">'
+        '<link rel="stylesheet" crossorigin href="/assets/index-a1b2c3.css">'
+        '</head><body><div id="root"></div></body></html>', encoding='utf-8')
+    with open(root / ".vite" / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return routes
+
+SUITE_SCRIPTS = {
+    'links': ('validate-links.py', '--no-cache', '--host-delay', '0', '--timeout', '5'),
+    'content': ('validate-content.py',),
+    'ux': ('test-ux.py',),
+}
+# The phase whose calls are one unit of work (a file, a request) for each script's latency percentiles
+SUITE_UNIT_PHASES = {
+    'links': ('LinkValidator.extract_links_from_file', 'ExternalLinkChecker.check_url'),
+    'content': ('ContentValidator._collect_code_findings',),
+    'ux': ('UXValidator.pattern_counts',),
+}
+FILLER = ("BlazeMetrics computes text metrics, guardrails and analytics for LLM outputs in one pass. "
+          "Each section below walks through a part of the API with a runnable example. ")
+
+
+def generate_frontend_tree(root: Path, file_count: int, file_kb: float, links_per_kb: float,
+                           external_ratio: float, external_urls: int, code_blocks: int, hosts: int,
+                           port: int, seed: int = 0) -> Dict[str, int]:
+    """Write a synthetic frontend: doc pages under src/pages/docs, App.tsx routing to all of them,
+    main.tsx, package.json and vite.config.ts
+
+    Internal links point at other generated pages; external links are drawn
+    from external_urls URLs on hosts loopback addresses of port. Returns the
+    counts of what was written.
+    """
+    rng = random.Random(seed)
+    src = root / "src"
+    stats = {'files': 0, 'bytes': 0, 'links': 0, 'external_links': 0, 'code_blocks': 0}
+    urls = [f"http://127.0.0.{2 + i % hosts}:{port}/ref/{i}" for i in range(max(1, external_urls))]
+    links_per_file = max(0, round(file_kb * links_per_kb))
+    target = int(file_kb * 1024)
+    imports, routes = [], []
+
+    for i in range(file_count):
+        links = []
+        for _ in range(links_per_file):
+            if rng.random() < external_ratio:
+                links.append(f'<a href="{rng.choice(urls)}">Reference</a>')
+                stats['external_links'] += 1
+            else:
+                links.append(f'<Link to="/docs/page-{rng.randrange(file_count)}">Related page</Link>')
+        stats['links'] += len(links)
+        constants = ''.join(f'const example{k} = `from blazemetrics import BlazeMetricsClient\n'
+                            f'client = BlazeMetricsClient()\n'
+                            f'metrics = client.compute_metrics(candidates, references)  # {i}-{k}\n`;\n\n'
+                            for k in range(code_blocks))
+        stats['code_blocks'] += code_blocks
+        head = (f"import {{ Link }} from 'react-router-dom';\n\n{constants}"
+                f"export default function Page{i}() {{\n  return (\n    <div className=\"space-y-6\">\n")
+        parts, size, section = [head], len(head), 0
+        while size < target or links or section < code_blocks:
+            chunk = (f'      <section id="section-{section}" className="grid grid-cols-1 md:grid-cols-2 gap-4">\n'
+                     f'        <h2>Section {section}</h2>\n        <p>{FILLER}{" ".join(links[:4])}</p>\n'
+                     + (f'        <CodeBlock code={{example{section}}} />\n' if section < code_blocks else '')
+                     + '      </section>\n')
+            del links[:4]
+            parts.append(chunk)
+            size += len(chunk)
+            section += 1
+        parts.append('    </div>\n  );\n}\n')
+        body = ''.join(parts)
+        directory = src / "pages" / "docs" / f"group{i // 500:03d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"Page{i:05d}.tsx").write_text(body, encoding='utf-8')
+        stats['files'] += 1
+        stats['bytes'] += len(body.encode('utf-8'))
+        imports.append(f"const Page{i} = lazy(() => import('./pages/docs/group{i // 500:03d}/Page{i:05d}'));")
+        routes.append(f'          <Route path="/docs/page-{i}" element={{<Page{i} />}} />')
+
+    (src / "App.tsx").write_text(
+        "import { lazy, Suspense } from 'react';\n"
+        "import { BrowserRouter, Routes, Route } from 'react-router-dom';\n\n" + '\n'.join(imports) +
+        "\n\nexport default function App() {\n  return (\n    <BrowserRouter>\n      <Suspense fallback={null}>\n"
+        "        <Routes>\n" + '\n'.join(routes) + "\n        </Routes>\n      </Suspense>\n    </BrowserRouter>\n"
+        "  );\n}\n", encoding='utf-8')
+    (src / "main.tsx").write_text(
+        "import ReactDOM from 'react-dom/client';\nimport App from './App';\n\n"
+        "ReactDOM.createRoot(document.getElementById('root')!).render(<App />);\n", encoding='utf-8')
+    (root / "package.json").write_text(json.dumps({
+        'name': 'synthetic-frontend', 'private': True,
+        'dependencies': {'react': '^18.2.0', 'react-dom': '^18.2.0', 'react-router-dom': '^6.20.0'},
+    }, indent=2), encoding='utf-8')
+    (root / "vite.config.ts").write_text(
+        "import { defineConfig } from 'vite';\nimport react from '@vitejs/plugin-react';\n\n"
+        "export default defineConfig({ plugins: [react()] });\n", encoding='utf-8')
+    return stats
+
+
+def run_suite_script(name: str, root: Path, timings_path: Path) -> Dict[str, Any]:
+    """Run one validator script on root in a subprocess; wall/CPU time, peak RSS and its timing summary"""
+    script, *options = SUITE_SCRIPTS[name]
+    command = [sys.executable, str(ROOT / script), *options, '--no-incremental', '--timings', str(timings_path)]
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=root, stdout=subprocess.DEVNULL, stderr=stderr)
+        # wait4 gives this child's own resource usage, unlike RUSAGE_CHILDREN
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        stderr.seek(0)
+        errors = stderr.read().decode('utf-8', 'replace')
+    if not timings_path.exists():
+        raise RuntimeError(f"{script} exited with {process.returncode} without timings:\n{errors[-2000:]}")
+    return {
+        'exit_code': process.returncode,
+        'wall_s': round(wall, 4),
+        'cpu_s': round(usage.ru_utime + usage.ru_stime, 4),
+        # Linux reports kB, macOS bytes
+        'peak_rss_mb': round(usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1),
+        'timings': json.loads(timings_path.read_text(encoding='utf-8')),
+    }
+
+
+def suite_metrics(name: str, run: Dict[str, Any], tree: Dict[str, int]) -> Dict[str, Any]:
+    """Throughput and latency figures of one script run over a generated tree"""
+    wall = run['wall_s']
+    metrics = {
+        'exit_code': run['exit_code'],
+        'wall_s': wall,
+        'cpu_s': run['cpu_s'],
+        'peak_rss_mb': run['peak_rss_mb'],
+        'files_per_s': round(tree['files'] / wall, 1),
+        'mb_per_s': round(tree['bytes'] / (1024 * 1024) / wall, 2),
+    }
+    if name == 'links':
+        metrics['links_per_s'] = round(tree['links'] / wall, 1)
+    elif name == 'content':
+        metrics['code_blocks_per_s'] = round(tree['code_blocks'] / wall, 1)
+    phases = run['timings']['phases']
+    metrics['latency'] = {phase: {key: value for key, value in phases[phase].items()
+                                  if key.startswith('p') and key.endswith('_ms') or key == 'max_ms'}
+                          for phase in SUITE_UNIT_PHASES[name] if phase in phases}
+    metrics['phases_s'] = {phase: stats['wall_s'] for phase, stats in phases.items()}
+    return metrics
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare_suite(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> bool:
+    """Print wall-time ratios against a baseline result file; False if any exceeds max_regression"""
+    before = {(run['tree']['files'], name): metrics['wall_s']
+              for run in baseline['runs'] for name, metrics in run['validators'].items()}
+    ok = True
+    print(f"\nCompared with {baseline['commit']} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(baseline['timestamp']))}):")
+    for run in results['runs']:
+        for name, metrics in run['validators'].items():
+            old = before.get((run['tree']['files'], name))
+            if old is None:
+                continue
+            ratio = metrics['wall_s'] / old
+            regressed = ratio > max_regression
+            ok = ok and not regressed
+            print(f"{'❌' if regressed else '✅'} {name:>8} @ {run['tree']['files']:>6} files: "
+                  f"{old:.2f}s -> {metrics['wall_s']:.2f}s ({ratio:.2f}x)")
+    return ok
+
+
+def bench_suite(args) -> bool:
+    """Run every validator over synthetic trees of each size and record the results as JSON"""
+    server = start_server(args.latency)
+    port = server.server_address[1]
+    config = {key: value for key, value in vars(args).items() if key not in ('func', 'output', 'baseline')}
+    results = {'commit': git_commit(), 'timestamp': time.time(), 'python': platform.python_version(),
+               'config': config, 'runs': []}
+    try:
+        for file_count in args.files:
+            with tempfile.TemporaryDirectory() as tmp:
+                root = Path(tmp)
+                start = time.perf_counter()
+                tree = generate_frontend_tree(root, file_count, args.file_kb, args.links_per_kb, args.external_ratio,
+                                              args.external_urls, args.code_blocks, args.hosts, port, args.seed)
+                tree['generate_s'] = round(time.perf_counter() - start, 3)
+                validators = {}
+                for name in args.validators:
+                    run = run_suite_script(name, root, root / f"{name}-timings.json")
+                    validators[name] = suite_metrics(name, run, tree)
+                results['runs'].append({'tree': tree, 'validators': validators})
+    finally:
+        server.shutdown()
+
+    print(f"{'files':>7} {'MB':>7} {'script':>8} {'wall':>8} {'CPU':>8} {'files/s':>9} {'MB/s':>7} "
+          f"{'items/s':>9} {'peak RSS':>9}  latency p50/p90/p99 ms")
+    for run in results['runs']:
+        tree = run['tree']
+        for name, metrics in run['validators'].items():
+            items = metrics.get('links_per_s', metrics.get('code_blocks_per_s', ''))
+            latency = '; '.join(f"{phase.split('.')[-1]} {values['p50_ms']}/{values['p90_ms']}/{values['p99_ms']}"
+                                for phase, values in metrics['latency'].items() if 'p50_ms' in values)
+            print(f"{tree['files']:>7} {tree['bytes'] / 2**20:>7.1f} {name:>8} {metrics['wall_s']:>7.2f}s "
+                  f"{metrics['cpu_s']:>7.2f}s {metrics['files_per_s']:>9.1f} {metrics['mb_per_s']:>7.2f} "
+                  f"{items:>9} {metrics['peak_rss_mb']:>7.1f}MB  {latency}")
+
+    output = args.output or Path(".validation-cache") / "benchmarks" / f"suite-{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Results written to {output}")
+
+    ok = all(run['validators'] for run in results['runs'])
+    if args.baseline:
+        ok = compare_suite(results, json.loads(args.baseline.read_text(encoding='utf-8')),
+                           args.max_regression) and ok
+    return ok
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> float:
+    """Best-of-N wall time for func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_scan(args) -> bool:
+    """Check that extraction cost per MB stays flat as files grow"""
+    links_module = load_script('validate-links.py')
+    content_module = load_script('validate-content.py')
+    rows: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes:
+            path = Path(tmp) / f"Synthetic{size_mb}.tsx"
+            path.write_text(generate_tsx(int(size_mb * 1024 * 1024)), encoding='utf-8')
+            # A fresh corpus per run so the read and scan are not served from cache
+            links_time = time_call(
+                lambda: links_module.LinkValidator(corpus=SourceCorpus(Path(tmp))).extract_links_from_file(path),
+                args.repeat)
+            code_time = time_call(
+                lambda: content_module.ContentValidator(corpus=SourceCorpus(Path(tmp))).extract_code_blocks(path),
+                args.repeat)
+            rows.append({
+                'size_mb': size_mb,
+                'links_s': links_time,
+                'code_s': code_time,
+                'links_s_per_mb': links_time / size_mb,
+                'code_s_per_mb': code_time / size_mb,
+            })
+
+    print(f"{'size':>8} {'links':>10} {'links/MB':>10} {'code':>10} {'code/MB':>10}")
+    for row in rows:
+        print(f"{row['size_mb']:>6.1f}MB {row['links_s']:>9.3f}s {row['links_s_per_mb']:>9.3f}s "
+              f"{row['code_s']:>9.3f}s {row['code_s_per_mb']:>9.3f}s")
+
+    # Linear scaling means seconds-per-MB at the largest size stays within a
+    # small factor of the smallest size; a quadratic scan grows with size.
+    first, last = rows[0], rows[-1]
+    ok = True
+    for key in ('links_s_per_mb', 'code_s_per_mb'):
+        ratio = last[key] / max(first[key], 1e-9)
+        status = "✅" if ratio <= args.max_ratio else "❌"
+        print(f"{status} {key} ratio {last['size_mb']}MB/{first['size_mb']}MB: {ratio:.2f} "
+              f"(limit {args.max_ratio})")
+        ok = ok and ratio <= args.max_ratio
+    return ok
+
+
+def run_content_jobs(content_module, root: Path, jobs: int, scanned: bool) -> Dict[str, Any]:
+    """Validate the code examples under root with a fresh corpus, optionally scanned beforehand"""
+    corpus = SourceCorpus(root)
+    validator = content_module.ContentValidator(corpus=corpus, jobs=jobs, reporter=Reporter(), api=BUILTIN_API)
+    paths = [source.path for source in corpus.files(('.tsx',)) if validator.is_doc_file(source.path)]
+    if scanned:
+        for path in paths:
+            corpus.get(path).scan_items
+    start = time.perf_counter()
+    ok = validator.validate_code_examples(paths)
+    return {'seconds': time.perf_counter() - start, 'ok': ok,
+            'findings': (list(validator.errors), list(validator.warnings))}
+
+
+def bench_content_jobs(args) -> bool:
+    """Time code example validation on the process pool at increasing --jobs"""
+    content_module = load_script('validate-content.py')
+    cpus = os.cpu_count() or 1
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        stats = generate_frontend_tree(root, args.files, args.file_kb, links_per_kb=1, external_ratio=0,
+                                       external_urls=1, code_blocks=args.code_blocks, hosts=1, port=1)
+        print(f"{stats['files']} files, {stats['bytes'] / (1024 * 1024):.1f} MB, "
+              f"{stats['code_blocks']} code blocks, {cpus} CPUs")
+        print(f"{'files':>9} {'jobs':>5} {'time':>9} {'speedup':>8} {'efficiency':>11}")
+        for scanned in (False, True):
+            label = 'scanned' if scanned else 'unscanned'
+            runs = {jobs: min((run_content_jobs(content_module, root, jobs, scanned) for _ in range(args.repeat)),
+                              key=lambda run: run['seconds'])
+                    for jobs in args.jobs}
+            serial = runs[args.jobs[0]]
+            for jobs, run in runs.items():
+                speedup = serial['seconds'] / run['seconds'] * args.jobs[0]
+                efficiency = speedup / jobs
+                same = run['findings'] == serial['findings'] and run['ok'] == serial['ok']
+                # Scaling can only be expected up to the CPUs there are
+                scales = efficiency >= args.min_efficiency or jobs > cpus
+                ok = ok and same and scales
+                status = "✅" if same and scales else "❌"
+                note = ("" if same else " findings differ from the first run") + \
+                       ("" if scales else f" below {args.min_efficiency:.0%} efficiency") + \
+                       (f" (not checked: only {cpus} CPUs)" if jobs > cpus else "")
+                print(f"{label:>9} {jobs:>5} {run['seconds']:>8.3f}s {speedup:>7.2f}x {efficiency:>10.0%}  "
+                      f"{status}{note}")
+    return ok
+
+
+def bench_ux_patterns(args) -> bool:
+    """Compare counting per check, per distinct pattern (PatternCounter) and in one pass (AutomatonCounter)"""
+    ux_module = load_script('test-ux.py')
+    responsive = ux_module.RESPONSIVE_PATTERNS
+    accessibility = ux_module.ACCESSIBILITY_PATTERNS
+    counter = ux_module.UX_PATTERN_COUNTER
+    automaton = AutomatonCounter(counter.patterns)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = generate_tree(Path(tmp), args.files)
+        texts = [path.read_text(encoding='utf-8') for path in paths]
+    total_mb = sum(len(text) for text in texts) / (1024 * 1024)
+
+    def per_check():
+        results = []
+        for text in texts:
+            responsive_count = sum(text.count(pattern) for pattern in responsive)
+            categories = {category: sum(text.count(pattern) for pattern in patterns)
+                          for category, patterns in accessibility.items()}
+            results.append((responsive_count, categories))
+        return results
+
+    def counted_with(pattern_counter):
+        def count_all():
+            results = []
+            for text in texts:
+                counts = pattern_counter.count(text)
+                responsive_count = sum(counts[pattern] for pattern in responsive)
+                results.append((responsive_count, pattern_counter.by_category(counts, accessibility)))
+            return results
+        return count_all
+
+    expected = per_check()
+    approaches = [('str.count per check', per_check), ('PatternCounter', counted_with(counter)),
+                  ('AutomatonCounter', counted_with(automaton))]
+    same = all(count_all() == expected for _, count_all in approaches[1:])
+    times = [(name, time_call(count_all, args.repeat)) for name, count_all in approaches]
+    baseline = times[0][1]
+
+    print(f"{args.files} files, {total_mb:.1f} MB, {len(counter.patterns)} distinct patterns")
+    print(f"{'approach':>22} {'time':>9} {'files/s':>10} {'MB/s':>8} {'speedup':>8}")
+    for name, seconds in times:
+        print(f"{name:>22} {seconds:>8.3f}s {args.files / seconds:>10.0f} {total_mb / seconds:>8.1f} "
+              f"{baseline / seconds:>7.2f}x")
+    fastest = min(times, key=lambda item: item[1])[0]
+    print(f"{'✅' if same else '❌'} results {'identical' if same else 'differ'}; fastest: {fastest}")
+    return same
+
+
+def bench_bundles(args) -> bool:
+    """Check budget results on a fixture dist/ and compare serial with threaded measurement"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dist = Path(tmp) / "dist"
+        routes = generate_dist(dist, args.routes, args.chunk_kb, args.heavy_routes)
+        # Light routes load entry + vendor + page; heavy ones add the charts chunk,
+        # so a budget of 1.5x a light route must flag exactly the heavy ones
+        probe = BundleBudgetChecker(dist, {'metric': args.metric}).check(routes)
+        light_kb = probe['routes'][routes[-1]['path']][probe['metric']] / 1024
+        budgets = {'metric': args.metric, 'route_kb': round(light_kb * 1.5)}
+
+        serial = BundleBudgetChecker(dist, budgets, jobs=1)
+        threaded = BundleBudgetChecker(dist, budgets, jobs=args.jobs)
+        report = threaded.check(routes)
+        misconfigured = BundleBudgetChecker(dist, {**budgets, 'metric': 'zstd'}).check(routes)
+        serial_time = time_call(lambda: serial.check(routes), args.repeat)
+        threaded_time = time_call(lambda: threaded.check(routes), args.repeat)
+
+    expected = {route['path'] for route in routes[:args.heavy_routes]}
+    flagged = {path for path, data in report['routes'].items()
+               if data[report['metric']] > data['budget_kb'] * 1024}
+    mapped = report['route_mapping'] == 'vite-manifest' and not any(
+        data['missing'] for data in report['routes'].values())
+
+    total = report['total']
+    brotli_size = 'n/a' if total['brotli'] is None else f"{total['brotli'] / 1024:.0f} kB"
+    print(f"{len(report['assets'])} chunks, {total['raw'] / 1024:.0f} kB raw, "
+          f"{total['gzip'] / 1024:.0f} kB gzip, brotli {brotli_size}")
+    print(f"{'jobs':>6} {'time':>9}")
+    print(f"{1:>6} {serial_time:>8.3f}s")
+    print(f"{args.jobs:>6} {threaded_time:>8.3f}s  ({serial_time / threaded_time:.2f}x)")
+    print(f"{'✅' if mapped else '❌'} chunks mapped to {len(report['routes'])} routes via {report['route_mapping']}")
+    print(f"{'✅' if flagged == expected else '❌'} {len(flagged)} of {len(expected)} heavy routes over their "
+          f"{budgets['route_kb']} kB {report['metric']} budget, {len(report['violations'])} violations")
+    skipped = misconfigured['unknown_metric'] == 'zstd' and not misconfigured['violations']
+    print(f"{'✅' if skipped else '❌'} unknown metric 'zstd' reported, "
+          f"{len(misconfigured['violations'])} violations")
+    return mapped and flagged == expected and skipped
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers every request with 200 after the server's configured latency, noting when it arrived"""
+
+    def do_HEAD(self):
+        self.server.arrivals.append((self.headers.get('Host'), time.monotonic()))
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(latency: float) -> ThreadingHTTPServer:
+    """Serve SlowHandler on all loopback addresses in a background thread"""
+    server = ThreadingHTTPServer(('', 0), SlowHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.arrivals = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def generate_link_tree(root: Path, file_count: int, links_per_file: int, hosts: int, port: int,
+                       file_kb: int) -> None:
+    """Write pages that each link to links_per_file distinct URLs spread over 127.0.0.x hosts"""
+    pages = root / "src" / "pages"
+    pages.mkdir(parents=True, exist_ok=True)
+    for i in range(file_count):
+        links = ''.join(f'      <a href="http://127.0.0.{1 + (i * links_per_file + j) % hosts}:{port}/p{i}/l{j}">'
+                        f'Link {j}</a>\n' for j in range(links_per_file))
+        body = generate_tsx(file_kb * 1024).replace('    <div>\n', '    <div>\n' + links, 1)
+        (pages / f"Links{i:05d}.tsx").write_text(body, encoding='utf-8')
+
+
+def run_link_mode(links_module, root: Path, jobs: int, streamed: bool) -> Dict[str, float]:
+    """Validate the external links of root once, returning timings and the result count"""
+    validator = links_module.LinkValidator(jobs=jobs, host_delay=0, timeout=10, corpus=SourceCorpus(root))
+    stats = {'first_result_s': None, 'results': 0}
+    report = validator.report_external_result
+    start = time.perf_counter()
+
+    def timed_report(result):
+        if stats['first_result_s'] is None:
+            stats['first_result_s'] = time.perf_counter() - start
+        stats['results'] += 1
+        return report(result)
+
+    validator.report_external_result = timed_report
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        sources = validator.corpus.files(('.tsx', '.ts'))
+        if streamed:
+            validator.scan_and_check_links(sources)
+        else:
+            # The previous phased flow: every link dict first, then the network
+            all_links = []
+            for source in sources:
+                all_links.extend(validator.extract_links_from_file(source.path))
+            validator.categorize_links(all_links)
+            validator.check_common_issues(all_links)
+            validator.validate_external_links()
+    stats['total_s'] = time.perf_counter() - start
+    return stats
+
+
+def run_host_spacing(server, host_delay: float, count: int, submit_gap: float) -> List[float]:
+    """Stream count URLs of one host, submitted submit_gap apart like a slow scan; the gaps between their requests"""
+    server.arrivals = []
+    checker = ExternalLinkChecker(jobs=4, host_delay=host_delay, timeout=10)
+    try:
+        with checker.stream() as stream:
+            for i in range(count):
+                stream.submit(f"http://127.0.0.9:{server.server_address[1]}/spacing/{i}")
+                time.sleep(submit_gap)
+            list(stream.finish())
+    finally:
+        checker.close()
+    times = sorted(arrival for _, arrival in server.arrivals)
+    return [later - earlier for earlier, later in zip(times, times[1:])]
+
+
+def bench_link_stream(args) -> bool:
+    """Compare phased and streamed external link validation against a local server"""
+    links_module = load_script('validate-links.py')
+    server = start_server(args.latency)
+    port = server.server_address[1]
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_link_tree(Path(tmp), args.files, args.links_per_file, args.hosts, port, args.file_kb)
+            for name, streamed in (('phased', False), ('streamed', True)):
+                stats = run_link_mode(links_module, Path(tmp), args.jobs, streamed)
+                tracemalloc.start()
+                run_link_mode(links_module, Path(tmp), args.jobs, streamed)
+                stats['peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+                rows.append((name, stats))
+        gaps = run_host_spacing(server, args.host_delay, args.spacing_urls, args.submit_gap)
+    finally:
+        server.shutdown()
+
+    print(f"{args.files} files x {args.links_per_file} links over {args.hosts} hosts, "
+          f"{args.latency * 1000:.0f} ms latency, {args.jobs} jobs")
+    print(f"{'mode':>10} {'first result':>13} {'total':>9} {'peak mem':>10} {'results':>8}")
+    for name, stats in rows:
+        print(f"{name:>10} {stats['first_result_s']:>12.3f}s {stats['total_s']:>8.3f}s "
+              f"{stats['peak_mb']:>8.1f}MB {stats['results']:>8}")
+    phased, streamed = rows[0][1], rows[1][1]
+    # generate_tsx() adds a few fixed external links of its own
+    ok = streamed['results'] == phased['results'] >= args.files * args.links_per_file
+    ok = ok and streamed['first_result_s'] < phased['first_result_s']
+    print(f"{'✅' if ok else '❌'} streamed first result {phased['first_result_s'] / streamed['first_result_s']:.1f}x "
+          f"sooner, total {phased['total_s'] / streamed['total_s']:.2f}x, "
+          f"peak memory {streamed['peak_mb'] / phased['peak_mb']:.2f}x of phased")
+    # Each URL finds its host's lane gone and starts a new one; the spacing must hold anyway
+    spaced = len(gaps) == args.spacing_urls - 1 and min(gaps) >= args.host_delay * 0.95
+    ok = ok and spaced
+    print(f"{'✅' if spaced else '❌'} {args.spacing_urls} URLs of one host submitted {args.submit_gap:g}s apart: "
+          f"requests {min(gaps, default=0):.3f}s to {max(gaps, default=0):.3f}s apart "
+          f"(host delay {args.host_delay:g}s)")
+    return ok
+
+
+class FaultHandler(BaseHTTPRequestHandler):
+    """Hangs on /hang/, resets the connection on /reset/ and answers 200 otherwise"""
+
+    def do_HEAD(self):
+        if self.path.startswith('/hang/'):
+            time.sleep(self.server.hang)
+        elif self.path.startswith('/reset/'):
+            # Zero linger turns close() into a TCP RST
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            self.connection.close()
+            self.close_connection = True
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Writes to deliberately reset connections fail; that is the point
+        pass
+
+
+def generate_fault_tree(root: Path, links_per_host: int, port: int) -> Dict[str, str]:
+    """Write one page linking to links_per_host URLs on each of a hanging, a resetting and a healthy host"""
+    hosts = {'hang': f"127.0.0.2:{port}", 'reset': f"127.0.0.3:{port}", 'ok': f"127.0.0.4:{port}"}
+    links = ''.join(f'      <a href="http://{host}/{behaviour}/{i}">{behaviour} {i}</a>\n'
+                    for i in range(links_per_host) for behaviour, host in hosts.items())
+    pages = root / "src" / "pages"
+    pages.mkdir(parents=True, exist_ok=True)
+    (pages / "Faults.tsx").write_text(
+        f"export default function Faults() {{\n  return (\n    <div>\n{links}    </div>\n  );\n}}\n",
+        encoding='utf-8')
+    return hosts
+
+
+def run_fault_mode(links_module, root: Path, args, max_host_failures: int, offline: bool = False,
+                   cache_file: Path = None) -> Dict[str, Any]:
+    """Scan and check root once, counting results by outcome"""
+    cache = LinkResultCache(cache_file) if cache_file else None
+    validator = links_module.LinkValidator(host_delay=args.host_delay, timeout=args.timeout, cache=cache,
+                                           corpus=SourceCorpus(root), max_host_failures=max_host_failures,
+                                           offline=offline)
+    outcomes = Counter()
+    report = validator.report_external_result
+
+    def counting_report(result):
+        outcomes[result['error'] or ('valid' if result['status'] < 400 else 'broken')] += 1
+        return report(result)
+
+    validator.report_external_result = counting_report
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        validator.scan_and_check_links(validator.corpus.files(('.tsx',)))
+    return {'total_s': time.perf_counter() - start, 'outcomes': outcomes,
+            'network': validator.network_checks}
+
+
+def bench_breaker(args) -> bool:
+    """Time external checks against failing hosts with and without the circuit breaker"""
+    links_module = load_script('validate-links.py')
+    server = QuietHTTPServer(('', 0), FaultHandler)
+    server.hang = args.timeout * 4
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_fault_tree(Path(tmp), args.links_per_host, server.server_address[1])
+            cache_file = Path(tmp) / "links.json"
+            rows.append(('no breaker', run_fault_mode(links_module, Path(tmp), args, 0)))
+            rows.append(('breaker', run_fault_mode(links_module, Path(tmp), args, args.max_host_failures,
+                                                   cache_file=cache_file)))
+            server.shutdown()
+            rows.append(('offline', run_fault_mode(links_module, Path(tmp), args, args.max_host_failures,
+                                                   offline=True, cache_file=cache_file)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    n = args.links_per_host
+    print(f"{n} links on each of a hanging, a resetting and a healthy host, {args.timeout}s timeout, "
+          f"{args.host_delay}s host delay")
+    print(f"{'mode':>11} {'total':>8} {'requests':>9} {'valid':>6} {'timeout':>8} {'reset':>6} "
+          f"{'skipped':>8} {'offline':>8}")
+    for name, stats in rows:
+        o = stats['outcomes']
+        print(f"{name:>11} {stats['total_s']:>7.2f}s {stats['network']:>9} {o['valid']:>6} {o['timeout']:>8} "
+              f"{o['connection']:>6} {o['host_unreachable']:>8} {o['offline']:>8}")
+
+    plain, breaker, offline = (stats for _, stats in rows)
+    limit = args.max_host_failures
+    ok = plain['outcomes']['valid'] == breaker['outcomes']['valid'] == offline['outcomes']['valid'] == n
+    ok = ok and breaker['outcomes']['timeout'] == breaker['outcomes']['connection'] == limit
+    ok = ok and breaker['outcomes']['host_unreachable'] == 2 * (n - limit)
+    ok = ok and offline['network'] == 0 and offline['outcomes']['offline'] == 2 * n
+    ok = ok and breaker['total_s'] < plain['total_s']
+    print(f"{'✅' if ok else '❌'} circuit breaker {plain['total_s'] / breaker['total_s']:.1f}x faster, "
+          f"offline run {offline['total_s']:.2f}s with no requests")
+    return ok
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Refuses HEAD on /nohead/ and /empty/, redirects /old/ to /page/ and honours Range: bytes=0-0 on GET
+
+    /empty/ URLs have an empty body, so their range is answered with 416.
+    """
+
+    REFUSING_HEAD = ('/nohead/', '/empty/')
+
+    def _count(self, body: bytes = b'') -> None:
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.body_bytes += len(body)
+
+    def _redirect(self) -> bool:
+        if not self.path.startswith('/old/'):
+            return False
+        self._count()
+        self.send_response(301)
+        self.send_header('Location', self.path.replace('/old/', '/page/', 1))
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return True
+
+    def do_HEAD(self):
+        if self._redirect():
+            return
+        self._count()
+        refused = self.path.startswith(self.REFUSING_HEAD)
+        self.send_response(405 if refused else 200)
+        self.send_header('Content-Length', '0' if refused else str(len(self.server.body)))
+        self.end_headers()
+
+    def do_GET(self):
+        if self._redirect():
+            return
+        body = b'' if self.path.startswith('/empty/') else self.server.body
+        if self.headers.get('Range') == 'bytes=0-0' and not body:
+            self.send_response(416)
+            self.send_header('Content-Range', "bytes */0")
+        elif self.headers.get('Range') == 'bytes=0-0':
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes 0-0/{len(body)}")
+            body = body[:1]
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self._count(body)
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PlainChecker(ExternalLinkChecker):
+    """The previous request strategy: full GET when HEAD is refused, every URL string checked"""
+
+    def canonical_key(self, url):
+        return url
+
+    def _note_redirect(self, result):
+        pass
+
+    def _ranged_get(self, url, headers):
+        return self.session.get(url, timeout=self.timeout, allow_redirects=True, headers=headers)
+
+
+def generate_request_tree(root: Path, count: int, hosts: int, port: int) -> int:
+    """Write pages linking to URL variants and redirecting URLs; returns the number of distinct URLs"""
+    pages = root / "src" / "pages"
+    pages.mkdir(parents=True, exist_ok=True)
+    urls = []
+    for i in range(count):
+        base = f"http://127.0.0.{2 + i % hosts}:{port}"
+        variants = [f"{base}/nohead/{i}", f"{base}/nohead/{i}/", f"{base}/nohead/{i}?utm_source=docs",
+                    f"{base}/nohead/{i}#intro", f"{base}/old/{i}", f"{base}/empty/{i}"]
+        links = ''.join(f'      <a href="{url}">Link</a>\n' for url in variants)
+        (pages / f"Guide{i:04d}.tsx").write_text(
+            f"export default function Guide() {{\n  return (\n    <div>\n{links}    </div>\n  );\n}}\n",
+            encoding='utf-8')
+        urls.extend(variants)
+    # Later pages link straight to where the /old/ URLs redirect
+    links = ''.join(f'      <a href="http://127.0.0.{2 + i % hosts}:{port}/page/{i}">Page</a>\n'
+                    for i in range(count))
+    (pages / "Targets.tsx").write_text(
+        f"export default function Targets() {{\n  return (\n    <div>\n{links}    </div>\n  );\n}}\n",
+        encoding='utf-8')
+    return len(urls) + count
+
+
+def run_request_mode(links_module, root: Path, server, checker_class) -> Dict[str, Any]:
+    """Check the external links of root once with the given checker class"""
+    validator = links_module.LinkValidator(host_delay=0, timeout=10, corpus=SourceCorpus(root))
+    validator.build_checker = lambda: checker_class(jobs=validator.jobs, host_delay=0, timeout=10)
+    outcomes = Counter()
+    report = validator.report_external_result
+
+    def counting_report(result):
+        outcomes['valid' if not result['error'] and result['status'] < 400 else 'failed'] += 1
+        return report(result)
+
+    validator.report_external_result = counting_report
+    server.requests = server.body_bytes = 0
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        validator.scan_and_check_links(validator.corpus.files(('.tsx',)))
+    return {'total_s': time.perf_counter() - start, 'outcomes': outcomes,
+            'requests': server.requests, 'body_bytes': server.body_bytes}
+
+
+def bench_requests(args) -> bool:
+    """Requests and bytes for HEAD-refusing, redirecting and duplicate URLs, before and after"""
+    links_module = load_script('validate-links.py')
+    server = QuietHTTPServer(('', 0), RangeHandler)
+    server.lock = threading.Lock()
+    server.body = b'x' * (args.body_kb * 1024)
+    server.requests = server.body_bytes = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            urls = generate_request_tree(Path(tmp), args.pages, args.hosts, server.server_address[1])
+            for name, checker_class in (('previous', PlainChecker), ('current', ExternalLinkChecker)):
+                rows.append((name, run_request_mode(links_module, Path(tmp), server, checker_class)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{urls} distinct external URLs, {args.body_kb} kB bodies, {args.hosts} hosts")
+    print(f"{'strategy':>9} {'requests':>9} {'body bytes':>11} {'valid':>6} {'failed':>7} {'total':>8}")
+    for name, stats in rows:
+        print(f"{name:>9} {stats['requests']:>9} {stats['body_bytes']:>11} {stats['outcomes']['valid']:>6} "
+              f"{stats['outcomes']['failed']:>7} {stats['total_s']:>7.2f}s")
+    before, after = rows[0][1], rows[1][1]
+    ok = before['outcomes'] == after['outcomes'] and after['outcomes']['valid'] == urls
+    ok = ok and after['requests'] < before['requests'] and after['body_bytes'] < before['body_bytes']
+    print(f"{'✅' if ok else '❌'} {after['requests'] / before['requests']:.2f}x the requests, "
+          f"{after['body_bytes'] / max(1, before['body_bytes']):.4f}x the body bytes")
+    return ok
+
+
+def generate_findings_tree(root: Path, file_count: int, links_per_file: int) -> None:
+    """Write pages whose links are mostly localhost URLs, so most links also produce a warning"""
+    pages = root / "src" / "pages" / "docs"
+    pages.mkdir(parents=True, exist_ok=True)
+    for i in range(file_count):
+        lines = []
+        for j in range(links_per_file):
+            if j % 4 == 3:
+                lines.append(f'      <a href="/docs/section-{j % 40}#">Section {j}</a>')
+            else:
+                lines.append(f'      <a href="http://localhost:3000/docs/page-{j % 200}">Page {j}</a>')
+        body = '\n'.join(lines)
+        (pages / f"Guide{i:05d}.tsx").write_text(
+            f"export default function Guide{i}() {{\n  return (\n    <div>\n{body}\n    </div>\n  );\n}}\n",
+            encoding='utf-8')
+
+
+def retain_dicts(root: Path) -> Dict[str, Any]:
+    """The previous representation: one dict per link and one formatted string per warning"""
+    corpus = SourceCorpus(root)
+    scans, warnings = [], []
+    for source in corpus.files(('.tsx', '.ts')):
+        line_index = source.line_index
+        links = [{'url': value, 'file': str(source.path), 'line': line_index.line_of(offset)}
+                 for kind, value, offset in iter_page_matches(source.text) if kind == 'link']
+        for link in links:
+            location = f"{link['file']}:{link['line']}"
+            if 'localhost' in link['url']:
+                warnings.append(f"Localhost link found in {location}: {link['url']}")
+            if '#' in link['url'] and not link['url'].startswith('http') and not link['url'].split('#')[1]:
+                warnings.append(f"Empty fragment in {location}: {link['url']}")
+        scans.append(links)
+        source.invalidate()
+    return {'links': sum(len(links) for links in scans), 'findings': len(warnings), 'kept': (scans, warnings)}
+
+
+def retain_records(links_module, root: Path) -> Dict[str, Any]:
+    """The validator's own path: page scan columns, Link records and a FindingLog"""
+    validator = links_module.LinkValidator(corpus=SourceCorpus(root))
+    total = 0
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for source in validator.corpus.files(('.tsx', '.ts')):
+            links = validator.extract_links_from_file(source.path)
+            total += len(links)
+            validator.check_common_issues(links)
+            validator.categorize_links(links)
+            # Keep the scan artifacts but not the file text, like the dict variant
+            source._text = None
+            source._artifacts.pop('line_index', None)
+            source._artifacts.pop('scan_items', None)
+    return {'links': total, 'findings': len(validator.warnings), 'kept': validator}
+
+
+def bench_memory(args) -> bool:
+    """Memory kept for links and findings with dicts/strings vs compact records"""
+    links_module = load_script('validate-links.py')
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_findings_tree(Path(tmp), args.files, args.links_per_file)
+        for name, run in (('dicts', lambda: retain_dicts(Path(tmp))),
+                          ('records', lambda: retain_records(links_module, Path(tmp)))):
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+            kept, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows.append((name, result, kept, peak, elapsed))
+            del result
+
+    print(f"{args.files} files x {args.links_per_file} links")
+    print(f"{'mode':>8} {'links':>8} {'findings':>9} {'kept':>9} {'peak':>9} {'B/link':>7} {'time':>8}")
+    for name, result, kept, peak, elapsed in rows:
+        print(f"{name:>8} {result['links']:>8} {result['findings']:>9} {kept / 2**20:>7.1f}MB "
+              f"{peak / 2**20:>7.1f}MB {kept / result['links']:>7.0f} {elapsed:>7.2f}s")
+    before, after = rows[0], rows[1]
+    ok = (before[1]['links'], before[1]['findings']) == (after[1]['links'], after[1]['findings'])
+    ok = ok and after[2] < before[2]
+    print(f"{'✅' if ok else '❌'} compact records keep {after[2] / before[2]:.2f}x the memory, "
+          f"peak {after[3] / before[3]:.2f}x")
+    return ok
+
+
+SANDBOX_POLLUTER = """import os, sys, blazemetrics
+blazemetrics.LEAKED = True
+blazemetrics.BlazeMetricsClient.compute_metrics = None
+sys.path.append('/leaked')
+with open('leaked.txt', 'w') as f:
+    f.write('x')
+"""
+SANDBOX_VICTIM = """import os, sys, blazemetrics
+assert not hasattr(blazemetrics, 'LEAKED'), 'module global leaked'
+assert blazemetrics.BlazeMetricsClient.compute_metrics is not None, 'monkeypatch leaked'
+assert '/leaked' not in sys.path, 'sys.path change leaked'
+assert not os.path.exists('leaked.txt'), 'scratch file leaked'
+"""
+# snippet -> expected status and a substring of its error
+SANDBOX_FAILURES = {
+    "while True:\n    pass": ('timeout', 'timed out'),
+    "import os\nos._exit(3)": ('error', 'worker crashed'),
+    "data = bytearray(1 << 34)": ('error', 'MemoryError'),
+}
+
+
+def bench_sandbox(args) -> bool:
+    """Check snippet isolation and failure handling of the sandbox, then time many snippets"""
+    ok = True
+    with SnippetSandbox(workers=1, timeout=args.timeout, memory_mb=args.memory_mb) as sandbox:
+        # One worker, so the victim runs right after the polluter in the same process
+        victim = sandbox.run_all([SANDBOX_POLLUTER, SANDBOX_VICTIM])[1]
+        isolated = victim['status'] == 'ok'
+        ok = ok and isolated
+        print(f"{'✅' if isolated else '❌'} isolation between snippets on one worker"
+              + ("" if isolated else f": {victim['error']}"))
+        for code, (status, error) in SANDBOX_FAILURES.items():
+            result = sandbox.run_all([code])[0]
+            passed = result['status'] == status and error in (result['error'] or '')
+            ok = ok and passed
+            print(f"{'✅' if passed else '❌'} {code.splitlines()[-1].strip()!r}: {result['status']} ({result['error']})")
+        passed = sandbox.run_all([SANDBOX_VICTIM])[0]['status'] == 'ok'
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} replaced worker runs snippets again")
+
+    snippets = [f"from blazemetrics import BlazeMetricsClient\nclient = BlazeMetricsClient(metrics_include=['bleu'])\n"
+                f"print(client.compute_metrics(['candidate {i}'], [['reference {i}']]))\n"
+                for i in range(args.snippets)]
+    start = time.perf_counter()
+    with SnippetSandbox(workers=args.workers, timeout=args.timeout, memory_mb=args.memory_mb) as sandbox:
+        ready = time.perf_counter() - start
+        results = sandbox.run_all(snippets)
+    elapsed = time.perf_counter() - start
+    passed = sum(result['status'] == 'ok' for result in results)
+    within = elapsed <= args.max_seconds and passed == len(snippets)
+    ok = ok and within
+    print(f"{'✅' if within else '❌'} {len(snippets)} snippets on {args.workers} workers in {elapsed:.2f}s "
+          f"({len(snippets) / elapsed:.0f}/s, workers ready after {ready:.2f}s, {passed} passed; "
+          f"limit {args.max_seconds:g}s)")
+    return ok
+
+
+def run_watch_start(all_module, root: Path) -> Dict[str, Any]:
+    """Run validate-all on root against its manifest, start a watch session and revalidate one edit"""
+    parser = argparse.ArgumentParser()
+    all_module.links_script.add_arguments(parser)
+    all_module.add_bundle_arguments(parser)
+    options = parser.parse_args(['--no-cache', '--offline'])
+    options.content_jobs = 1
+
+    corpus = SourceCorpus(Path("."), manifest=Manifest(root / ".validation-cache" / "manifest.json",
+                                                       fingerprint=validator_fingerprint()))
+    validators = all_module.build_validators(options, corpus, Instrumentation(corpus))
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        all_module.run_all(validators, corpus)
+    reused = corpus.manifest.reused
+
+    session = WatchSession(corpus, validators['Links'], validators['Content'])
+    try:
+        start = time.perf_counter()
+        session.start()
+        start_s = time.perf_counter() - start
+
+        page = next(path for path in sorted(session.findings) if path.name.startswith('Page'))
+        original = page.read_text(encoding='utf-8')
+        page.write_text(original.replace('</div>', '<a href="http://localhost:3000/x">Local</a></div>', 1),
+                        encoding='utf-8')
+        anchor_index = session.links.anchor_index
+        try:
+            start = time.perf_counter()
+            diffs = session.update({page})
+            update_ms = (time.perf_counter() - start) * 1000
+            # An edit updates the anchor index in place instead of rebuilding it
+            kept = session.links.anchor_index is anchor_index
+        finally:
+            page.write_text(original, encoding='utf-8')
+            session.update({page})
+    finally:
+        session.close()
+    new = [message for path_diffs in diffs.values() for _, message in path_diffs[0]]
+    return {'reused': reused, 'start_s': start_s, 'update_ms': update_ms, 'files': len(session.findings),
+            'kept': kept, 'ok': kept and len(new) == 1 and 'Localhost link' in new[0]}
+
+
+def bench_watch(args) -> bool:
+    """Start watch mode with a cold and a warm manifest; both must report the edit without rebuilding indexes"""
+    all_module = load_script('validate-all.py')
+    cwd = os.getcwd()
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        generate_frontend_tree(root, args.files, args.file_kb, links_per_kb=1, external_ratio=0,
+                               external_urls=1, code_blocks=2, hosts=1, port=1)
+        # A code example with a finding, so the warm run reads findings back from the manifest
+        (root / "src" / "pages" / "docs" / "Legacy.tsx").write_text(
+            "const example = `from blazemetrics import BlazeMetricsClient\nclient = BlazeMetricsClient()\n"
+            "client.compute_everything(candidates)\n`;\n\n"
+            "export default function Legacy() {\n  return <CodeBlock code={example} />;\n}\n", encoding='utf-8')
+        os.chdir(root)
+        try:
+            print(f"{'manifest':>9} {'reused':>7} {'files':>6} {'start':>8} {'edit':>9}")
+            for label in ('cold', 'warm'):
+                run = run_watch_start(all_module, root)
+                ok = ok and run['ok']
+                status = ('✅' if run['ok'] else '❌ indexes rebuilt' if not run['kept']
+                          else '❌ edit not reported as one new finding')
+                print(f"{label:>9} {run['reused']:>7} {run['files']:>6} {run['start_s']:>7.2f}s "
+                      f"{run['update_ms']:>7.1f}ms  {status}")
+        finally:
+            os.chdir(cwd)
+    return ok
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the frontend validation scripts")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    suite = subparsers.add_parser("suite", help="throughput, latency and memory of every validator on synthetic trees")
+    suite.add_argument("--files", type=int, nargs="+", default=[10, 100, 1000],
+                       help="file counts of the generated trees, e.g. 10 1000 50000 (default: 10 100 1000)")
+    suite.add_argument("--file-kb", type=float, default=8, help="size of each page in kB (default: 8)")
+    suite.add_argument("--links-per-kb", type=float, default=1.0, help="links per kB of page (default: 1)")
+    suite.add_argument("--external-ratio", type=float, default=0.2,
+                       help="share of links that are external (default: 0.2)")
+    suite.add_argument("--external-urls", type=int, default=200,
+                       help="distinct external URLs the links are drawn from (default: 200)")
+    suite.add_argument("--code-blocks", type=int, default=2, help="Python code blocks per page (default: 2)")
+    suite.add_argument("--hosts", type=int, default=8, help="loopback hosts serving external URLs (default: 8)")
+    suite.add_argument("--latency", type=float, default=0.005,
+                       help="mock server response delay in seconds (default: 0.005)")
+    suite.add_argument("--validators", nargs="+", choices=tuple(SUITE_SCRIPTS), default=list(SUITE_SCRIPTS),
+                       help="scripts to run (default: all)")
+    suite.add_argument("--seed", type=int, default=0, help="random seed of the generator (default: 0)")
+    suite.add_argument("--output", type=Path,
+                       help="results file (default: .validation-cache/benchmarks/suite-<commit>.json)")
+    suite.add_argument("--baseline", type=Path, help="earlier results file to compare wall times with")
+    suite.add_argument("--max-regression", type=float, default=1.25,
+                       help="fail if a script is this many times slower than in --baseline (default: 1.25)")
+    suite.set_defaults(func=bench_suite)
+
+    scan = subparsers.add_parser("scan", help="link/code-block extraction scaling on large files")
+    scan.add_argument("--sizes", type=float, nargs="+", default=[0.5, 1, 2, 5],
+                      help="generated file sizes in MB (default: 0.5 1 2 5)")
+    scan.add_argument("--repeat", type=int, default=3, help="runs per size, best time is kept")
+    scan.add_argument("--max-ratio", type=float, default=2.0,
+                      help="fail if s/MB at the largest size exceeds this multiple of the smallest")
+    scan.set_defaults(func=bench_scan)
+
+    content_jobs = subparsers.add_parser("content-jobs", help="code example validation scaling with --jobs")
+    content_jobs.add_argument("--files", type=int, default=400, help="doc pages to generate (default: 400)")
+    content_jobs.add_argument("--file-kb", type=float, default=16, help="size of each page in kB (default: 16)")
+    content_jobs.add_argument("--code-blocks", type=int, default=8, help="Python code blocks per page (default: 8)")
+    content_jobs.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4],
+                              help="job counts to time, the first is the baseline (default: 1 2 4)")
+    content_jobs.add_argument("--repeat", type=int, default=2, help="runs per job count, best time is kept")
+    content_jobs.add_argument("--min-efficiency", type=float, default=0.6,
+                              help="fail if speedup/jobs falls below this where there are enough CPUs "
+                                   "(default: 0.6)")
+    content_jobs.set_defaults(func=bench_content_jobs)
+
+    ux_patterns = subparsers.add_parser("ux-patterns",
+                                        help="UX pattern counting per check, per distinct pattern and in one pass")
+    ux_patterns.add_argument("--files", type=int, default=10000, help="synthetic files to generate (default: 10000)")
+    ux_patterns.add_argument("--repeat", type=int, default=3, help="runs per approach, best time is kept")
+    ux_patterns.set_defaults(func=bench_ux_patterns)
+
+    link_stream = subparsers.add_parser("link-stream", help="phased vs streamed external link validation")
+    link_stream.add_argument("--files", type=int, default=400, help="synthetic files (default: 400)")
+    link_stream.add_argument("--links-per-file", type=int, default=5, help="external links per file (default: 5)")
+    link_stream.add_argument("--hosts", type=int, default=8, help="distinct loopback hosts (default: 8)")
+    link_stream.add_argument("--file-kb", type=int, default=32, help="size of each file in kB (default: 32)")
+    link_stream.add_argument("--latency", type=float, default=0.005,
+                             help="server response delay in seconds (default: 0.005)")
+    link_stream.add_argument("--jobs", type=int, default=8, help="concurrent checks (default: 8)")
+    link_stream.add_argument("--host-delay", type=float, default=0.2,
+                             help="politeness delay of the one-host spacing check (default: 0.2)")
+    link_stream.add_argument("--spacing-urls", type=int, default=5,
+                             help="URLs of the one-host spacing check (default: 5)")
+    link_stream.add_argument("--submit-gap", type=float, default=0.05,
+                             help="seconds between submitting them, slower than a lane drains (default: 0.05)")
+    link_stream.set_defaults(func=bench_link_stream)
+
+    breaker = subparsers.add_parser("breaker", help="circuit breaker and offline mode against failing hosts")
+    breaker.add_argument("--links-per-host", type=int, default=12, help="links per simulated host (default: 12)")
+    breaker.add_argument("--timeout", type=float, default=0.5, help="request timeout in seconds (default: 0.5)")
+    breaker.add_argument("--host-delay", type=float, default=0.1,
+                         help="seconds between requests to one host (default: 0.1)")
+    breaker.add_argument("--max-host-failures", type=int, default=3,
+                         help="failures before a host's circuit opens (default: 3)")
+    breaker.set_defaults(func=bench_breaker)
+
+    requests_bench = subparsers.add_parser("requests", help="request count and bytes of the link check strategy")
+    requests_bench.add_argument("--pages", type=int, default=100, help="pages of URL variants (default: 100)")
+    requests_bench.add_argument("--hosts", type=int, default=8, help="distinct loopback hosts (default: 8)")
+    requests_bench.add_argument("--body-kb", type=int, default=64, help="response body size in kB (default: 64)")
+    requests_bench.set_defaults(func=bench_requests)
+
+    memory = subparsers.add_parser("memory", help="memory kept by link and finding records")
+    memory.add_argument("--files", type=int, default=500, help="synthetic files (default: 500)")
+    memory.add_argument("--links-per-file", type=int, default=200, help="links per file (default: 200)")
+    memory.set_defaults(func=bench_memory)
+
+    sandbox = subparsers.add_parser("sandbox", help="snippet sandbox isolation, failure handling and throughput")
+    sandbox.add_argument("--snippets", type=int, default=300, help="snippets to time (default: 300)")
+    sandbox.add_argument("--workers", type=int, default=4, help="sandbox workers (default: 4)")
+    sandbox.add_argument("--timeout", type=float, default=1.0, help="per-snippet timeout in seconds (default: 1)")
+    sandbox.add_argument("--memory-mb", type=int, default=512, help="per-worker memory limit (default: 512)")
+    sandbox.add_argument("--max-seconds", type=float, default=10.0,
+                         help="fail if the timed snippets take longer (default: 10)")
+    sandbox.set_defaults(func=bench_sandbox)
+
+    watch = subparsers.add_parser("watch", help="watch mode start-up with a cold and a warm manifest")
+    watch.add_argument("--files", type=int, default=50, help="pages in the synthetic tree (default: 50)")
+    watch.add_argument("--file-kb", type=float, default=4, help="size of each page in kB (default: 4)")
+    watch.set_defaults(func=bench_watch)
+
+    bundles = subparsers.add_parser("bundles", help="bundle budget checks against a fixture dist/")
+    bundles.add_argument("--routes", type=int, default=40, help="routes in the fixture build (default: 40)")
+    bundles.add_argument("--heavy-routes", type=int, default=5,
+                         help="routes that also load the large shared chunk (default: 5)")
+    bundles.add_argument("--chunk-kb", type=int, default=64, help="size of a page chunk in kB (default: 64)")
+    bundles.add_argument("--metric", choices=("raw", "gzip", "brotli"), default="gzip",
+                         help="budget metric (default: gzip)")
+    bundles.add_argument("--jobs", type=int, default=4, help="compression threads (default: 4)")
+    bundles.add_argument("--repeat", type=int, default=3, help="runs per setting, best time is kept")
+    bundles.set_defaults(func=bench_bundles)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(0 if args.func(args) else 1)
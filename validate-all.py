@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Combined Validation Script for BlazeMetrics Frontend
+====================================================
+Runs content, link and UX validation in one process over a shared source
+corpus, so every source file is read from disk exactly once. All three
+report their findings to one reporter, so --format jsonl/sarif produces a
+single merged report. With --watch it then stays running and revalidates
+each saved file (see validation.watch).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+from validation.bundles import add_bundle_arguments, build_bundle_checker
+from validation.corpus import SourceCorpus
+from validation.instrument import Instrumentation, add_profile_arguments, instrumented_run
+from validation.manifest import add_manifest_arguments, build_manifest
+from validation.report import Reporter, add_report_arguments, reporting
+from validation.scripts import load_script
+from validation.watch import WatchSession, watch
+
+links_script = load_script('validate-links.py')
+content_script = load_script('validate-content.py')
+ux_script = load_script('test-ux.py')
+
+def build_validators(args: argparse.Namespace, corpus: SourceCorpus, instrumentation: Instrumentation,
+                     reporter: Reporter = None) -> Dict[str, Any]:
+    """The three validators, sharing one corpus, instrumentation and reporter"""
+    return {
+        'Content': content_script.ContentValidator(corpus=corpus, jobs=args.content_jobs,
+                                                   instrumentation=instrumentation, reporter=reporter),
+        'Links': links_script.build_validator(args, corpus=corpus, instrumentation=instrumentation,
+                                              reporter=reporter),
+        'UX': ux_script.UXValidator(corpus=corpus, bundle_checker=build_bundle_checker(args),
+                                    instrumentation=instrumentation, reporter=reporter),
+    }
+
+def run_all(validators: Dict[str, Any], corpus: SourceCorpus) -> bool:
+    """Run all three validators against one corpus"""
+    results = {
+        'Content': validators['Content'].run_validation(),
+        'Links': validators['Links'].run_validation(),
+        'UX': validators['UX'].run_ux_tests(),
+    }
+    
+    print("\n" + "=" * 60)
+    print("📊 COMBINED VALIDATION SUMMARY")
+    print("=" * 60)
+    for name, passed in results.items():
+        print(f"{name}: {'✅ PASS' if passed else '❌ FAIL'}")
+    print(f"📚 Corpus: {len(corpus.discover())} source files, "
+          f"{corpus.files_read} file reads, {corpus.bytes_read:,} bytes read")
+    if corpus.manifest is not None:
+        print(f"♻️  Manifest: {corpus.manifest.reused} artifacts reused, "
+              f"{corpus.manifest.rebuilt} rebuilt")
+    corpus.save()
+    
+    return all(results.values())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run all frontend validations over a shared corpus")
+    links_script.add_arguments(parser)
+    parser.add_argument("--content-jobs", type=int, default=1,
+                        help="worker processes for code example validation (default: 1)")
+    add_bundle_arguments(parser)
+    add_manifest_arguments(parser)
+    add_profile_arguments(parser)
+    parser.add_argument("--watch", action="store_true",
+                        help="after the run, revalidate links and code examples of every saved file; "
+                             "--format/--output only cover the initial run, watch updates are printed as text")
+    parser.add_argument("--poll", action="store_true",
+                        help="with --watch, poll file stats instead of using inotify")
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    corpus = SourceCorpus(Path("."), manifest=build_manifest(args))
+    instrumentation = Instrumentation(corpus)
+    with reporting(args) as reporter:
+        validators = build_validators(args, corpus, instrumentation, reporter)
+        with instrumented_run(args, 'validate-all', instrumentation):
+            success = run_all(validators, corpus)
+    if args.watch:
+        watch(WatchSession(corpus, validators['Links'], validators['Content']),
+              [Path(corpus.source_dir)], ('.tsx', '.ts'), poll=args.poll)
+        corpus.save()
+    sys.exit(0 if success else 1)
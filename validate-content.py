@@ -6,157 +6,185 @@ This script validates all code examples in the frontend documentation
 against the actual backend implementation.
 """
 
+import argparse
 import sys
-import os
-import re
-import ast
-import subprocess
-import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+from validation.apiindex import ApiIndex, build_api_index
+from validation.corpus import SourceCorpus, SourceFile
+from validation.instrument import Instrumentation, add_profile_arguments, instrumented_run, timed
+from validation.manifest import MISSING, add_manifest_arguments, build_manifest
+from validation.records import FindingLog
+from validation.report import Reporter, TextReporter, add_report_arguments, print_finding_summary, reporting
+from validation.sandbox import SnippetSandbox
+from validation.snippets import (
+    MIN_SNIPPET_LENGTH, SnippetAnalyzer, check_expected_outputs, collect_code_findings, pool_code_findings,
+    scan_code_blocks, set_worker_api
+)
+
 class ContentValidator:
-    def __init__(self):
+    # Names this validator's findings in merged reports
+    tool = 'validate-content'
+
+    def __init__(self, corpus: SourceCorpus = None, jobs: int = 1, sandbox: SnippetSandbox = None,
+                 instrumentation: Instrumentation = None, reporter: Reporter = None, api: ApiIndex = None):
         self.backend_path = Path("../blazemetrics-core")
         self.frontend_path = Path(".")
-        self.errors = []
-        self.warnings = []
+        self.corpus = corpus or SourceCorpus(self.frontend_path)
+        self.instrumentation = instrumentation or Instrumentation(self.corpus)
+        self.api = api or self.load_backend_api()
+        # Findings depend on the API they were checked against, so cached ones are keyed by it
+        self.findings_artifact = f"code_findings-{self.api.digest}"
+        self.analyzer = SnippetAnalyzer(self.api)
+        self.jobs = jobs
+        self.sandbox = sandbox
+        if sandbox is not None:
+            sandbox.use_api(self.api)
+        self.reporter = reporter or TextReporter()
+        self.errors = FindingLog()
+        self.warnings = FindingLog()
         
-    def log_error(self, message: str):
-        """Log a validation error"""
-        self.errors.append(message)
-        print(f"❌ ERROR: {message}")
+    def log_error(self, message: str, *args):
+        """Log a validation error; message is a str.format template when args are given"""
+        self.reporter.report(self.tool, 'error', self.errors.add(message, args), message)
         
-    def log_warning(self, message: str):
-        """Log a validation warning"""
-        self.warnings.append(message)
-        print(f"⚠️  WARNING: {message}")
+    def log_warning(self, message: str, *args):
+        """Log a validation warning; message is a str.format template when args are given"""
+        self.reporter.report(self.tool, 'warning', self.warnings.add(message, args), message)
         
     def log_success(self, message: str):
-        """Log a successful validation"""
-        print(f"✅ {message}")
+        """Log a successful validation, reported only when the reporter is verbose"""
+        self.reporter.report(self.tool, 'success', message)
+
+    @timed
+    def load_backend_api(self) -> ApiIndex:
+        """Index the public API of the backend package, or the built-in list without a checkout"""
+        return build_api_index(self.backend_path)
+
+    @staticmethod
+    def is_doc_file(path: Path) -> bool:
+        """Whether a source file is documentation whose code examples are validated"""
+        return 'docs' in str(path) or 'interactive' in str(path)
 
+    @timed
     def extract_code_blocks(self, file_path: Path) -> List[Dict[str, Any]]:
         """Extract Python code blocks from TypeScript/React files"""
         code_blocks = []
         
         try:
-            content = file_path.read_text(encoding='utf-8')
-            
-            # Pattern to match code blocks in template literals or strings
-            patterns = [
-                # Template literals with python code
-                r'const\s+\w+\s*=\s*`([^`]*from blazemetrics[^`]*)`',
-                # String literals with python code  
-                r'code=\{`([^`]*from blazemetrics[^`]*)`\}',
-                # Multi-line strings
-                r'code=\{"([^"]*from blazemetrics[^"]*)"',
-            ]
-            
-            for pattern in patterns:
-                matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
-                for match in matches:
-                    code = match.group(1)
-                    # Clean up the code
-                    code = code.replace('\\n', '\n').replace('\\"', '"')
-                    code_blocks.append({
-                        'code': code,
-                        'file': str(file_path),
-                        'line': content[:match.start()].count('\n') + 1
-                    })
-                    
+            code_blocks = self.corpus.get(file_path).artifact(
+                'code_blocks', lambda source: scan_code_blocks(source.text, str(source.path), source.scan_items))
         except Exception as e:
-            self.log_error(f"Failed to extract code from {file_path}: {e}")
+            self.log_error("Failed to extract code from {}: {}", file_path, e)
             
         return code_blocks
 
-    def validate_python_syntax(self, code: str, source: str) -> bool:
-        """Validate Python code syntax"""
-        try:
-            ast.parse(code)
-            return True
-        except SyntaxError as e:
-            self.log_error(f"Syntax error in {source}: {e}")
-            return False
-
-    def validate_imports(self, code: str, source: str) -> bool:
-        """Validate that imports match the backend API"""
-        valid_imports = {
-            'blazemetrics': ['BlazeMetricsClient'],
-            'blazemetrics.llm_judge': ['LLMJudge'],
-            'blazemetrics.agent_eval': ['AgentEvaluator'],
-            'blazemetrics.code_evaluator': ['CodeEvaluator'],
-            'blazemetrics.factuality_evaluator': ['FactualityEvaluator'],
-        }
+    @timed
+    def validate_code_examples(self, file_paths: List[Path]) -> bool:
+        """Validate the code examples of the given files
         
-        try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ImportFrom):
-                    module = node.module
-                    if module and module.startswith('blazemetrics'):
-                        if module not in valid_imports:
-                            self.log_warning(f"Unknown module import in {source}: {module}")
-                        else:
-                            for alias in node.names:
-                                if alias.name not in valid_imports[module]:
-                                    self.log_warning(f"Unknown import in {source}: {alias.name} from {module}")
-            return True
-        except Exception as e:
-            self.log_error(f"Failed to validate imports in {source}: {e}")
-            return False
+        Files unchanged since the last run replay their findings from the
+        manifest. The rest are extracted and validated on a process pool when
+        jobs > 1; findings are always reported in file order.
+        """
+        sources = [self.corpus.get(path) for path in file_paths]
+        pending = [source for source in sources
+                   if source.cached_artifact(self.findings_artifact, persist=True) is MISSING]
+        
+        if self.jobs > 1 and len(pending) > 1:
+            labels = [str(source.path) for source in pending]
+            # Files already scanned here only ship their code blocks; the rest ship their text
+            blocks = [self._scanned_code_blocks(source) for source in pending]
+            texts = [source.text if code_blocks is None else None
+                     for source, code_blocks in zip(pending, blocks)]
+            chunksize = max(1, len(pending) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs, initializer=set_worker_api,
+                                     initargs=(self.api,)) as executor:
+                results = executor.map(pool_code_findings, labels, texts, blocks, chunksize=chunksize)
+                for source, (result, items) in zip(pending, results):
+                    if items is not None:
+                        source.store_artifact('scan_items', items)
+                    source.store_artifact(self.findings_artifact, result, persist=True)
+                    
+        code_ok = True
+        for source in sources:
+            result = source.artifact(self.findings_artifact, self._collect_code_findings, persist=True)
+            
+            for level, message in result['findings']:
+                if level == 'error':
+                    self.log_error(message)
+                else:
+                    self.log_warning(message)
+                    
+            if not result['ok']:
+                code_ok = False
+                
+        return code_ok
+
+    def _scanned_code_blocks(self, source: SourceFile) -> Optional[List[Dict[str, Any]]]:
+        """The code blocks of a file if it has already been scanned in this process, else None"""
+        if source.cached_artifact('code_blocks') is MISSING and source.cached_artifact('scan_items') is MISSING:
+            return None
+        return self.extract_code_blocks(source.path)
 
-    def validate_api_usage(self, code: str, source: str) -> bool:
-        """Validate API method calls against backend implementation"""
-        # Known API methods from the backend
-        client_methods = {
-            'compute_metrics', 'aggregate_metrics', 'check_safety', 
-            'add_metrics', 'get_analytics_summary', 'evaluate_agent',
-            'evaluate_code', 'set_factuality_scorer', 'evaluate_factuality',
-            'generate_model_card', 'generate_data_card'
-        }
+    @timed
+    def _collect_code_findings(self, source: SourceFile) -> Dict[str, Any]:
+        """Extract and validate one file's code examples in this process"""
+        return collect_code_findings(source.text, str(source.path), self.analyzer, source.scan_items)
+
+    @timed
+    def execute_code_examples(self, file_paths: List[Path]) -> Dict[str, int]:
+        """Run the code examples of the given files against the stub backend
         
-        config_params = {
-            'blocklist', 'redact_pii', 'regexes', 'case_insensitive',
-            'enable_analytics', 'analytics_window', 'analytics_alerts',
-            'metrics_include', 'metrics_lowercase'
-        }
+        Runtime failures, timeouts and out-of-range printed metrics are
+        reported as warnings. Identical snippets are executed once.
+        """
+        sources = [self.corpus.get(path) for path in file_paths]
+        # Outcomes depend on the sandbox limits and on the API the stub checks, so cached runs are keyed by them
+        artifact = f"snippet_runs-{self.sandbox.timeout:g}s-{self.sandbox.memory_mb}mb-{self.api.digest}"
+        pending = [source for source in sources if source.cached_artifact(artifact, persist=True) is MISSING]
         
-        try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Attribute):
-                        if isinstance(node.func.value, ast.Name) and node.func.value.id == 'client':
-                            method = node.func.attr
-                            if method not in client_methods:
-                                self.log_warning(f"Unknown client method in {source}: {method}")
-                                
-                elif isinstance(node, ast.keyword):
-                    if hasattr(node, 'arg') and node.arg:
-                        # Check if it's a BlazeMetricsClient constructor parameter
-                        if node.arg not in config_params and 'BlazeMetricsClient' in code:
-                            self.log_warning(f"Unknown config parameter in {source}: {node.arg}")
-                            
-            return True
-        except Exception as e:
-            self.log_error(f"Failed to validate API usage in {source}: {e}")
-            return False
-
-    def validate_expected_outputs(self, code: str, source: str) -> bool:
-        """Validate that expected outputs match realistic backend outputs"""
-        # Check for unrealistic metric values
-        if 'rouge1_f1:' in code or 'bleu:' in code:
-            # Extract numeric values
-            numbers = re.findall(r':\s*(\d+\.\d+)', code)
-            for num_str in numbers:
-                num = float(num_str)
-                if num > 1.0:
-                    self.log_error(f"Metric value > 1.0 in {source}: {num}")
-                    return False
+        runnable = []
+        for source in pending:
+            for block in self.extract_code_blocks(source.path):
+                code = block['code']
+                if len(code.strip()) >= MIN_SNIPPET_LENGTH and self.analyzer.analyze(code)['parsed']:
+                    runnable.append((source, block))
+                    
+        unique_codes = list(dict.fromkeys(block['code'] for _, block in runnable))
+        outcomes = dict(zip(unique_codes, self.sandbox.run_all(unique_codes)))
+        
+        file_runs = {str(source.path): {'findings': [], 'counts': {}} for source in pending}
+        for source, block in runnable:
+            location = f"{block['file']}:{block['line']}"
+            outcome = outcomes[block['code']]
+            runs = file_runs[str(source.path)]
+            runs['counts'][outcome['status']] = runs['counts'].get(outcome['status'], 0) + 1
+            
+            if outcome['status'] == 'error':
+                runs['findings'].append(f"Snippet failed against stub API in {location}: {outcome['error']}")
+            elif outcome['status'] == 'timeout':
+                runs['findings'].append(f"Snippet timed out in {location}: {outcome['error']}")
+            elif outcome['status'] == 'ok':
+                for _, label, detail in check_expected_outputs(outcome['stdout']):
+                    runs['findings'].append(f"{label} printed by {location}: {detail}")
                     
-        return True
+        for source in pending:
+            source.store_artifact(artifact, file_runs[str(source.path)], persist=True)
+            
+        totals = {}
+        for source in sources:
+            runs = source.artifact(artifact, lambda source: {'findings': [], 'counts': {}}, persist=True)
+            for message in runs['findings']:
+                self.log_warning(message)
+            for status, count in runs['counts'].items():
+                totals[status] = totals.get(status, 0) + count
+                
+        return totals
 
+    @timed
     def check_backend_examples_exist(self) -> bool:
         """Check that referenced backend examples actually exist"""
         expected_examples = [
@@ -176,13 +204,14 @@ class ContentValidator:
             use_case_path = use_cases_dir / example.replace("examples", "use_cases")
             
             if not example_path.exists() and not use_case_path.exists():
-                self.log_error(f"Referenced backend example does not exist: {example}")
+                self.log_error("Referenced backend example does not exist: {}", example)
                 all_exist = False
             else:
                 self.log_success(f"Backend example exists: {example}")
                 
         return all_exist
 
+    @timed
     def validate_links_and_references(self) -> bool:
         """Validate internal links and references"""
         # This would check that all href="/docs/..." links point to actual pages
@@ -199,13 +228,14 @@ class ContentValidator:
         for page in doc_pages:
             page_path = self.frontend_path / page
             if not page_path.exists():
-                self.log_error(f"Referenced documentation page does not exist: {page}")
+                self.log_error("Referenced documentation page does not exist: {}", page)
                 all_exist = False
             else:
                 self.log_success(f"Documentation page exists: {page}")
                 
         return all_exist
 
+    @timed
     def validate_interactive_demos(self) -> bool:
         """Validate that interactive demo components exist and are properly structured"""
         demo_components = [
@@ -221,7 +251,7 @@ class ContentValidator:
         for component in demo_components:
             component_path = self.frontend_path / component
             if not component_path.exists():
-                self.log_error(f"Interactive demo component does not exist: {component}")
+                self.log_error("Interactive demo component does not exist: {}", component)
                 all_exist = False
             else:
                 self.log_success(f"Interactive demo component exists: {component}")
@@ -247,54 +277,35 @@ class ContentValidator:
         
         # 4. Validate code examples in documentation
         print("\n🐍 Validating Python code examples...")
+        if self.api.source == 'builtin':
+            print(f"ℹ️  No blazemetrics package in {self.backend_path}; checking against the built-in API list")
+        else:
+            print(f"📚 Backend API from {self.api.source}: {len(self.api.modules)} modules, "
+                  f"{len(self.api.client_methods)} client methods, {len(self.api.config_params)} config "
+                  f"parameters ({self.api.reparsed} of {self.api.files} files re-indexed)")
         code_ok = True
         
         # Find all TypeScript files with potential Python code
-        tsx_files = list(self.frontend_path.glob("src/**/*.tsx"))
+        tsx_files = [source.path for source in self.corpus.files(('.tsx',))]
         
-        for tsx_file in tsx_files:
-            if 'docs' in str(tsx_file) or 'interactive' in str(tsx_file):
-                code_blocks = self.extract_code_blocks(tsx_file)
-                
-                for block in code_blocks:
-                    source = f"{block['file']}:{block['line']}"
-                    code = block['code']
-                    
-                    # Skip empty or very short code blocks
-                    if len(code.strip()) < 10:
-                        continue
-                        
-                    # Validate syntax
-                    if not self.validate_python_syntax(code, source):
-                        code_ok = False
-                        continue
-                        
-                    # Validate imports
-                    if not self.validate_imports(code, source):
-                        code_ok = False
-                        
-                    # Validate API usage
-                    if not self.validate_api_usage(code, source):
-                        code_ok = False
-                        
-                    # Validate expected outputs
-                    if not self.validate_expected_outputs(code, source):
-                        code_ok = False
+        doc_files = [tsx_file for tsx_file in tsx_files if self.is_doc_file(tsx_file)]
+        if not self.validate_code_examples(doc_files):
+            code_ok = False
+            
+        # 5. Optionally execute code examples against the stub backend
+        if self.sandbox is not None:
+            print("\n🧪 Executing Python code examples against the stub backend...")
+            totals = self.execute_code_examples(doc_files)
+            print(f"🧪 Snippets: {totals.get('ok', 0)} passed, {totals.get('error', 0)} failed, "
+                  f"{totals.get('timeout', 0)} timed out, {totals.get('skipped', 0)} skipped "
+                  f"(missing third-party modules)")
         
         # Summary
         print("\n" + "=" * 60)
         print("📊 VALIDATION SUMMARY")
         print("=" * 60)
         
-        if self.errors:
-            print(f"❌ {len(self.errors)} errors found:")
-            for error in self.errors:
-                print(f"   • {error}")
-                
-        if self.warnings:
-            print(f"⚠️  {len(self.warnings)} warnings found:")
-            for warning in self.warnings:
-                print(f"   • {warning}")
+        print_finding_summary(self.errors, self.warnings, self.reporter.verbose)
                 
         overall_ok = backend_ok and docs_ok and demos_ok and code_ok and len(self.errors) == 0
         
@@ -306,6 +317,33 @@ class ContentValidator:
         return overall_ok
 
 if __name__ == "__main__":
-    validator = ContentValidator()
-    success = validator.run_validation()
+    parser = argparse.ArgumentParser(description="Validate code examples in the frontend documentation")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes for code example validation (default: 1)")
+    parser.add_argument("--execute", action="store_true",
+                        help="also run code examples against a stub of the blazemetrics API")
+    parser.add_argument("--exec-workers", type=int, default=4,
+                        help="pre-forked sandbox workers for --execute (default: 4)")
+    parser.add_argument("--exec-timeout", type=float, default=5.0,
+                        help="per-snippet timeout in seconds for --execute (default: 5)")
+    parser.add_argument("--exec-memory", type=int, default=512,
+                        help="per-worker memory limit in MB for --execute (default: 512)")
+    add_manifest_arguments(parser)
+    add_profile_arguments(parser)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    corpus = SourceCorpus(Path("."), manifest=build_manifest(args))
+    sandbox = None
+    if args.execute:
+        sandbox = SnippetSandbox(workers=args.exec_workers, timeout=args.exec_timeout,
+                                 memory_mb=args.exec_memory)
+    try:
+        with reporting(args) as reporter:
+            validator = ContentValidator(corpus=corpus, jobs=args.jobs, sandbox=sandbox, reporter=reporter)
+            with instrumented_run(args, 'validate-content', validator.instrumentation):
+                success = validator.run_validation()
+    finally:
+        if sandbox is not None:
+            sandbox.close()
+    corpus.save()
     sys.exit(0 if success else 1)
\ No newline at end of file
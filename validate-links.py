@@ -5,201 +5,345 @@ Link Validation Script for BlazeMetrics Frontend
 Validates all internal and external links in the frontend documentation.
 """
 
-import re
-import requests
-from pathlib import Path
-from urllib.parse import urljoin, urlparse
+import argparse
+import sys
 import time
-from typing import Set, List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any
+
+from validation.anchors import AnchorIndex
+from validation.assets import build_asset_index
+from validation.corpus import SourceCorpus, SourceFile
+from validation.instrument import Instrumentation, add_profile_arguments, instrumented_run, timed
+from validation.linkcache import DEFAULT_CACHE_FILE, LinkResultCache
+from validation.linkcheck import DEFAULT_MAX_HOST_FAILURES, DEFAULT_MAX_PENDING, ExternalLinkChecker
+from validation.manifest import add_manifest_arguments, build_manifest
+from validation.records import FileTable, FindingLog, Link
+from validation.report import Reporter, TextReporter, add_report_arguments, print_finding_summary, reporting
+from validation.routes import RouteIndex, build_route_index, normalize_path
+from validation.textscan import heading_slug, iter_page_matches
 
 class LinkValidator:
-    def __init__(self):
+    # Names this validator's findings in merged reports
+    tool = 'validate-links'
+
+    def __init__(self, jobs: int = 8, per_host: int = 1, host_delay: float = 0.5, timeout: float = 10.0,
+                 cache: LinkResultCache = None, corpus: SourceCorpus = None,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 max_host_failures: int = DEFAULT_MAX_HOST_FAILURES, offline: bool = False,
+                 instrumentation: Instrumentation = None, reporter: Reporter = None):
         self.frontend_path = Path(".")
-        self.errors = []
-        self.warnings = []
+        self.corpus = corpus or SourceCorpus(self.frontend_path)
+        self.instrumentation = instrumentation or Instrumentation(self.corpus)
+        self.jobs = jobs
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.cache = cache
+        self.max_pending = max_pending
+        self.max_host_failures = max_host_failures
+        self.offline = offline
+        self.anchor_index = None
+        self.reporter = reporter or TextReporter()
+        self.errors = FindingLog()
+        self.warnings = FindingLog()
+        self.files = FileTable()
         self.checked_urls = set()
+        # Last result per external URL, for callers that report links again (watch mode)
+        self.external_results: Dict[str, Dict[str, Any]] = {}
+        self.network_checks = 0
+        self.offline_skipped = 0
         self.internal_links = set()
         self.external_links = set()
         
-    def log_error(self, message: str):
-        """Log a validation error"""
-        self.errors.append(message)
-        print(f"❌ ERROR: {message}")
+    def log_error(self, message: str, *args):
+        """Log a validation error; message is a str.format template when args are given"""
+        self.reporter.report(self.tool, 'error', self.errors.add(message, args), message)
         
-    def log_warning(self, message: str):
-        """Log a validation warning"""
-        self.warnings.append(message)
-        print(f"⚠️  WARNING: {message}")
+    def log_warning(self, message: str, *args):
+        """Log a validation warning; message is a str.format template when args are given"""
+        self.reporter.report(self.tool, 'warning', self.warnings.add(message, args), message)
         
     def log_success(self, message: str):
-        """Log a successful validation"""
-        print(f"✅ {message}")
+        """Log a successful validation, reported only when the reporter is verbose"""
+        self.reporter.report(self.tool, 'success', message)
 
-    def extract_links_from_file(self, file_path: Path) -> List[Dict[str, Any]]:
+    @timed
+    def extract_links_from_file(self, file_path: Path) -> List[Link]:
         """Extract all links from a TypeScript/React file"""
         links = []
         
         try:
-            content = file_path.read_text(encoding='utf-8')
-            
-            # Patterns to match different types of links
-            patterns = [
-                # href attributes
-                r'href=["\'](.*?)["\']',
-                # to attributes (React Router)
-                r'to=["\'](.*?)["\']',
-                # src attributes for images
-                r'src=["\'](.*?)["\']',
-                # Links in markdown-like content
-                r'\[.*?\]\((.*?)\)',
-                # Template literal URLs
-                r'`(https?://[^`]*)`',
-                # String URLs
-                r'"(https?://[^"]*)"',
-                r"'(https?://[^']*)'",
-            ]
-            
-            for pattern in patterns:
-                matches = re.finditer(pattern, content, re.MULTILINE)
-                for match in matches:
-                    url = match.group(1)
-                    # Skip empty, javascript:, mailto:, tel: links
-                    if url and not url.startswith(('javascript:', 'mailto:', 'tel:', '#')):
-                        links.append({
-                            'url': url,
-                            'file': str(file_path),
-                            'line': content[:match.start()].count('\n') + 1
-                        })
-                        
+            scan = self.scan_page(file_path)
+            file_id = self.files.id(file_path)
+            links = [Link(url, file_id, line) for url, line in zip(scan['link_urls'], scan['link_lines'])]
         except Exception as e:
-            self.log_error(f"Failed to extract links from {file_path}: {e}")
+            self.log_error("Failed to extract links from {}: {}", file_path, e)
             
         return links
 
-    def categorize_links(self, links: List[Dict[str, Any]]) -> None:
-        """Categorize links as internal or external"""
+    def scan_page(self, file_path: Path) -> Dict[str, Any]:
+        """Links, in-page #links and anchor targets of a file, from one cached scan"""
+        source = self.corpus.get(file_path)
+        # Scans read back from the manifest hold fresh string copies; intern them once per run
+        return source.artifact('interned_page_scan', lambda source: self._intern_scan(
+            source.artifact('page_scan', self._scan_page, persist=True)))
+
+    @staticmethod
+    def _intern_scan(scan: Dict[str, Any]) -> Dict[str, Any]:
+        """Share one string object per distinct URL and id across all files"""
+        scan['link_urls'] = [sys.intern(url) for url in scan['link_urls']]
+        scan['ids'] = [sys.intern(anchor) for anchor in scan['ids']]
+        return scan
+
+    @staticmethod
+    def _scan_page(source: SourceFile) -> Dict[str, Any]:
+        """Scan a corpus file once for link candidates and the ids it renders"""
+        line_index = source.line_index
+        # Links are kept as two columns; the file is implied by the artifact's owner
+        scan = {'link_urls': [], 'link_lines': [], 'fragments': [], 'ids': [], 'headings': [],
+                'dynamic_ids': False, 'section_indicator': False}
+        for kind, value, offset in iter_page_matches(source.text, source.scan_items):
+            if kind == 'link':
+                scan['link_urls'].append(value)
+                scan['link_lines'].append(line_index.line_of(offset))
+            elif kind == 'fragment':
+                scan['fragments'].append({'fragment': value, 'line': line_index.line_of(offset)})
+            elif kind == 'id':
+                scan['ids'].append(value)
+            elif kind == 'heading':
+                scan['headings'].append(heading_slug(value))
+            elif kind == 'dynamic_id':
+                scan['dynamic_ids'] = True
+            elif kind == 'section_indicator':
+                scan['section_indicator'] = True
+        return scan
+
+    def categorize_links(self, links: List[Link]) -> List[str]:
+        """Categorize links as internal or external, returning external URLs not seen before"""
+        new_external = []
         for link in links:
-            url = link['url']
+            url = link.url
             
             if url.startswith(('http://', 'https://')):
-                self.external_links.add(url)
+                if url not in self.external_links:
+                    self.external_links.add(url)
+                    new_external.append(url)
             elif url.startswith('/') or not url.startswith(('http', 'mailto', 'tel')):
                 self.internal_links.add(url)
+                
+        return new_external
 
+    @timed
     def validate_internal_links(self) -> bool:
         """Validate internal links against actual file structure"""
         print("\n🔗 Validating internal links...")
         
-        # Map of expected routes to actual files
-        route_mappings = {
-            '/': 'src/pages/Home.tsx',
-            '/docs/getting-started': 'src/pages/docs/GettingStarted.tsx',
-            '/docs/metrics': 'src/pages/docs/MetricsGuide.tsx',
-            '/docs/llm-integration': 'src/pages/docs/LLMIntegrationGuide.tsx',
-            '/docs/llm-use-cases': 'src/pages/docs/LLMUseCases.tsx',
-            '/docs/llm-safety': 'src/pages/docs/LLMSafetyGuardrails.tsx',
-            '/docs/advanced-evaluators': 'src/pages/docs/AdvancedEvaluators.tsx',
-            '/docs/api-reference': 'src/pages/docs/APIReference.tsx',
-            '/docs/architecture': 'src/pages/docs/ArchitectureGuide.tsx',
-            '/docs/analytics': 'src/pages/docs/AnalyticsGuide.tsx',
-            '/docs/production': 'src/pages/docs/ProductionGuide.tsx',
-            '/docs/guardrails': 'src/pages/docs/GuardrailsGuide.tsx',
-            '/use-cases': 'src/pages/UseCases.tsx',
-            '/benchmarks': 'src/pages/Benchmarks.tsx',
-            '/learning-paths': 'src/pages/LearningPaths.tsx',
-            '/about': 'src/pages/About.tsx',
-            '/blog': 'src/pages/Blog.tsx',
-        }
+        # Routes and their page files, derived from the <Route> declarations in App.tsx
+        route_index = build_route_index(self.corpus, self.frontend_path)
+        anchor_index = self.build_anchor_index(route_index.routes)
         
         all_valid = True
         
         for link in self.internal_links:
-            # Clean up the link (remove query params, fragments)
-            clean_link = link.split('?')[0].split('#')[0]
-            
-            if clean_link in route_mappings:
-                file_path = self.frontend_path / route_mappings[clean_link]
-                if file_path.exists():
-                    self.log_success(f"Internal link valid: {link}")
-                else:
-                    self.log_error(f"Internal link points to missing file: {link} -> {file_path}")
-                    all_valid = False
-            elif clean_link.startswith('/docs/'):
-                # Check if it's a valid docs route
-                self.log_warning(f"Unknown docs route: {link}")
-            elif clean_link.startswith('/'):
-                # Check if it's a static asset
-                if clean_link.startswith('/images/') or clean_link.startswith('/public/'):
-                    # These should exist in the public directory
-                    asset_path = self.frontend_path / 'public' / clean_link.lstrip('/')
-                    if not asset_path.exists():
-                        self.log_warning(f"Static asset not found: {link}")
-                else:
-                    self.log_warning(f"Unknown internal route: {link}")
+            all_valid = self.check_internal_link(link, route_index, anchor_index) and all_valid
             
         return all_valid
 
-    def validate_external_links(self) -> bool:
-        """Validate external links by making HTTP requests"""
-        print("\n🌐 Validating external links...")
-        
-        all_valid = True
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'BlazeMetrics-LinkValidator/1.0'
-        })
+    def check_internal_link(self, link: str, route_index: RouteIndex, anchor_index: AnchorIndex) -> bool:
+        """Validate one internal link against the routes and their anchors; False if it is broken"""
+        # Clean up the link (remove query params, fragments)
+        clean_link = normalize_path(link)
+        route = route_index.resolve(clean_link)
         
-        for url in self.external_links:
-            if url in self.checked_urls:
-                continue
+        if route is not None:
+            if route['file'] is None:
+                self.log_error("Internal link route has no resolvable page component: {} -> {}",
+                               link, route['component'])
+                return False
                 
-            try:
-                # Add delay to be respectful
-                time.sleep(0.5)
-                
-                response = session.head(url, timeout=10, allow_redirects=True)
-                
-                if response.status_code == 405:  # Method not allowed, try GET
-                    response = session.get(url, timeout=10, allow_redirects=True)
-                
-                if response.status_code < 400:
-                    self.log_success(f"External link valid: {url}")
-                else:
-                    self.log_error(f"External link returned {response.status_code}: {url}")
-                    all_valid = False
-                    
-                self.checked_urls.add(url)
-                
-            except requests.exceptions.Timeout:
-                self.log_warning(f"External link timeout: {url}")
-            except requests.exceptions.ConnectionError:
-                self.log_warning(f"External link connection error: {url}")
-            except Exception as e:
-                self.log_warning(f"External link error: {url} - {e}")
+            file_path = self.frontend_path / route['file']
+            if not file_path.exists():
+                self.log_error("Internal link points to missing file: {} -> {}", link, file_path)
+                return False
                 
+            # Deep links must name an id the page (or a component it renders) defines
+            fragment = link.split('#', 1)[1] if '#' in link else ''
+            if fragment and anchor_index.has(route['path'], fragment) is False:
+                self.log_warning("Unknown fragment #{} on {}: {}", fragment, route['path'], link)
+            else:
+                self.log_success(f"Internal link valid: {link}")
+        elif clean_link.startswith('/docs/'):
+            # Check if it's a valid docs route
+            self.log_warning("Unknown docs route: {}", link)
+        elif clean_link.startswith('/'):
+            # Check if it's a static asset
+            if clean_link.startswith('/images/') or clean_link.startswith('/public/'):
+                # These should exist in the public directory
+                if clean_link not in build_asset_index(self.frontend_path / 'public'):
+                    self.log_warning("Static asset not found: {}", link)
+            else:
+                self.log_warning("Unknown internal route: {}", link)
+        return True
+
+    def build_anchor_index(self, routes: List[Dict[str, Any]]) -> AnchorIndex:
+        """Anchor ids per route, from the same page scans that produced the links"""
+        if self.anchor_index is None:
+            self.anchor_index = AnchorIndex(self.corpus, routes, self.scan_page, self.frontend_path)
+        return self.anchor_index
+
+    @timed
+    def validate_in_page_fragments(self, sources: List[SourceFile]) -> None:
+        """Check href="#x" links against the ids of the pages rendering their file"""
+        anchor_index = self.build_anchor_index(build_route_index(self.corpus, self.frontend_path).routes)
+        
+        for source in sources:
+            for link in self.scan_page(source.path)['fragments']:
+                if anchor_index.has_in_module(source.path, link['fragment']) is False:
+                    self.log_warning("In-page link to unknown fragment in {}:{}: #{}",
+                                     source.path, link['line'], link['fragment'])
+
+    def build_checker(self) -> ExternalLinkChecker:
+        """External link checker configured from this validator's options"""
+        return ExternalLinkChecker(
+            jobs=self.jobs,
+            per_host=self.per_host,
+            host_delay=self.host_delay,
+            timeout=self.timeout,
+            cache=self.cache,
+            max_host_failures=self.max_host_failures,
+            offline=self.offline
+        )
+
+    def report_external_result(self, result: Dict[str, Any]) -> bool:
+        """Log one external link result; False if the link is broken"""
+        url = result['url']
+        self.external_results[url] = result
+        if result['source'] in ('network', 'revalidated'):
+            self.network_checks += 1
+            
+        if result['error'] == 'offline':
+            self.offline_skipped += 1
+        elif result['error'] == 'host_unreachable':
+            self.log_warning("External link not checked, host unreachable: {} ({})", url, result['detail'])
+        elif result['error'] == 'timeout':
+            self.log_warning("External link timeout: {}", url)
+        elif result['error'] == 'connection':
+            self.log_warning("External link connection error: {}", url)
+        elif result['error']:
+            self.log_warning("External link error: {} - {}", url, result['detail'])
+        elif result['status'] < 400:
+            self.log_success(f"External link valid: {url}")
+            self.checked_urls.add(url)
+        else:
+            self.log_error("External link returned {}: {}", result['status'], url)
+            self.checked_urls.add(url)
+            return False
+        return True
+
+    def report_check_summary(self, checker: ExternalLinkChecker) -> None:
+        """Print the requests saved, the hosts given up on and the links offline mode left unchecked"""
+        self.instrumentation.add_samples('ExternalLinkChecker.check_url', checker.request_seconds)
+        if checker.requests_saved or checker.ranged_gets:
+            print(f"♻️  Requests saved: {checker.deduplicated} duplicate URLs, "
+                  f"{checker.redirect_hits} known redirect targets; {checker.ranged_gets} ranged GET "
+                  f"fallbacks skipped {checker.bytes_avoided / 1024:.1f} kB of response bodies")
+        for host, skipped in sorted(checker.breaker.open_hosts.items()):
+            print(f"🔌 Host unreachable, circuit open: {host} ({skipped} links not checked)")
+        if self.offline_skipped:
+            print(f"📴 Offline: {self.offline_skipped} external links not in the cache were not checked")
+
+    def save_link_cache(self) -> None:
+        """Persist the external link cache and print its hit counts"""
+        if self.cache:
+            self.cache.save()
+            print(f"💾 Link cache: {self.cache.hits} fresh hits, {self.cache.revalidated} revalidated, "
+                  f"{self.network_checks} network checks")
+
+    @timed
+    def validate_external_links(self) -> bool:
+        """Validate the collected external links by making concurrent HTTP requests"""
+        print(f"\n🌐 Validating external links ({self.jobs} jobs)...")
+        
+        all_valid = True
+        checker = self.build_checker()
+        try:
+            for result in checker.check_all(self.external_links - self.checked_urls):
+                all_valid = self.report_external_result(result) and all_valid
+        finally:
+            checker.close()
+            
+        self.report_check_summary(checker)
+        self.save_link_cache()
+        return all_valid
+
+    @timed
+    def scan_and_check_links(self, sources: List[SourceFile]) -> bool:
+        """Scan sources and check each new external URL as soon as it is found
+
+        Returns whether all external links are valid. Internal links are
+        only collected here and validated once the scan is complete.
+        """
+        all_valid = True
+        total_links = 0
+        start = time.perf_counter()
+        first_result = None
+
+        checker = self.build_checker()
+        try:
+            with checker.stream(self.max_pending) as stream:
+                for source in sources:
+                    links = self.extract_links_from_file(source.path)
+                    total_links += len(links)
+                    self.check_common_issues(links)
+
+                    # submit() blocks once max_pending checks are outstanding
+                    for url in self.categorize_links(links):
+                        if url not in self.checked_urls:
+                            stream.submit(url)
+
+                    for result in stream.ready():
+                        first_result = first_result or time.perf_counter() - start
+                        all_valid = self.report_external_result(result) and all_valid
+
+                print(f"🔍 Found {total_links} total links")
+                print(f"📍 Internal links: {len(self.internal_links)}")
+                print(f"🌐 External links: {len(self.external_links)}")
+
+                # Time spent on the network once the scan is done
+                with self.instrumentation.phase('LinkValidator.finish_external_checks'):
+                    for result in stream.finish():
+                        first_result = first_result or time.perf_counter() - start
+                        all_valid = self.report_external_result(result) and all_valid
+        finally:
+            checker.close()
+
+        if first_result is not None:
+            print(f"⏱️  First external result after {first_result:.2f}s, "
+                  f"all done after {time.perf_counter() - start:.2f}s")
+        self.report_check_summary(checker)
+        self.save_link_cache()
         return all_valid
 
-    def check_common_issues(self, links: List[Dict[str, Any]]) -> None:
+    def check_common_issues(self, links: List[Link]) -> None:
         """Check for common link issues"""
-        print("\n🔍 Checking for common link issues...")
-        
-        for link_info in links:
-            url = link_info['url']
-            source = f"{link_info['file']}:{link_info['line']}"
+        for link in links:
+            url = link.url
+            file = self.files.path(link.file_id)
             
             # Check for localhost links (should be relative)
             if 'localhost' in url:
-                self.log_warning(f"Localhost link found in {source}: {url}")
+                self.log_warning("Localhost link found in {}:{}: {}", file, link.line, url)
                 
             # Check for hardcoded domain links (should be relative for internal)
             if url.startswith('https://blazemetrics.') or url.startswith('http://blazemetrics.'):
-                self.log_warning(f"Hardcoded domain link in {source}: {url}")
+                self.log_warning("Hardcoded domain link in {}:{}: {}", file, link.line, url)
                 
             # Check for broken fragment links
             if '#' in url and not url.startswith('http'):
                 fragment = url.split('#')[1]
                 if not fragment:
-                    self.log_warning(f"Empty fragment in {source}: {url}")
+                    self.log_warning("Empty fragment in {}:{}: {}", file, link.line, url)
 
     def run_validation(self) -> bool:
         """Run all link validation checks"""
@@ -207,47 +351,25 @@ class LinkValidator:
         print("=" * 60)
         
         # Find all TypeScript/React files
-        tsx_files = list(self.frontend_path.glob("src/**/*.tsx"))
-        ts_files = list(self.frontend_path.glob("src/**/*.ts"))
-        all_files = tsx_files + ts_files
+        all_files = self.corpus.files(('.tsx', '.ts'))
         
-        print(f"\n📁 Scanning {len(all_files)} files for links...")
+        print(f"\n📁 Scanning {len(all_files)} files for links, checking external links as they are found "
+              f"({self.jobs} jobs)...")
+        print("🔍 Checking for common link issues...")
         
-        all_links = []
-        for file_path in all_files:
-            links = self.extract_links_from_file(file_path)
-            all_links.extend(links)
-            
-        print(f"🔍 Found {len(all_links)} total links")
-        
-        # Categorize links
-        self.categorize_links(all_links)
-        print(f"📍 Internal links: {len(self.internal_links)}")
-        print(f"🌐 External links: {len(self.external_links)}")
-        
-        # Check for common issues
-        self.check_common_issues(all_links)
+        # Scan, check for common issues and validate external links (with rate limiting) in one pass
+        external_valid = self.scan_and_check_links(all_files)
         
         # Validate internal links
         internal_valid = self.validate_internal_links()
-        
-        # Validate external links (with rate limiting)
-        external_valid = self.validate_external_links()
+        self.validate_in_page_fragments(all_files)
         
         # Summary
         print("\n" + "=" * 60)
         print("📊 LINK VALIDATION SUMMARY")
         print("=" * 60)
         
-        if self.errors:
-            print(f"❌ {len(self.errors)} errors found:")
-            for error in self.errors:
-                print(f"   • {error}")
-                
-        if self.warnings:
-            print(f"⚠️  {len(self.warnings)} warnings found:")
-            for warning in self.warnings:
-                print(f"   • {warning}")
+        print_finding_summary(self.errors, self.warnings, self.reporter.verbose)
                 
         overall_valid = internal_valid and external_valid and len(self.errors) == 0
         
@@ -258,8 +380,63 @@ class LinkValidator:
             
         return overall_valid
 
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the link validation options on a parser"""
+    parser.add_argument("--jobs", type=int, default=8,
+                        help="number of concurrent external link checks (default: 8)")
+    parser.add_argument("--per-host", type=int, default=1,
+                        help="maximum concurrent requests to a single host (default: 1)")
+    parser.add_argument("--host-delay", type=float, default=0.5,
+                        help="seconds between consecutive requests to the same host (default: 0.5)")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="per-request timeout in seconds (default: 10)")
+    parser.add_argument("--cache-file", type=Path, default=DEFAULT_CACHE_FILE,
+                        help=f"external link result cache (default: {DEFAULT_CACHE_FILE})")
+    parser.add_argument("--cache-ttl", type=float, default=24 * 3600,
+                        help="seconds before a cached result is revalidated (default: 86400)")
+    parser.add_argument("--cache-size", type=int, default=5000,
+                        help="maximum number of cached URLs (default: 5000)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="check every external link over the network")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help=f"external checks queued or in flight before the scan waits (default: {DEFAULT_MAX_PENDING})")
+    parser.add_argument("--max-host-failures", type=int, default=DEFAULT_MAX_HOST_FAILURES,
+                        help="consecutive timeouts/connection errors before a host's remaining links are "
+                             f"skipped as unreachable, 0 to never skip (default: {DEFAULT_MAX_HOST_FAILURES})")
+    parser.add_argument("--offline", action="store_true",
+                        help="make no network requests; report external links from the cache only")
+
+def build_validator(args: argparse.Namespace, corpus: SourceCorpus = None,
+                    instrumentation: Instrumentation = None, reporter: Reporter = None) -> LinkValidator:
+    """Create a LinkValidator from parsed command line options"""
+    cache = None
+    if not args.no_cache:
+        cache = LinkResultCache(args.cache_file, ttl=args.cache_ttl, max_entries=args.cache_size)
+    return LinkValidator(
+        jobs=args.jobs,
+        per_host=args.per_host,
+        host_delay=args.host_delay,
+        timeout=args.timeout,
+        cache=cache,
+        corpus=corpus,
+        max_pending=args.max_pending,
+        max_host_failures=args.max_host_failures,
+        offline=args.offline,
+        instrumentation=instrumentation,
+        reporter=reporter
+    )
+
 if __name__ == "__main__":
-    import sys
-    validator = LinkValidator()
-    success = validator.run_validation()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Validate internal and external links in the frontend")
+    add_arguments(parser)
+    add_manifest_arguments(parser)
+    add_profile_arguments(parser)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    corpus = SourceCorpus(Path("."), manifest=build_manifest(args))
+    with reporting(args) as reporter:
+        validator = build_validator(args, corpus=corpus, reporter=reporter)
+        with instrumented_run(args, 'validate-links', validator.instrumentation):
+            success = validator.run_validation()
+    corpus.save()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,5 @@
+"""
+Shared helpers for the BlazeMetrics frontend validation scripts
+===============================================================
+Used by validate-links.py, validate-content.py and test-ux.py.
+"""
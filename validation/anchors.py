@@ -0,0 +1,102 @@
+"""
+Fragment targets of every routed page
+=====================================
+A page can be deep-linked (``/docs/x#section``) to any element id it renders,
+including ids set by the components it imports. ``AnchorIndex`` collects,
+per route, the literal ``id="..."``/``id={"..."}`` values of the page module
+and its static imports. When one of those modules renders
+``<SectionIndicator />`` the slugs it assigns to plain-text headings count
+too.
+
+Ids come from the per-file page scan (the same pass that extracts links),
+and each route's anchor set is built once, so checking a fragment is a dict
+and a set lookup. Pages with computed ids (``id={sectionId}``) are marked
+dynamic: a fragment missing from them cannot be proven broken.
+
+``update_module`` follows an edit of one existing module: it re-reads that
+module's imports and re-collects only the routes rendering it, so watch
+mode does not rebuild the graph on every save.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from validation.imports import ModuleGraph
+
+
+class AnchorIndex:
+    """Route path -> (known anchor ids, has computed ids)"""
+
+    def __init__(self, corpus, routes: List[Dict[str, Any]], page_scan: Callable[[Path], Dict[str, Any]],
+                 root: Path = Path(".")):
+        self.graph = ModuleGraph(corpus, root)
+        self.page_scan = page_scan
+        self.anchors: Dict[str, Tuple[Set[str], bool]] = {}
+        self._routes_of_module: Dict[str, List[str]] = {}
+        self._module_anchors: Dict[str, Tuple[Set[str], bool]] = {}
+        # Route path -> its page file and the modules it renders
+        self._pages: Dict[str, Path] = {}
+        self._route_modules: Dict[str, Set[str]] = {}
+
+        for route in routes:
+            if route['file'] is None or route['path'] in ('*', '/*') or not Path(route['file']).is_file():
+                continue
+            self._pages[route['path']] = Path(route['file'])
+            self._index_route(route['path'])
+
+    def _index_route(self, route_path: str) -> None:
+        for module in self._route_modules.get(route_path, ()):
+            self._routes_of_module[module].remove(route_path)
+        modules = self.graph.closure(self.graph.add(self._pages[route_path]))
+        self._route_modules[route_path] = modules
+        self.anchors[route_path] = self._collect(modules)
+        for module in modules:
+            self._routes_of_module.setdefault(module, []).append(route_path)
+
+    def update_module(self, module: Path) -> None:
+        """Re-read an edited module and re-collect the anchors of the routes rendering it
+
+        Only for edits: a created or deleted file can change how other
+        modules' imports resolve, which needs a new index.
+        """
+        key = str(module)
+        self.graph.remove(key)
+        self._module_anchors.clear()
+        for route_path in list(self._routes_of_module.get(key, ())):
+            self._index_route(route_path)
+
+    def _collect(self, modules: Set[str]) -> Tuple[Set[str], bool]:
+        scans = [self.page_scan(Path(module)) for module in sorted(modules)]
+        anchors = {anchor for scan in scans for anchor in scan['ids']}
+        if any(scan['section_indicator'] for scan in scans):
+            anchors.update(slug for scan in scans for slug in scan['headings'])
+        return anchors, any(scan['dynamic_ids'] for scan in scans)
+
+    def has(self, route_path: str, fragment: str) -> Optional[bool]:
+        """Whether the route renders the fragment; None when that cannot be decided"""
+        anchors, dynamic = self.anchors.get(route_path, (set(), True))
+        if fragment in anchors:
+            return True
+        return None if dynamic else False
+
+    def routes_of_module(self, module: Path) -> List[str]:
+        """Paths of the routes whose page renders module"""
+        return self._routes_of_module.get(str(module), [])
+
+    def has_in_module(self, module: Path, fragment: str) -> Optional[bool]:
+        """Like has() for an in-page #link written in module, across every page rendering it"""
+        routes = self._routes_of_module.get(str(module))
+        if routes:
+            results = [self.has(route_path, fragment) for route_path in routes]
+            if any(results):
+                return True
+            return None if None in results else False
+
+        # Not routed (or unreachable): only the module's own subtree is known
+        key = str(module)
+        if key not in self._module_anchors:
+            self._module_anchors[key] = self._collect(self.graph.closure(self.graph.add(module)))
+        anchors, dynamic = self._module_anchors[key]
+        if fragment in anchors:
+            return True
+        return None if dynamic else False
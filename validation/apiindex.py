@@ -0,0 +1,399 @@
+"""
+Public API index of the blazemetrics backend package
+====================================================
+Documentation snippets are checked against the API the backend package
+actually exports, not a hand-kept list. ``build_api_index`` finds the
+``blazemetrics`` package in the backend checkout and parses every module
+(``.py`` and ``.pyi`` stubs of compiled modules) with ``ast``, without
+importing it. Per module it records:
+- ``__all__``
+- the public names it defines or imports
+- its classes, with bases, public methods and their signatures, and
+  constructor parameters (``__init__`` or dataclass fields)
+- its functions
+
+Per-module records are kept in a ``Manifest`` of their own, so a module is
+only parsed again when its size and mtime, and then its content hash,
+changed. The records are then merged into an ``ApiIndex``:
+- the names each public module exports, following re-exports and star
+  imports within the package
+- the public methods of ``BlazeMetricsClient``, inherited ones included
+- its constructor keyword parameters
+
+Snippet checks are set lookups against the index. Without a backend
+checkout the built-in lists below are used instead.
+"""
+
+import ast
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from validation.corpus import SourceCorpus, SourceFile
+from validation.manifest import Manifest, validator_fingerprint
+
+PACKAGE = 'blazemetrics'
+CLIENT_CLASS = 'BlazeMetricsClient'
+DEFAULT_API_CACHE = Path(".validation-cache") / "backend-api.json"
+# Where the package lives in a backend checkout: flat, maturin (python/) and src layouts
+PACKAGE_PARENTS = ('', 'python', 'src')
+MODULE_SUFFIXES = ('.py', '.pyi')
+# How many re-exports or base classes to follow before giving up on a name
+MAX_RESOLVE_DEPTH = 10
+
+# Built-in API surface, used when the backend package is not checked out
+VALID_IMPORTS = {
+    'blazemetrics': ['BlazeMetricsClient'],
+    'blazemetrics.llm_judge': ['LLMJudge'],
+    'blazemetrics.agent_eval': ['AgentEvaluator'],
+    'blazemetrics.code_evaluator': ['CodeEvaluator'],
+    'blazemetrics.factuality_evaluator': ['FactualityEvaluator'],
+}
+
+CLIENT_METHODS = {
+    'compute_metrics', 'aggregate_metrics', 'check_safety',
+    'add_metrics', 'get_analytics_summary', 'evaluate_agent',
+    'evaluate_code', 'set_factuality_scorer', 'evaluate_factuality',
+    'generate_model_card', 'generate_data_card'
+}
+
+CONFIG_PARAMS = {
+    'blocklist', 'redact_pii', 'regexes', 'case_insensitive',
+    'enable_analytics', 'analytics_window', 'analytics_alerts',
+    'metrics_include', 'metrics_lowercase'
+}
+
+
+class ApiIndex:
+    """Exported names per module, client methods and config parameters, as sets
+
+    ``accepts_any_config`` is set when the client constructor takes
+    ``**kwargs``: any keyword is then a valid config parameter.
+    """
+
+    def __init__(self, modules: Dict[str, Iterable[str]], client_methods: Iterable[str],
+                 config_params: Iterable[str], classes: Optional[Dict[str, Dict[str, Any]]] = None,
+                 source: str = 'builtin', accepts_any_config: bool = False):
+        self.modules = {module: set(names) for module, names in modules.items()}
+        self.client_methods = set(client_methods)
+        self.config_params = set(config_params)
+        self.accepts_any_config = accepts_any_config
+        # Qualified name of every exported class -> its methods' signatures and constructor parameters
+        self.classes = classes or {}
+        self.source = source
+        self.files = 0
+        self.reparsed = 0
+        self.digest = hashlib.blake2b(json.dumps(
+            [{module: sorted(names) for module, names in self.modules.items()},
+             sorted(self.client_methods), sorted(self.config_params), accepts_any_config], sort_keys=True
+        ).encode('utf-8'), digest_size=8).hexdigest()
+
+    def exports(self, module: str) -> Optional[Set[str]]:
+        """Names importable from a public module, or None for an unknown module"""
+        return self.modules.get(module)
+
+    def is_config_param(self, name: str) -> bool:
+        """Whether the client constructor accepts name as a keyword"""
+        return self.accepts_any_config or name in self.config_params
+
+
+BUILTIN_API = ApiIndex(VALID_IMPORTS, CLIENT_METHODS, CONFIG_PARAMS)
+
+
+def signature(node: ast.AST, method: bool = False) -> Dict[str, Any]:
+    """Parameter names of a function definition, without self/cls for methods"""
+    args = node.args
+    params = [arg.arg for arg in args.posonlyargs + args.args]
+    decorators = {decorator_name(decorator) for decorator in node.decorator_list}
+    if method and params and 'staticmethod' not in decorators:
+        params = params[1:]
+    return {
+        'params': params,
+        'kwonly': [arg.arg for arg in args.kwonlyargs],
+        'varargs': args.vararg is not None,
+        'varkw': args.kwarg is not None,
+    }
+
+
+def decorator_name(node: ast.AST) -> str:
+    """Last dotted component of a decorator, ignoring call arguments: @dataclasses.dataclass(frozen=True)"""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return node.id if isinstance(node, ast.Name) else ''
+
+
+def dotted_name(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = dotted_name(node.value)
+        return f"{parent}.{node.attr}" if parent else None
+    return None
+
+
+def literal_names(node: ast.AST) -> Optional[List[str]]:
+    """The strings of a literal list or tuple, e.g. the value of __all__"""
+    if isinstance(node, (ast.List, ast.Tuple)) and all(
+            isinstance(item, ast.Constant) and isinstance(item.value, str) for item in node.elts):
+        return [item.value for item in node.elts]
+    return None
+
+
+def resolve_relative(module: str, is_package: bool, level: int, target: Optional[str]) -> str:
+    """Absolute module of a relative import inside module"""
+    parts = module.split('.')
+    if not is_package:
+        parts = parts[:-1]
+    if level > 1:
+        parts = parts[:len(parts) - (level - 1)]
+    return '.'.join(parts + ([target] if target else []))
+
+
+def iter_module_statements(body: List[ast.stmt]) -> Iterator[ast.stmt]:
+    """Top-level statements, including those under if/try/with blocks (optional imports)"""
+    for node in body:
+        if isinstance(node, ast.If):
+            yield from iter_module_statements(node.body)
+            yield from iter_module_statements(node.orelse)
+        elif isinstance(node, ast.Try):
+            yield from iter_module_statements(node.body)
+            for handler in node.handlers:
+                yield from iter_module_statements(handler.body)
+            yield from iter_module_statements(node.orelse)
+            yield from iter_module_statements(node.finalbody)
+        elif isinstance(node, ast.With):
+            yield from iter_module_statements(node.body)
+        else:
+            yield node
+
+
+def index_class(node: ast.ClassDef) -> Dict[str, Any]:
+    """Bases, public method signatures and constructor parameters of one class definition"""
+    methods = {}
+    init = None
+    fields = []
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if item.name == '__init__':
+                init = signature(item, method=True)
+            elif not item.name.startswith('_'):
+                methods[item.name] = signature(item, method=True)
+        elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+            if 'ClassVar' not in ast.dump(item.annotation):
+                fields.append(item.target.id)
+    is_dataclass = any(decorator_name(decorator) == 'dataclass' for decorator in node.decorator_list)
+    return {
+        'bases': [name for name in map(dotted_name, node.bases) if name],
+        'methods': methods,
+        'init': init,
+        'fields': fields if is_dataclass else None,
+    }
+
+
+def index_module(text: str, module: str, is_package: bool) -> Dict[str, Any]:
+    """What one backend module defines and imports, as a JSON-serializable record"""
+    try:
+        tree = ast.parse(text)
+    except SyntaxError as e:
+        return {'error': str(e)}
+
+    record = {'all': None, 'names': [], 'imports': {}, 'star_imports': [], 'classes': {}, 'functions': {}}
+    names = set()
+    for node in iter_module_statements(tree.body):
+        if isinstance(node, ast.ClassDef):
+            record['classes'][node.name] = index_class(node)
+            names.add(node.name)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            record['functions'][node.name] = signature(node)
+            names.add(node.name)
+        elif isinstance(node, ast.ImportFrom):
+            source = resolve_relative(module, is_package, node.level, node.module) if node.level else node.module
+            for alias in node.names:
+                if alias.name == '*':
+                    record['star_imports'].append(source)
+                else:
+                    record['imports'][alias.asname or alias.name] = [source, alias.name]
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    record['imports'][alias.asname] = [alias.name, None]
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    if target.id == '__all__' and node.value is not None:
+                        record['all'] = literal_names(node.value)
+                    names.add(target.id)
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name) \
+                and node.target.id == '__all__' and record['all'] is not None:
+            record['all'] += literal_names(node.value) or []
+    record['names'] = sorted(name for name in names if not name.startswith('_'))
+    return record
+
+
+def find_package(backend_path: Path) -> Optional[Path]:
+    """The blazemetrics package directory of a backend checkout, if there is one"""
+    for parent in PACKAGE_PARENTS:
+        package = backend_path / parent / PACKAGE
+        if (package / '__init__.py').is_file() or (package / '__init__.pyi').is_file():
+            return package
+    return None
+
+
+def module_name(path: Path, package: Path) -> Tuple[str, bool]:
+    """Dotted module name of a file in the package and whether it is a package __init__"""
+    parts = list(path.relative_to(package.parent).with_suffix('').parts)
+    is_package = parts[-1] == '__init__'
+    if is_package:
+        parts.pop()
+    return '.'.join(parts), is_package
+
+
+def merge_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the records of a module's .py and .pyi files, the stub winning on conflicts"""
+    merged = {'all': None, 'names': [], 'imports': {}, 'star_imports': [], 'classes': {}, 'functions': {}}
+    for record in records:
+        if 'error' in record:
+            continue
+        if record['all'] is not None:
+            merged['all'] = sorted(set(merged['all'] or []) | set(record['all']))
+        merged['names'] = sorted(set(merged['names']) | set(record['names']))
+        merged['star_imports'] += record['star_imports']
+        for key in ('imports', 'classes', 'functions'):
+            merged[key].update(record[key])
+    return merged
+
+
+class ApiIndexBuilder:
+    """Resolves the merged per-module records into an ApiIndex"""
+
+    def __init__(self, records: Dict[str, Dict[str, Any]], packages: Set[str]):
+        self.records = records
+        self.packages = packages
+        self._exports: Dict[str, Set[str]] = {}
+
+    def exports(self, module: str, depth: int = 0) -> Set[str]:
+        """Names a module makes available to `from module import name`"""
+        if module in self._exports:
+            return self._exports[module]
+        record = self.records.get(module)
+        if record is None or depth > MAX_RESOLVE_DEPTH:
+            return set()
+        if record['all'] is not None:
+            names = set(record['all'])
+        else:
+            names = set(record['names'])
+            for local, (source, _) in record['imports'].items():
+                # Package __init__ modules re-export what they import; other modules only
+                # export what they take from inside the package, not typing or stdlib names
+                if not local.startswith('_') and (module in self.packages or source.split('.')[0] == PACKAGE):
+                    names.add(local)
+            for source in record['star_imports']:
+                names |= {name for name in self.exports(source, depth + 1) if not name.startswith('_')}
+        if module in self.packages:
+            # Submodules: from blazemetrics import llm_judge
+            names |= {child for parent, _, child in (other.rpartition('.') for other in self.records)
+                      if parent == module and not child.startswith('_')}
+        self._exports[module] = names
+        return names
+
+    def resolve_class(self, module: str, name: str, depth: int = 0) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(defining module, class record) of a name as seen from module, following imports"""
+        record = self.records.get(module)
+        if record is None or depth > MAX_RESOLVE_DEPTH:
+            return None
+        if name in record['classes']:
+            return module, record['classes'][name]
+        if name in record['imports']:
+            source, imported = record['imports'][name]
+            return self.resolve_class(source, imported, depth + 1) if imported else None
+        if '.' in name:
+            # A base given as module.Class
+            prefix, attr = name.rsplit('.', 1)
+            if prefix in record['imports'] and record['imports'][prefix][1] is None:
+                return self.resolve_class(record['imports'][prefix][0], attr, depth + 1)
+        for source in record['star_imports']:
+            found = self.resolve_class(source, name, depth + 1)
+            if found is not None:
+                return found
+        return None
+
+    def class_api(self, module: str, name: str) -> Optional[Dict[str, Any]]:
+        """Public methods, inherited ones included, and constructor parameters of a class"""
+        found = self.resolve_class(module, name)
+        if found is None:
+            return None
+        methods: Dict[str, Dict[str, Any]] = {}
+        constructor = None
+        # Walk the bases breadth first; the first __init__ (or dataclass) found defines the constructor
+        queue, seen = [found], set()
+        while queue and len(seen) <= MAX_RESOLVE_DEPTH:
+            defined_in, cls = queue.pop(0)
+            if id(cls) in seen:
+                continue
+            seen.add(id(cls))
+            for method, sig in cls['methods'].items():
+                methods.setdefault(method, sig)
+            if constructor is None:
+                if cls['fields'] is not None:
+                    constructor = {'params': cls['fields'], 'kwonly': [], 'varargs': False, 'varkw': False}
+                elif cls['init'] is not None:
+                    constructor = cls['init']
+            for base in cls['bases']:
+                resolved = self.resolve_class(defined_in, base)
+                if resolved is not None:
+                    queue.append(resolved)
+        return {'methods': methods, 'init': constructor}
+
+    def build(self, source: str) -> ApiIndex:
+        modules = {module: self.exports(module) for module in self.records
+                   if not any(part.startswith('_') for part in module.split('.'))}
+        classes = {}
+        for module, names in modules.items():
+            for name in names:
+                api = self.class_api(module, name)
+                if api is not None:
+                    classes[f"{module}.{name}"] = api
+
+        client = classes.get(f"{PACKAGE}.{CLIENT_CLASS}")
+        client_methods, config_params, accepts_any_config = CLIENT_METHODS, CONFIG_PARAMS, False
+        if client is not None:
+            client_methods = set(client['methods'])
+            if client['init'] is not None:
+                config_params = set(client['init']['params'] + client['init']['kwonly'])
+                accepts_any_config = client['init']['varkw']
+        return ApiIndex(modules, client_methods, config_params, classes, source=source,
+                        accepts_any_config=accepts_any_config)
+
+
+def build_api_index(backend_path: Path, cache_path: Optional[Path] = DEFAULT_API_CACHE) -> ApiIndex:
+    """Index the backend package's public API, or return the built-in one if it is not checked out
+
+    With a cache path, per-module records are reused from it while the
+    module is unchanged and the cache is rewritten when anything changed.
+    """
+    package = find_package(backend_path)
+    if package is None:
+        return BUILTIN_API
+
+    manifest = Manifest(cache_path, fingerprint=validator_fingerprint()) if cache_path else None
+    corpus = SourceCorpus(package.parent, source_dir=PACKAGE, suffixes=MODULE_SUFFIXES, manifest=manifest)
+    by_module: Dict[str, List[Dict[str, Any]]] = {}
+    packages = set()
+    sources = corpus.discover()
+    for source in sources:
+        module, is_package = module_name(source.path, package)
+        if is_package:
+            packages.add(module)
+        by_module.setdefault(module, []).append(source.artifact(
+            'api_module', lambda source: index_module(source.text, module, is_package), persist=True))
+    corpus.save()
+
+    records = {module: merge_records(parts) for module, parts in by_module.items()}
+    index = ApiIndexBuilder(records, packages).build(source=str(package))
+    index.files = len(sources)
+    index.reparsed = manifest.rebuilt if manifest is not None else len(sources)
+    return index
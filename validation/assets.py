@@ -0,0 +1,218 @@
+"""
+Index of public/ and header-only image auditing
+===============================================
+``build_asset_index`` walks ``public/`` once and maps every file to its URL
+path (``public/images/logo.png`` -> ``/images/logo.png``), so asset links are
+checked with a dict lookup instead of one ``exists()`` call each. Image
+formats and dimensions are read from the file headers only (PNG IHDR, JPEG
+SOF segment, GIF screen descriptor, WebP VP8/VP8L/VP8X, ICO directory, SVG
+root attributes) without decoding pixel data, on a process pool when there
+are enough images to be worth it.
+
+``audit_images`` cross-references every JSX ``<img src>`` in the sources with
+the index and reports missing assets, images much larger than their
+rendered size, missing ``width``/``height`` and missing lazy loading. Each
+finding carries an estimate of the bytes it would save.
+"""
+
+import os
+import re
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from validation.lexer import tokenize
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.ico', '.avif')
+# Below this many images the pool start-up costs more than it saves
+POOL_THRESHOLD = 16
+# Intrinsic pixels per rendered CSS pixel that still count as right-sized (2x displays)
+MAX_DENSITY = 2
+# Tailwind spacing scale: w-8 is 2rem = 32px
+TAILWIND_UNIT_PX = 4
+# Images in these parts of the layout are visible on first paint and must not be lazy
+ABOVE_THE_FOLD_HINTS = ('navigation', 'navbar', 'header', 'hero')
+
+# A {...} attribute value that is a single literal or name: {64}, {"lazy"}, {logo}
+EXPRESSION_VALUE_REGEX = re.compile(r'''\s*["'`]?([^}"'`]*)["'`]?\s*''')
+SIZE_CLASS_REGEX = re.compile(r'(?<![\w-])(?:(w|h)|size)-(\d+(?:\.5)?|\[(\d+)px\])(?![\w-])')
+SVG_SIZE_REGEX = re.compile(r'''\b(width|height)=["']([\d.]+)(?:px)?["']''')
+SVG_VIEWBOX_REGEX = re.compile(r'''\bviewBox=["'][\d.\-]+[ ,]+[\d.\-]+[ ,]+([\d.]+)[ ,]+([\d.]+)["']''')
+
+
+def _jpeg_size(f) -> Optional[tuple]:
+    """Walk JPEG segment headers up to the first start-of-frame marker"""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if code in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_header(path: Path) -> Dict[str, Any]:
+    """Format and pixel dimensions of an image from its header bytes"""
+    info: Dict[str, Any] = {'format': path.suffix.lstrip('.').lower(), 'width': None, 'height': None}
+    with open(path, 'rb') as f:
+        head = f.read(64)
+        size = None
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            info['format'] = 'png'
+            size = struct.unpack('>II', head[16:24])
+        elif head[:6] in (b'GIF87a', b'GIF89a'):
+            info['format'] = 'gif'
+            size = struct.unpack('<HH', head[6:10])
+        elif head.startswith(b'\xff\xd8'):
+            info['format'] = 'jpeg'
+            size = _jpeg_size(f)
+        elif head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            info['format'] = 'webp'
+            chunk = head[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', head[26:30])
+                size = (width & 0x3FFF, height & 0x3FFF)
+            elif chunk == b'VP8L':
+                bits = struct.unpack('<I', head[21:25])[0]
+                size = (1 + (bits & 0x3FFF), 1 + ((bits >> 14) & 0x3FFF))
+            elif chunk == b'VP8X':
+                size = (1 + int.from_bytes(head[24:27], 'little'), 1 + int.from_bytes(head[27:30], 'little'))
+        elif head[:4] == b'\x00\x00\x01\x00':
+            info['format'] = 'ico'
+            size = (head[6] or 256, head[7] or 256)
+        elif info['format'] == 'svg':
+            root = (head + f.read(4096 - len(head))).decode('utf-8', errors='replace')
+            attributes = dict(SVG_SIZE_REGEX.findall(root))
+            viewbox = SVG_VIEWBOX_REGEX.search(root)
+            if 'width' in attributes and 'height' in attributes:
+                size = (float(attributes['width']), float(attributes['height']))
+            elif viewbox:
+                size = (float(viewbox.group(1)), float(viewbox.group(2)))
+    if size:
+        info['width'], info['height'] = size
+    return info
+
+
+def _index_entry(path: str) -> Dict[str, Any]:
+    """Index record for one public file (runs in pool workers)"""
+    entry: Dict[str, Any] = {'bytes': os.path.getsize(path)}
+    if path.lower().endswith(IMAGE_SUFFIXES):
+        try:
+            entry.update(read_image_header(Path(path)))
+        except (OSError, struct.error):
+            entry['format'] = None
+    return entry
+
+
+@lru_cache(maxsize=None)
+def build_asset_index(public_dir: Path = Path("public"), jobs: int = 4) -> Dict[str, Dict[str, Any]]:
+    """URL path -> {'bytes', and for images 'format', 'width', 'height'}, built once per process"""
+    paths = []
+    for directory, dirnames, filenames in os.walk(public_dir):
+        dirnames.sort()
+        paths.extend(os.path.join(directory, filename) for filename in sorted(filenames))
+    urls = ['/' + Path(path).relative_to(public_dir).as_posix() for path in paths]
+
+    images = sum(1 for path in paths if path.lower().endswith(IMAGE_SUFFIXES))
+    if jobs > 1 and images >= POOL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            entries = list(executor.map(_index_entry, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    else:
+        entries = [_index_entry(path) for path in paths]
+    return dict(zip(urls, entries))
+
+
+def rendered_size(attributes: Dict[str, str]) -> Dict[str, Optional[float]]:
+    """CSS pixel size an <img> is laid out at, from width/height or Tailwind classes"""
+    size: Dict[str, Optional[float]] = {'width': None, 'height': None}
+    for dimension in ('width', 'height'):
+        value = attributes.get(dimension, '')
+        if re.fullmatch(r'\d+(?:\.\d+)?(?:px)?', value):
+            size[dimension] = float(value.rstrip('px'))
+    for axis, scale, pixels in SIZE_CLASS_REGEX.findall(attributes.get('className', '')):
+        px = float(pixels) if pixels else float(scale) * TAILWIND_UNIT_PX
+        for dimension in (['width'] if axis == 'w' else ['height'] if axis == 'h' else ['width', 'height']):
+            if size[dimension] is None:
+                size[dimension] = px
+    return size
+
+
+def scan_img_tags(text: str) -> List[Dict[str, Any]]:
+    """Attributes and offset of every JSX <img> element in a source file
+
+    Elements come from the lexer, so <img> markup in string or template
+    literals (code samples) and in comments is not audited.
+    """
+    tags = []
+    # Attributes are emitted before the tag they belong to, and all lie after its '<'
+    pending: List[Tuple[int, str, str]] = []
+    for kind, value, offset, name in tokenize(text):
+        if kind == 'attribute':
+            pending.append((offset, name, value))
+        elif kind == 'expression' and name is not None:
+            match = EXPRESSION_VALUE_REGEX.fullmatch(value)
+            if match is not None:
+                pending.append((offset, name, match.group(1)))
+        elif kind == 'tag':
+            own = sorted(entry for entry in pending if entry[0] > offset)
+            pending = [entry for entry in pending if entry[0] < offset]
+            if value == 'img':
+                tags.append({'attributes': {attribute: attribute_value.strip()
+                                            for _, attribute, attribute_value in own},
+                             'offset': offset})
+    return tags
+
+
+def audit_images(sources: Iterable[Any], index: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Findings {'kind', 'file', 'line', 'src', 'detail', 'bytes_saved'} for local <img> tags"""
+    findings = []
+    for source in sources:
+        tags = source.artifact('img_tags', lambda source: [
+            {'attributes': tag['attributes'], 'line': source.line_index.line_of(tag['offset'])}
+            for tag in scan_img_tags(source.text)
+        ], persist=True)
+        above_the_fold = any(hint in str(source.path) for hint in ABOVE_THE_FOLD_HINTS)
+
+        for tag in tags:
+            attributes = tag['attributes']
+            src = attributes.get('src', '')
+            if not src.startswith('/') or src.startswith('//'):
+                continue
+            finding = {'file': str(source.path), 'line': tag['line'], 'src': src}
+            asset = index.get(src.split('?')[0].split('#')[0])
+            if asset is None:
+                findings.append({**finding, 'kind': 'missing', 'detail': "not found in public/", 'bytes_saved': 0})
+                continue
+
+            rendered = rendered_size(attributes)
+            if asset.get('width') and rendered['width'] and rendered['height'] and asset['format'] != 'svg':
+                needed = (rendered['width'] * MAX_DENSITY) * (rendered['height'] * MAX_DENSITY)
+                ratio = needed / (asset['width'] * asset['height'])
+                if ratio < 1:
+                    # Encoded size scales roughly with pixel count
+                    findings.append({**finding, 'kind': 'oversized', 'bytes_saved': int(asset['bytes'] * (1 - ratio)),
+                                     'detail': f"{asset['width']:g}x{asset['height']:g} {asset['format']} "
+                                               f"rendered at {rendered['width']:g}x{rendered['height']:g}px"})
+
+            if 'width' not in attributes or 'height' not in attributes:
+                findings.append({**finding, 'kind': 'no_dimensions', 'bytes_saved': 0,
+                                 'detail': "missing width/height attributes (layout shift)"})
+
+            if attributes.get('loading') != 'lazy' and not above_the_fold:
+                findings.append({**finding, 'kind': 'not_lazy', 'bytes_saved': asset['bytes'],
+                                 'detail': 'missing loading="lazy"; bytes deferred from the initial load'})
+    return findings
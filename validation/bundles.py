@@ -0,0 +1,234 @@
+"""
+Bundle size budgets measured from the built dist/ output
+========================================================
+Reads the ``dist/`` directory written by ``npm run build`` and measures the
+raw, gzip and brotli size of every JS/CSS chunk, compressing the chunks on a
+thread pool (zlib and brotli release the GIL while they work).
+
+Chunks are mapped back to the routes of ``src/App.tsx``: every route loads
+the entry chunks referenced by ``dist/index.html`` plus, when the build
+emitted a Vite manifest (``build.manifest: true``), the chunk of its page
+component and everything that chunk imports statically. Without a manifest
+every route is charged for the entry chunks only.
+
+Budgets come from a JSON file (``bundle-budgets.json``)::
+
+    {
+      "metric": "gzip",          # raw | gzip | brotli
+      "total_kb": 1200,          # all JS/CSS in dist/
+      "route_kb": 800,           # default per-route budget
+      "routes": {"/benchmarks": 900}
+    }
+
+brotli is optional; without the ``brotli`` module brotli sizes are reported
+as ``None`` and a brotli budget is checked against gzip sizes instead. An
+unknown metric is returned as ``unknown_metric`` in the report; sizes are
+still measured, but no budget is checked.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_DIST_DIR = Path("dist")
+DEFAULT_BUDGETS_FILE = Path("bundle-budgets.json")
+ASSET_SUFFIXES = ('.js', '.css')
+METRICS = ('raw', 'gzip', 'brotli')
+
+ENTRY_TAG_REGEX = re.compile(
+    r'''<(?:script\b[^>]*\bsrc|link\b[^>]*\bhref)=["']([^"']+\.(?:js|css))["']''', re.IGNORECASE)
+
+
+def measure_asset(path: Path) -> Dict[str, Optional[int]]:
+    """Raw, gzip and brotli sizes of one file in bytes"""
+    data = path.read_bytes()
+    return {
+        'raw': len(data),
+        'gzip': len(gzip.compress(data, compresslevel=9, mtime=0)),
+        'brotli': len(brotli.compress(data, quality=11)) if brotli is not None else None,
+    }
+
+
+def find_assets(dist: Path) -> List[str]:
+    """Every JS/CSS file under dist, as sorted dist-relative posix paths"""
+    assets = []
+    for directory, dirnames, filenames in os.walk(dist):
+        dirnames.sort()
+        for filename in filenames:
+            if filename.endswith(ASSET_SUFFIXES):
+                assets.append((Path(directory) / filename).relative_to(dist).as_posix())
+    return sorted(assets)
+
+
+def measure_assets(dist: Path, assets: Iterable[str], jobs: int = 4) -> Dict[str, Dict[str, Optional[int]]]:
+    """Measure assets in parallel, keyed by their dist-relative path"""
+    assets = list(assets)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        sizes = executor.map(measure_asset, [dist / asset for asset in assets])
+        return dict(zip(assets, sizes))
+
+
+def load_vite_manifest(dist: Path) -> Optional[Dict[str, Any]]:
+    """The Vite build manifest, if the build was configured to write one"""
+    for candidate in (dist / '.vite' / 'manifest.json', dist / 'manifest.json'):
+        if candidate.is_file():
+            with open(candidate, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return None
+
+
+def html_entry_assets(dist: Path, base: str = '/') -> List[str]:
+    """JS/CSS files that index.html loads up front (entry script, modulepreload, stylesheets)"""
+    index_html = dist / 'index.html'
+    if not index_html.is_file():
+        return []
+    assets = []
+    for match in ENTRY_TAG_REGEX.finditer(index_html.read_text(encoding='utf-8')):
+        url = match.group(1)
+        if '://' in url or url.startswith('//'):
+            continue
+        if url.startswith(base):
+            url = url[len(base):]
+        assets.append(url.lstrip('/'))
+    return list(dict.fromkeys(assets))
+
+
+def chunk_closure(manifest: Dict[str, Any], key: str) -> List[str]:
+    """Files a manifest chunk loads: itself, its CSS and its static imports, transitively"""
+    files: List[str] = []
+    seen = set()
+    stack = [key]
+    while stack:
+        current = stack.pop()
+        if current in seen or current not in manifest:
+            continue
+        seen.add(current)
+        chunk = manifest[current]
+        files.append(chunk['file'])
+        files.extend(chunk.get('css', []))
+        stack.extend(reversed(chunk.get('imports', [])))
+    return list(dict.fromkeys(files))
+
+
+def map_routes_to_assets(routes: List[Dict[str, Any]], dist: Path,
+                         manifest: Optional[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Assets each route path needs for a first load"""
+    entry_assets = html_entry_assets(dist)
+    if manifest is not None:
+        for key, chunk in manifest.items():
+            if chunk.get('isEntry'):
+                entry_assets.extend(chunk_closure(manifest, key))
+    entry_assets = list(dict.fromkeys(entry_assets))
+
+    route_assets = {}
+    for route in routes:
+        if route['path'] in ('*', '/*'):
+            continue
+        assets = list(entry_assets)
+        if manifest is not None and route['file'] is not None:
+            assets.extend(chunk_closure(manifest, Path(route['file']).as_posix()))
+        route_assets[route['path']] = list(dict.fromkeys(assets))
+    return route_assets
+
+
+def load_budgets(path: Path) -> Dict[str, Any]:
+    """Budget config, or an empty dict when the file does not exist"""
+    if not path.is_file():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def sum_sizes(sizes: Dict[str, Dict[str, Optional[int]]], assets: Iterable[str]) -> Dict[str, Optional[int]]:
+    """Per-metric totals over assets; None if any asset lacks that metric"""
+    totals: Dict[str, Optional[int]] = {}
+    for metric in METRICS:
+        values = [sizes[asset][metric] for asset in assets if asset in sizes]
+        totals[metric] = None if any(value is None for value in values) else sum(values)
+    return totals
+
+
+class BundleBudgetChecker:
+    """Measures dist/ and compares total and per-route sizes with the budget config"""
+
+    def __init__(self, dist: Path = DEFAULT_DIST_DIR, budgets: Dict[str, Any] = None, jobs: int = 4):
+        self.dist = dist
+        self.budgets = budgets or {}
+        self.jobs = jobs
+
+    def budget_metric(self) -> Optional[str]:
+        """Metric the budgets are checked against; None when the config names an unknown one"""
+        metric = self.budgets.get('metric', 'gzip')
+        if metric not in METRICS:
+            return None
+        if metric == 'brotli' and brotli is None:
+            return 'gzip'
+        return metric
+
+    def check(self, routes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Measure the build and return sizes plus a list of budget violations"""
+        metric = self.budget_metric()
+        unknown_metric = self.budgets.get('metric') if metric is None else None
+        budgets = self.budgets if metric is not None else {}
+        metric = metric or 'gzip'
+        assets = find_assets(self.dist)
+        sizes = measure_assets(self.dist, assets, self.jobs)
+        manifest = load_vite_manifest(self.dist)
+        route_assets = map_routes_to_assets(routes, self.dist, manifest)
+
+        report = {
+            'dist': str(self.dist),
+            'metric': metric,
+            'unknown_metric': unknown_metric,
+            'route_mapping': 'vite-manifest' if manifest is not None else 'index.html',
+            'assets': sizes,
+            'total': sum_sizes(sizes, assets),
+            'routes': {},
+            'violations': [],
+        }
+
+        total_kb = budgets.get('total_kb')
+        if total_kb is not None and report['total'][metric] > total_kb * 1024:
+            report['violations'].append(
+                f"Total {metric} size {report['total'][metric] / 1024:.1f} kB exceeds budget of {total_kb} kB")
+
+        route_budgets = budgets.get('routes', {})
+        for path, needed in route_assets.items():
+            missing = [asset for asset in needed if asset not in sizes]
+            totals = sum_sizes(sizes, needed)
+            budget_kb = route_budgets.get(path, budgets.get('route_kb'))
+            report['routes'][path] = {'assets': needed, 'missing': missing, 'budget_kb': budget_kb, **totals}
+
+            for asset in missing:
+                report['violations'].append(f"Route {path} references {asset}, which is not in {self.dist}")
+            if budget_kb is not None and totals[metric] > budget_kb * 1024:
+                report['violations'].append(
+                    f"Route {path} loads {totals[metric] / 1024:.1f} kB ({metric}), "
+                    f"exceeding its budget of {budget_kb} kB")
+
+        return report
+
+
+def add_bundle_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options for measuring bundle budgets from dist/"""
+    parser.add_argument("--dist", type=Path, default=DEFAULT_DIST_DIR,
+                        help=f"build output to measure (default: {DEFAULT_DIST_DIR})")
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS_FILE,
+                        help=f"bundle budget config (default: {DEFAULT_BUDGETS_FILE})")
+    parser.add_argument("--bundle-jobs", type=int, default=4,
+                        help="threads for compressing chunks (default: 4)")
+
+
+def build_bundle_checker(args: argparse.Namespace) -> BundleBudgetChecker:
+    """Bundle checker configured from add_bundle_arguments options"""
+    return BundleBudgetChecker(dist=args.dist, budgets=load_budgets(args.budgets), jobs=args.bundle_jobs)
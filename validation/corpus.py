@@ -0,0 +1,173 @@
+"""
+Shared read-once source corpus
+==============================
+Discovers the frontend sources once and loads each file at most once, no
+matter how many validators or checks look at it. Files at or above
+``MMAP_THRESHOLD`` bytes are decoded straight from a memory map instead of
+going through an intermediate read buffer.
+
+Derived artifacts (line index, lexer scan, extracted links, code blocks, ...) are
+memoized per file with ``SourceFile.artifact`` so a second consumer gets the
+cached result instead of recomputing it. Artifacts built with
+``persist=True`` are also stored in the corpus manifest, if one is attached,
+and reused on later runs while the file is unchanged.
+"""
+
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from validation.manifest import MISSING, Manifest
+from validation.textscan import LineIndex, scan_source
+
+MMAP_THRESHOLD = 1024 * 1024
+SOURCE_SUFFIXES = ('.tsx', '.ts', '.css')
+
+
+class SourceFile:
+    """One file of the corpus with its lazily loaded text and cached artifacts"""
+
+    def __init__(self, corpus: 'SourceCorpus', path: Path):
+        self.corpus = corpus
+        self.path = path
+        self._text: Optional[str] = None
+        self._artifacts: Dict[str, Any] = {}
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    @property
+    def text(self) -> str:
+        """File contents decoded as UTF-8, read on first access only"""
+        if self._text is None:
+            self._text = self.corpus.read(self.path)
+        return self._text
+
+    @property
+    def line_index(self) -> LineIndex:
+        return self.artifact('line_index', lambda source: LineIndex(source.text))
+
+    @property
+    def scan_items(self) -> List[Tuple[str, str, int]]:
+        """Links, anchor targets and code blocks from one lexer pass, shared by all validators"""
+        return self.artifact('scan_items', lambda source: scan_source(source.text))
+
+    def artifact(self, name: str, builder: Callable[['SourceFile'], Any], persist: bool = False) -> Any:
+        """Return a derived artifact, building it from this file on first use
+
+        Persisted artifacts must be JSON-serializable; they are looked up in
+        and recorded to the corpus manifest.
+        """
+        value = self.cached_artifact(name, persist)
+        if value is MISSING:
+            value = builder(self)
+            self.store_artifact(name, value, persist)
+        return value
+
+    def cached_artifact(self, name: str, persist: bool = False) -> Any:
+        """An already built artifact from memory or the manifest, or MISSING"""
+        if name in self._artifacts:
+            return self._artifacts[name]
+
+        manifest = self.corpus.manifest if persist else None
+        value = manifest.lookup(self, name) if manifest is not None else MISSING
+        if value is not MISSING:
+            self._artifacts[name] = value
+        return value
+
+    def store_artifact(self, name: str, value: Any, persist: bool = False) -> None:
+        """Record an artifact built elsewhere, e.g. by a worker process"""
+        self._artifacts[name] = value
+        if persist and self.corpus.manifest is not None:
+            self.corpus.manifest.record(self, name, value)
+
+    def invalidate(self) -> None:
+        """Drop the loaded text and every derived artifact"""
+        self._text = None
+        self._artifacts.clear()
+
+
+class SourceCorpus:
+    """All source files under src/ plus any other project file asked for by path"""
+
+    def __init__(self, root: Path = Path("."), source_dir: str = "src",
+                 suffixes: Iterable[str] = SOURCE_SUFFIXES, manifest: Optional[Manifest] = None):
+        self.root = root
+        self.source_dir = source_dir
+        self.suffixes = tuple(suffixes)
+        self.manifest = manifest
+        self.files_read = 0
+        self.bytes_read = 0
+        self._files: Dict[Path, SourceFile] = {}
+        self._discovered: Optional[List[SourceFile]] = None
+
+    def discover(self) -> List[SourceFile]:
+        """Walk the source directory once and register every matching file"""
+        if self._discovered is None:
+            found = []
+            for dirpath, dirnames, filenames in os.walk(self.root / self.source_dir):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(self.suffixes):
+                        found.append(self.get(Path(dirpath) / filename))
+            self._discovered = found
+        return self._discovered
+
+    def files(self, suffixes: Iterable[str] = ('.tsx',)) -> List[SourceFile]:
+        """Discovered source files with one of the given suffixes, in path order"""
+        suffixes = tuple(suffixes)
+        return [source for source in self.discover() if source.suffix in suffixes]
+
+    def get(self, path: Path) -> SourceFile:
+        """The SourceFile for a path, which need not live under the source directory"""
+        path = Path(path)
+        source = self._files.get(path)
+        if source is None:
+            source = self._files[path] = SourceFile(self, path)
+        return source
+
+    def refresh(self, path: Path) -> Optional[SourceFile]:
+        """Forget everything derived from a file that changed on disk
+
+        New source files are added to the discovered files and deleted ones
+        removed. Returns the file's SourceFile, or None if it no longer exists.
+        """
+        path = Path(path)
+        source = self._files.get(path)
+        if source is not None:
+            source.invalidate()
+        exists = path.is_file()
+        if self._discovered is not None and path.name.endswith(self.suffixes) \
+                and (self.root / self.source_dir) in path.parents:
+            listed = source is not None and source in self._discovered
+            if exists and not listed:
+                self._discovered.append(self.get(path))
+            elif not exists and listed:
+                self._discovered.remove(source)
+        if not exists:
+            self._files.pop(path, None)
+            return None
+        return self.get(path)
+
+    def save(self) -> None:
+        """Persist the manifest, if any"""
+        if self.manifest is not None:
+            self.manifest.save()
+
+    def read(self, path: Path) -> str:
+        """Read and decode a file, using mmap for large files"""
+        with open(path, 'rb') as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size >= MMAP_THRESHOLD:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    text = str(mapped, 'utf-8')
+            else:
+                text = handle.read().decode('utf-8')
+        self.files_read += 1
+        self.bytes_read += size
+        return text
@@ -0,0 +1,150 @@
+"""
+Unreachable modules and unused dependencies
+===========================================
+Walks the import graph from ``src/main.tsx``, following static and dynamic
+imports, and lists the modules under ``src/`` that no route can ever load
+together with their source bytes.
+
+``dependencies`` entries of package.json are then split by who imports
+them: packages imported only by unreachable modules, and packages nobody
+imports at all. Packages referenced by the build configs
+(``tailwind.config.js`` plugins, ``postcss.config.js`` keys, ...) count as
+used. For each removable dependency the lockfile tells how many installed
+packages would go with it, and when ``node_modules`` exists the on-disk
+size of those packages is added up.
+
+package.json, the lockfile and the config files are read through the
+corpus like the sources, and the config references are cached in its
+manifest.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from validation.imports import ENTRY_FILE, ModuleGraph
+from validation.routes import MODULE_SUFFIXES
+
+CONFIG_FILES = ('vite.config.ts', 'tailwind.config.js', 'tailwind.config.ts', 'postcss.config.js', 'index.html')
+
+
+def package_references(text: str, packages: Iterable[str]) -> List[str]:
+    """Packages mentioned by name in one config file, in the given order"""
+    referenced = []
+    for package in packages:
+        # require("pkg"), import ... from "pkg/sub", or a postcss plugin key `pkg: {}`
+        pattern = re.compile(r'''["']''' + re.escape(package) + r'''(?:/[^"']*)?["']|^\s*''' +
+                             re.escape(package) + r'''\s*:''', re.MULTILINE)
+        if pattern.search(text):
+            referenced.append(package)
+    return referenced
+
+
+def config_references(corpus, root: Path, packages: Iterable[str],
+                      config_files: Iterable[str] = CONFIG_FILES) -> Set[str]:
+    """Packages mentioned by name in the build config files
+
+    The files are read through the corpus and their references are a
+    persisted artifact, keyed by the package list they were searched for.
+    """
+    packages = sorted(packages)
+    digest = hashlib.blake2b(json.dumps(packages).encode('utf-8'), digest_size=8).hexdigest()
+    referenced = set()
+    for name in config_files:
+        path = root / name
+        if path.is_file():
+            referenced.update(corpus.get(path).artifact(
+                f"config_references-{digest}", lambda source: package_references(source.text, packages),
+                persist=True))
+    return referenced
+
+
+def lockfile_closure(lock_packages: Dict[str, Any], names: Iterable[str]) -> Set[str]:
+    """Lockfile entries (node_modules/... paths) installed because of the given top-level packages"""
+    seen: Set[str] = set()
+    stack = [f"node_modules/{name}" for name in names]
+    while stack:
+        path = stack.pop()
+        if path in seen or path not in lock_packages:
+            continue
+        seen.add(path)
+        entry = lock_packages[path]
+        for dependency in {**entry.get('dependencies', {}), **entry.get('optionalDependencies', {})}:
+            # Node resolution: the nearest node_modules up the tree wins
+            base = path
+            while True:
+                candidate = f"{base}/node_modules/{dependency}"
+                if candidate in lock_packages or '/node_modules/' not in base:
+                    break
+                base = base.rsplit('/node_modules/', 1)[0]
+            stack.append(candidate if candidate in lock_packages else f"node_modules/{dependency}")
+    return seen
+
+
+def installed_size(root: Path, lock_paths: Iterable[str]) -> Optional[int]:
+    """Bytes on disk of the given lockfile entries, or None without node_modules"""
+    if not (root / 'node_modules').is_dir():
+        return None
+    total = 0
+    for lock_path in lock_paths:
+        for directory, dirnames, filenames in os.walk(root / lock_path):
+            # Nested node_modules are separate lockfile entries
+            dirnames[:] = [name for name in dirnames if name != 'node_modules']
+            total += sum(os.path.getsize(os.path.join(directory, name)) for name in filenames)
+    return total
+
+
+def find_dead_code(corpus, root: Path = Path("."), entry_file: Path = ENTRY_FILE) -> Dict[str, Any]:
+    """Unreachable modules and dependencies that only they (or nobody) import"""
+    graph = ModuleGraph(corpus, root)
+    entry = graph.add(root / entry_file)
+    for source in corpus.files(MODULE_SUFFIXES):
+        if not source.path.name.endswith('.d.ts'):
+            graph.add(source.path)
+
+    reachable = graph.closure(entry, include_dynamic=True)
+    dead = sorted(set(graph.sizes) - reachable)
+    dead_bytes, dead_packages = graph.weight(dead)
+    _, live_packages = graph.weight(reachable)
+
+    package_json = json.loads(corpus.get(root / 'package.json').text)
+    dependencies = sorted(package_json.get('dependencies', {}))
+    from_config = config_references(corpus, root, dependencies)
+    used = set(live_packages) | from_config
+
+    only_dead = [name for name in dependencies if name in dead_packages and name not in used]
+    never_imported = [name for name in dependencies if name not in dead_packages and name not in used]
+    removable = only_dead + never_imported
+
+    lock_packages: Dict[str, Any] = {}
+    lock_path = root / 'package-lock.json'
+    if lock_path.is_file():
+        lock_packages = json.loads(corpus.get(lock_path).text).get('packages', {})
+    kept = [name for name in dependencies if name not in removable]
+    kept += list(package_json.get('devDependencies', {}))
+    kept_closure = lockfile_closure(lock_packages, kept)
+
+    unused_dependencies = []
+    for name in removable:
+        exclusive = lockfile_closure(lock_packages, [name]) - kept_closure
+        unused_dependencies.append({
+            'package': name,
+            'imported_by': sorted(module for module in dead if name in graph.packages.get(module, ())),
+            'install_packages': len(exclusive),
+            'install_bytes': installed_size(root, exclusive),
+        })
+
+    removed_install = lockfile_closure(lock_packages, removable) - kept_closure
+    return {
+        'entry': entry,
+        'modules': len(graph.sizes),
+        'reachable_modules': len(reachable),
+        'unreachable': [{'module': module, 'bytes': graph.sizes[module]} for module in dead],
+        'unreachable_bytes': dead_bytes,
+        'unused_dependencies': unused_dependencies,
+        'install_packages_removed': len(removed_install),
+        'install_bytes_removed': installed_size(root, removed_install),
+    }
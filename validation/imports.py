@@ -0,0 +1,252 @@
+"""
+Static import graph of the frontend sources
+===========================================
+Builds the module graph of ``src/`` from ``import``/``export ... from``
+statements and ``import()`` calls found by the ``validation.lexer`` pass, resolving relative specifiers and the
+path aliases declared in ``vite.config.ts`` (``"@": path.resolve(__dirname,
+"./src")``). Bare specifiers become package nodes.
+
+The imports of each file are a persisted corpus artifact, so a rerun only
+reparses files whose contents changed; resolving specifiers against the
+file system is cheap and is redone every run.
+
+Static edges are what the bundler puts in the same chunk; a dynamic
+``import()`` starts a new chunk. ``ModuleGraph.split_savings`` answers how
+many source bytes (and which packages) would leave the initial load if one
+module were only reachable through ``import()``.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from validation.lexer import tokenize
+from validation.routes import MODULE_SUFFIXES, resolve_module
+
+ENTRY_FILE = Path("src") / "main.tsx"
+VITE_CONFIG_FILE = Path("vite.config.ts")
+
+# Packages that are large enough to deserve their own chunk when only some routes use them
+HEAVY_PACKAGES = (
+    'framer-motion', 'recharts', 'react-syntax-highlighter', 'date-fns', 'react-day-picker',
+    'cmdk', 'embla-carousel-react', 'vaul', 'react-resizable-panels',
+)
+
+# What precedes the specifier string of an import, up to its opening quote
+STATIC_IMPORT_HEAD_REGEX = re.compile(r'''^[ \t]*(?:import|export)\b(\s+type\b)?[^'"`;]*?\bfrom\s*\Z''', re.MULTILINE)
+SIDE_EFFECT_IMPORT_HEAD_REGEX = re.compile(r'''^[ \t]*import\s*\Z''', re.MULTILINE)
+DYNAMIC_IMPORT_HEAD_REGEX = re.compile(r'''\bimport\(\s*\Z''')
+DYNAMIC_IMPORT_TAIL_REGEX = re.compile(r'''\s*\)''')
+ALIAS_REGEX = re.compile(
+    r'''["']?([@~\w$/-]+)["']?\s*:\s*path\.resolve\(\s*__dirname\s*,\s*["']([^"']+)["']\s*\)''')
+
+
+def parse_aliases(config_text: str, root: Path = Path(".")) -> Dict[str, Path]:
+    """Path aliases from a vite config's resolve.alias block"""
+    return {alias: Path(*(root / target).parts) for alias, target in ALIAS_REGEX.findall(config_text)}
+
+
+def scan_imports(text: str) -> List[Dict[str, str]]:
+    """Import specifiers of a module as {'specifier', 'kind'}, kind being static or dynamic
+
+    Specifiers are the string literals the lexer finds in code, so import
+    statements quoted in template literals, strings, comments or JSX text
+    (code samples on documentation pages) are not part of the graph.
+    Type-only imports are left out since they are erased at build time.
+    """
+    imports = []
+    # End of the last literal or JSX text, so a head is never matched across one
+    boundary = 0
+    for kind, value, offset, _ in tokenize(text):
+        if kind == 'string':
+            end = offset + len(value) + 2
+            static = STATIC_IMPORT_HEAD_REGEX.search(text, boundary, offset)
+            if static is not None:
+                if not static.group(1):
+                    imports.append({'specifier': value, 'kind': 'static'})
+            elif SIDE_EFFECT_IMPORT_HEAD_REGEX.search(text, boundary, offset):
+                imports.append({'specifier': value, 'kind': 'static'})
+            elif (DYNAMIC_IMPORT_HEAD_REGEX.search(text, boundary, offset)
+                  and DYNAMIC_IMPORT_TAIL_REGEX.match(text, end)):
+                imports.append({'specifier': value, 'kind': 'dynamic'})
+        elif kind in ('template', 'dynamic_template'):
+            end = offset + len(value) + 2
+        elif kind == 'text':
+            end = offset + len(value)
+        else:
+            continue
+        boundary = max(boundary, end)
+    return imports
+
+
+def package_name(specifier: str) -> str:
+    """npm package of a bare specifier ('@radix-ui/react-slot/x' -> '@radix-ui/react-slot')"""
+    parts = specifier.split('/')
+    return '/'.join(parts[:2]) if specifier.startswith('@') else parts[0]
+
+
+class ModuleGraph:
+    """Local modules with their source bytes, static/dynamic edges and imported packages"""
+
+    def __init__(self, corpus, root: Path = Path("."), aliases: Optional[Dict[str, Path]] = None):
+        self.corpus = corpus
+        self.root = root
+        self.src_root = root / 'src'
+        if aliases is None:
+            config = root / VITE_CONFIG_FILE
+            aliases = parse_aliases(corpus.get(config).text, root) if config.is_file() else {}
+        self.aliases = aliases or {'@': self.src_root}
+        self.sizes: Dict[str, int] = {}
+        self.static: Dict[str, List[str]] = {}
+        self.dynamic: Dict[str, List[str]] = {}
+        self.packages: Dict[str, List[str]] = {}
+        self.unresolved: Dict[str, List[str]] = {}
+
+    def module_info(self, path: Path) -> Dict[str, Any]:
+        """Source bytes and import specifiers of one file, cached by content hash"""
+        return self.corpus.get(path).artifact(
+            'imports',
+            lambda source: {'bytes': len(source.text.encode('utf-8')), 'imports': scan_imports(source.text)},
+            persist=True
+        )
+
+    def add(self, path: Path) -> str:
+        """Add a module and everything it imports; returns its node key"""
+        key = str(path)
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            node = str(current)
+            if node in self.sizes:
+                continue
+            info = self.module_info(current)
+            self.sizes[node] = info['bytes']
+            self.static[node], self.dynamic[node] = [], []
+            self.packages[node], self.unresolved[node] = [], []
+
+            for entry in info['imports']:
+                specifier = entry['specifier']
+                if not specifier.startswith('.') and not any(
+                        specifier.startswith(alias + '/') for alias in self.aliases):
+                    self.packages[node].append(package_name(specifier))
+                    continue
+                suffix = Path(specifier).suffix
+                if suffix and suffix not in MODULE_SUFFIXES:
+                    # Stylesheets and other assets are not part of the JS module graph
+                    continue
+                target = resolve_module(specifier, current, self.src_root, self.aliases)
+                if target is None:
+                    self.unresolved[node].append(specifier)
+                    continue
+                edges = self.static if entry['kind'] == 'static' else self.dynamic
+                edges[node].append(str(target))
+                pending.append(target)
+        return key
+
+    def remove(self, key: str) -> None:
+        """Forget one module's size and edges, so the next add() reads it again"""
+        for table in (self.sizes, self.static, self.dynamic, self.packages, self.unresolved):
+            table.pop(key, None)
+
+    def closure(self, start: str, excluded: Iterable[str] = (), include_dynamic: bool = False) -> Set[str]:
+        """Modules loaded together with start through static imports, not entering excluded
+
+        With include_dynamic, import() edges are followed as well, giving
+        everything start can ever load.
+        """
+        blocked = set(excluded)
+        seen: Set[str] = set()
+        stack = [start] if start not in blocked else []
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(target for target in self.static.get(node, ()) if target not in blocked)
+            if include_dynamic:
+                stack.extend(target for target in self.dynamic.get(node, ()) if target not in blocked)
+        return seen
+
+    def weight(self, modules: Iterable[str]) -> Tuple[int, List[str]]:
+        """Total source bytes and sorted packages of a set of modules"""
+        modules = list(modules)
+        packages = sorted({package for module in modules for package in self.packages.get(module, ())})
+        return sum(self.sizes.get(module, 0) for module in modules), packages
+
+    def split_savings(self, entry: str, module: str) -> Dict[str, Any]:
+        """What leaves the initial load if module were loaded through import() instead"""
+        eager = self.closure(entry)
+        remaining = self.closure(entry, excluded=[module])
+        removed = eager - remaining
+        removed_bytes, _ = self.weight(removed)
+        _, eager_packages = self.weight(eager)
+        _, remaining_packages = self.weight(remaining)
+        return {
+            'module': module,
+            'modules': len(removed),
+            'bytes': removed_bytes,
+            'packages': sorted(set(eager_packages) - set(remaining_packages)),
+        }
+
+
+def analyze_routes(corpus, routes: List[Dict[str, Any]], root: Path = Path("."),
+                   entry_file: Path = ENTRY_FILE, heavy_packages: Iterable[str] = HEAVY_PACKAGES,
+                   top: int = 5) -> Dict[str, Any]:
+    """Per-route transitive modules and bytes, plus the heaviest eagerly loaded subgraphs"""
+    graph = ModuleGraph(corpus, root)
+    entry = graph.add(root / entry_file)
+    eager = graph.closure(entry)
+    eager_bytes, eager_packages = graph.weight(eager)
+
+    route_report = {}
+    candidates = set()
+    # Who statically imports each eager module, i.e. where its import would become import()
+    static_importers: Dict[str, List[str]] = {}
+    for module in sorted(eager):
+        for target in graph.static.get(module, ()):
+            static_importers.setdefault(target, []).append(module)
+
+    for route in routes:
+        if route['file'] is None or route['path'] in ('*', '/*'):
+            continue
+        page = graph.add(Path(route['file']))
+        modules = graph.closure(page)
+        size, packages = graph.weight(modules)
+        route_report[route['path']] = {
+            'component': route['component'],
+            'file': page,
+            'eager': page in eager,
+            'imported_by': sorted(set(static_importers.get(page, ()))) if page in eager else [],
+            'modules': len(modules),
+            'bytes': size,
+            'packages': packages,
+        }
+        if page in eager:
+            candidates.add(page)
+
+    # Eager modules that pull in a heavy package are split candidates too (chart.tsx, ...)
+    heavy = set(heavy_packages)
+    candidates.update(module for module in eager
+                      if module != entry and heavy.intersection(graph.packages.get(module, ())))
+
+    subgraphs = [graph.split_savings(entry, module) for module in sorted(candidates)]
+    subgraphs.sort(key=lambda item: (-item['bytes'], item['module']))
+    # Splits that drop a heavy package from the initial load are always reported
+    flagged = [item for item in subgraphs if heavy.intersection(item['packages'])]
+    flagged += [item for item in subgraphs if item not in flagged][:max(0, top - len(flagged))]
+
+    eager_heavy = {package: sorted(module for module in eager if package in graph.packages.get(module, ()))
+                   for package in eager_packages if package in heavy}
+
+    return {
+        'entry': entry,
+        'modules': len(graph.sizes),
+        'eager_modules': len(eager),
+        'eager_bytes': eager_bytes,
+        'eager_packages': eager_packages,
+        'eager_heavy_packages': eager_heavy,
+        'lazy_routes': sorted(path for path, data in route_report.items() if not data['eager']),
+        'routes': route_report,
+        'heavy_subgraphs': flagged,
+        'unresolved': {module: specifiers for module, specifiers in graph.unresolved.items() if specifiers},
+    }
@@ -0,0 +1,210 @@
+"""
+Phase timing and profiling instrumentation
+==========================================
+``Instrumentation`` records, for every named phase of a run, how often it
+ran, its wall-clock and CPU time, how many files and bytes the corpus read
+while it was running and the peak RSS of the process when it ended. Phases
+nest and are timed inclusively, so a scan phase also contains the per-file
+extraction phases it calls. Phases that ran more than once also report
+latency percentiles of their calls. Durations measured elsewhere, such as
+HTTP requests on worker threads, are added with ``add_samples``.
+
+Validator methods are turned into phases with the ``timed`` decorator,
+which uses the ``instrumentation`` attribute of the validator and names the
+phase after the method's qualified name (``LinkValidator.extract_links_from_file``).
+
+``instrumented_run`` wraps a whole script run. With ``--profile`` it runs
+cProfile and writes a pstats dump and a JSON timing summary to the profile
+directory; ``--timings PATH`` writes only the JSON summary, without the
+profiler's overhead. Either option also prints the phase table at the end;
+plain runs print nothing extra.
+"""
+
+import argparse
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_PROFILE_DIR = Path(".validation-cache") / "profile"
+# Phases shorter than this are left out of the printed table, not the JSON summary
+PRINT_THRESHOLD_S = 0.001
+PERCENTILES = (50, 90, 99)
+
+
+def cpu_time() -> float:
+    """User and system CPU time of this process and its reaped children, e.g. pool workers"""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def percentile(sorted_values: Any, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty sequence"""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def latency_summary(durations: Iterable[float]) -> Dict[str, float]:
+    """p50/p90/p99 and max of durations in seconds, as milliseconds"""
+    ordered = sorted(durations)
+    summary = {f"p{pct}_ms": round(percentile(ordered, pct) * 1000, 3) for pct in PERCENTILES}
+    summary['max_ms'] = round(ordered[-1] * 1000, 3)
+    return summary
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class Instrumentation:
+    """Per-phase wall/CPU time, corpus reads and peak RSS of one run"""
+
+    def __init__(self, corpus: Any = None):
+        self.corpus = corpus
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.durations: Dict[str, array] = {}
+        self.started = time.perf_counter()
+        self.started_cpu = cpu_time()
+
+    def _reads(self):
+        if self.corpus is None:
+            return 0, 0
+        return self.corpus.files_read, self.corpus.bytes_read
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and add it to the named phase"""
+        files, bytes_read = self._reads()
+        wall, cpu = time.perf_counter(), cpu_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, cpu_time() - cpu
+            files_after, bytes_after = self._reads()
+            stats = self._stats(name)
+            stats['calls'] += 1
+            stats['wall_s'] += wall
+            stats['cpu_s'] += cpu
+            stats['files_read'] += files_after - files
+            stats['bytes_read'] += bytes_after - bytes_read
+            stats['peak_rss_mb'] = peak_rss_mb()
+            self.durations[name].append(wall)
+
+    def _stats(self, name: str) -> Dict[str, Any]:
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'files_read': 0,
+                                         'bytes_read': 0, 'peak_rss_mb': None}
+            self.durations[name] = array('d')
+        return stats
+
+    def add_samples(self, name: str, durations: Iterable[float]) -> None:
+        """Add durations measured outside phase(), e.g. on other threads, as calls of a phase
+
+        Their wall time is summed like any other call; CPU time and reads
+        are not attributed to them.
+        """
+        stats = self._stats(name)
+        for duration in durations:
+            stats['calls'] += 1
+            stats['wall_s'] += duration
+            self.durations[name].append(duration)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals of the run so far plus every phase, JSON-serializable"""
+        files, bytes_read = self._reads()
+        return {
+            'wall_s': round(time.perf_counter() - self.started, 4),
+            'cpu_s': round(cpu_time() - self.started_cpu, 4),
+            'files_read': files,
+            'bytes_read': bytes_read,
+            'peak_rss_mb': peak_rss_mb(),
+            'phases': {name: self._phase_summary(name, stats) for name, stats in self.phases.items()},
+        }
+
+    def _phase_summary(self, name: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        summary = {**stats, 'wall_s': round(stats['wall_s'], 4), 'cpu_s': round(stats['cpu_s'], 4)}
+        if stats['calls'] > 1:
+            summary.update(latency_summary(self.durations[name]))
+        return summary
+
+    def print_summary(self) -> None:
+        """Print the run totals and the phases by descending wall time"""
+        summary = self.summary()
+        rss = summary['peak_rss_mb']
+        print(f"\n⏱️  Run: {summary['wall_s']:.2f}s wall, {summary['cpu_s']:.2f}s CPU, "
+              f"{summary['files_read']} files / {summary['bytes_read']:,} bytes read"
+              + (f", peak RSS {rss:.1f} MB" if rss is not None else ""))
+        phases = sorted(summary['phases'].items(), key=lambda item: item[1]['wall_s'], reverse=True)
+        for name, stats in phases:
+            if stats['wall_s'] >= PRINT_THRESHOLD_S:
+                latency = f"  (p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms)" if 'p50_ms' in stats else ""
+                print(f"   {stats['wall_s']:>8.3f}s wall {stats['cpu_s']:>8.3f}s CPU {stats['calls']:>6}x  "
+                      f"{name}{latency}")
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def timed(method: Callable) -> Callable:
+    """Record every call of a validator method as a phase of its instrumentation"""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.instrumentation.phase(name):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the profiling options on a parser"""
+    parser.add_argument("--profile", action="store_true",
+                        help="run under cProfile, write a pstats dump and a JSON timing summary "
+                             "and print the phase table")
+    parser.add_argument("--profile-dir", type=Path, default=DEFAULT_PROFILE_DIR,
+                        help=f"where --profile writes its files (default: {DEFAULT_PROFILE_DIR})")
+    parser.add_argument("--timings", type=Path, metavar="PATH",
+                        help="write the JSON timing summary to PATH and print the phase table")
+
+
+@contextmanager
+def instrumented_run(args: argparse.Namespace, name: str, instrumentation: Instrumentation) -> Iterator[None]:
+    """Run the enclosed block as script name, profiling on --profile and timing on --profile or --timings"""
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if args.profile or args.timings:
+            instrumentation.print_summary()
+        if profiler is not None:
+            args.profile_dir.mkdir(parents=True, exist_ok=True)
+            stats_path = args.profile_dir / f"{name}.pstats"
+            timings_path = args.profile_dir / f"{name}-timings.json"
+            profiler.dump_stats(stats_path)
+            instrumentation.write(timings_path)
+            print(f"📈 Profile written to {stats_path} and {timings_path}")
+        if args.timings:
+            instrumentation.write(args.timings)
@@ -0,0 +1,235 @@
+"""
+Linear-time TSX/JSX lexer
+=========================
+Whole-file regexes cannot tell a link in a JSX attribute from the same text
+inside a comment, a Python sample held in a template literal or a JSX
+expression. ``tokenize`` walks a file once, keeping a stack of the contexts
+it is in (code, template literal, JSX tag, JSX children), and yields only
+the tokens the validators care about, each with its exact offset:
+
+``('attribute', value, offset, name)``
+    A JSX attribute with a quoted string value: ``href="/docs"``.
+``('string', body, offset, owner)``
+    A quoted string in code.
+``('template', body, offset, owner)`` / ``('dynamic_template', ...)``
+    A template literal without / with ``${...}`` substitutions. The body is
+    the raw text between the backticks.
+``('expression', source, offset, attribute)``
+    The raw source of a JSX ``{...}`` container, emitted when it closes.
+    ``attribute`` is the attribute name, or None for children and spreads.
+``('tag', name, offset, None)`` / ``('close_tag', name, offset, None)``
+    An opening JSX tag, emitted at its closing ``>`` (after the tokens of
+    its attributes) with the offset of its ``<``, and an explicit closing
+    tag. Fragments have the name ``''``.
+``('text', text, offset, None)``
+    A run of JSX text between tags and containers.
+
+The owner of a string or template literal is the JSX attribute name when
+the literal starts that attribute's ``{...}`` value (``code={`...`}``),
+``'const'`` when it initializes ``const name = ...``, and None otherwise.
+
+Comments and regex literals are skipped. Every character is consumed by at
+most one anchored regex match, so the cost is linear in the file size.
+Malformed input never raises: an opening ``<`` that turns out not to be a
+tag is re-read as an operator, and an unterminated construct runs to the end
+of the file.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Token = Tuple[str, str, int, Optional[str]]
+
+CODE, TEMPLATE, TAG, CHILDREN = 'code', 'template', 'tag', 'children'
+
+CODE_REGEX = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<arrow>=>)
+  | (?P<char>.)
+''', re.VERBOSE | re.DOTALL)
+STRING_REGEXES = {
+    '"': re.compile(r'"((?:[^"\\\n]|\\.)*)"?', re.DOTALL),
+    "'": re.compile(r"'((?:[^'\\\n]|\\.)*)'?", re.DOTALL),
+}
+TEMPLATE_BODY_REGEX = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*', re.DOTALL)
+REGEX_LITERAL_REGEX = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+WHITESPACE_REGEX = re.compile(r'\s*')
+TAG_NAME_REGEX = re.compile(r'[A-Za-z_$][\w$.:-]*')
+JSX_START_REGEX = re.compile(r'[A-Za-z_$>]')
+ATTRIBUTE_NAME_REGEX = re.compile(r'[A-Za-z_$][\w$:-]*')
+CLOSE_TAG_REGEX = re.compile(r'</\s*([A-Za-z_$][\w$.:-]*)?\s*>')
+JSX_TEXT_REGEX = re.compile(r'[^{<]+')
+
+# Tokens after which a '/' starts a regex and a '<' may start a JSX element
+EXPRESSION_START = frozenset('([{,;:!&|?=+-*%<>~^}') | {
+    None, '=>', 'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await', 'default', 'export',
+}
+# Marks a finished operand (literal, element, parenthesized group) as the previous token
+OPERAND = ')'
+
+
+def _code_frame(closer: Optional[str] = None, start: int = 0, attribute: Optional[str] = None) -> Dict[str, Any]:
+    # tokens counts what the frame has read so far; declaration tracks `const name =` (1, 2, 3)
+    return {'kind': CODE, 'closer': closer, 'start': start, 'attribute': attribute, 'depth': 0,
+            'prev': None, 'tokens': 0, 'declaration': 0}
+
+
+def _literal_owner(frame: Dict[str, Any]) -> Optional[str]:
+    """Owner of a literal starting at the current position of a code frame"""
+    if frame['attribute'] is not None and frame['tokens'] == 0:
+        return frame['attribute']
+    return 'const' if frame['declaration'] == 3 else None
+
+
+def _operand_read(frame: Dict[str, Any]) -> None:
+    frame['prev'] = OPERAND
+    frame['tokens'] += 1
+    frame['declaration'] = 0
+
+
+def _element_done(stack: List[Dict[str, Any]]) -> None:
+    """A JSX element ended; in code it is an operand like any other expression"""
+    if stack[-1]['kind'] == CODE:
+        stack[-1]['prev'] = OPERAND
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Yield the string, template, JSX and expression tokens of a TSX source"""
+    n = len(text)
+    pos = 0
+    stack = [_code_frame()]
+
+    while pos < n:
+        frame = stack[-1]
+        kind = frame['kind']
+
+        if kind == CODE:
+            char = text[pos]
+            if char in STRING_REGEXES:
+                match = STRING_REGEXES[char].match(text, pos)
+                yield 'string', match.group(1), pos, _literal_owner(frame)
+                _operand_read(frame)
+                pos = match.end()
+            elif char == '`':
+                stack.append({'kind': TEMPLATE, 'start': pos, 'dynamic': False, 'owner': _literal_owner(frame)})
+                _operand_read(frame)
+                pos += 1
+            elif char == '/' and text[pos + 1:pos + 2] not in ('/', '*') and frame['prev'] in EXPRESSION_START \
+                    and REGEX_LITERAL_REGEX.match(text, pos):
+                _operand_read(frame)
+                pos = REGEX_LITERAL_REGEX.match(text, pos).end()
+            elif char == '<' and frame['prev'] in EXPRESSION_START and JSX_START_REGEX.match(text, pos + 1):
+                frame['tokens'] += 1
+                pos = _open_tag(text, pos, stack)
+            elif char == '}' and frame['depth'] == 0 and frame['closer'] is not None:
+                stack.pop()
+                if frame['closer'] != TEMPLATE:
+                    yield 'expression', text[frame['start']:pos], frame['start'] - 1, frame['attribute']
+                pos += 1
+            else:
+                match = CODE_REGEX.match(text, pos)
+                group = match.lastgroup
+                if group != 'skip':
+                    token = match.group()
+                    if group == 'word':
+                        frame['declaration'] = 1 if token == 'const' else 2 if frame['declaration'] == 1 else 0
+                    else:
+                        frame['declaration'] = 3 if token == '=' and frame['declaration'] == 2 else 0
+                    if token == '{':
+                        frame['depth'] += 1
+                    elif token == '}':
+                        frame['depth'] -= 1
+                    frame['prev'] = OPERAND if group == 'number' else token
+                    frame['tokens'] += 1
+                pos = match.end()
+
+        elif kind == TEMPLATE:
+            pos = TEMPLATE_BODY_REGEX.match(text, pos).end()
+            if pos >= n:
+                break
+            if text[pos] == '`':
+                stack.pop()
+                yield ('dynamic_template' if frame['dynamic'] else 'template'), \
+                    text[frame['start'] + 1:pos], frame['start'], frame['owner']
+                pos += 1
+            else:
+                # ${ opens an embedded expression that ends at its matching }
+                frame['dynamic'] = True
+                stack.append(_code_frame(TEMPLATE, pos + 2))
+                pos += 2
+
+        elif kind == TAG:
+            pos = WHITESPACE_REGEX.match(text, pos).end()
+            if pos >= n:
+                break
+            char = text[pos]
+            if char == '>':
+                yield 'tag', frame['name'], frame['start'], None
+                stack[-1] = {'kind': CHILDREN, 'name': frame['name']}
+                pos += 1
+            elif text.startswith('/>', pos):
+                yield 'tag', frame['name'], frame['start'], None
+                stack.pop()
+                _element_done(stack)
+                pos += 2
+            elif char == '{':
+                # Spread attributes, {...props}
+                stack.append(_code_frame(TAG, pos + 1))
+                pos += 1
+            else:
+                match = ATTRIBUTE_NAME_REGEX.match(text, pos)
+                if match is None:
+                    # Not a tag after all (a comparison or a generic); read the '<' as an operator
+                    stack.pop()
+                    if stack[-1]['kind'] == CODE:
+                        stack[-1]['prev'] = '<'
+                    pos = frame['start'] + 1
+                    continue
+                name = match.group()
+                pos = WHITESPACE_REGEX.match(text, match.end()).end()
+                if not text.startswith('=', pos):
+                    continue
+                pos = WHITESPACE_REGEX.match(text, pos + 1).end()
+                quote = text[pos:pos + 1]
+                if quote in ('"', "'"):
+                    end = text.find(quote, pos + 1)
+                    end = n if end == -1 else end
+                    yield 'attribute', text[pos + 1:end], pos, name
+                    pos = end + 1
+                elif quote == '{':
+                    stack.append(_code_frame(TAG, pos + 1, name))
+                    pos += 1
+                elif quote == '<':
+                    pos = _open_tag(text, pos, stack)
+
+        else:
+            char = text[pos]
+            if char == '{':
+                stack.append(_code_frame(CHILDREN, pos + 1))
+                pos += 1
+            elif text.startswith('</', pos):
+                match = CLOSE_TAG_REGEX.match(text, pos)
+                if match is None:
+                    pos += 2
+                    continue
+                yield 'close_tag', match.group(1) or '', pos, None
+                stack.pop()
+                _element_done(stack)
+                pos = match.end()
+            elif char == '<' and JSX_START_REGEX.match(text, pos + 1):
+                pos = _open_tag(text, pos, stack)
+            else:
+                match = JSX_TEXT_REGEX.match(text, pos)
+                end = match.end() if match else pos + 1
+                yield 'text', text[pos:end], pos, None
+                pos = end
+
+
+def _open_tag(text: str, pos: int, stack: List[Dict[str, Any]]) -> int:
+    """Push a JSX tag opened by the '<' at pos; returns the offset after its name"""
+    match = TAG_NAME_REGEX.match(text, pos + 1)
+    stack.append({'kind': TAG, 'name': match.group() if match else '', 'start': pos})
+    return match.end() if match else pos + 1
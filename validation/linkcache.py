@@ -0,0 +1,99 @@
+"""
+Persistent external link result cache
+=====================================
+Stores the outcome of external link checks on disk so repeat runs don't hit
+the network again. Each entry records the HTTP status, the final redirect
+target, the ETag/Last-Modified validators and when the URL was checked.
+Fresh entries are reused as-is; stale entries are revalidated with a
+conditional request. The cache is bounded and evicts least recently used
+entries first.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILE = Path(".validation-cache") / "external-links.json"
+
+
+class LinkResultCache:
+    def __init__(self, path: Path = DEFAULT_CACHE_FILE, ttl: float = 24 * 3600,
+                 max_entries: int = 5000):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load entries from disk, ignoring missing or incompatible cache files"""
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.entries = data.get('entries', {})
+
+    def save(self) -> None:
+        """Write the cache atomically, evicting the least recently used entries first"""
+        with self._lock:
+            if not self._dirty:
+                return
+            if len(self.entries) > self.max_entries:
+                keep = sorted(self.entries.items(), key=lambda item: item[1].get('last_used', 0),
+                              reverse=True)[:self.max_entries]
+                self.entries = dict(keep)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            tmp_path.write_text(json.dumps({'version': CACHE_VERSION, 'entries': self.entries}),
+                                encoding='utf-8')
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a URL, fresh or stale"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                entry['last_used'] = time.time()
+                self._dirty = True
+            return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether an entry is young enough to be used without revalidation"""
+        return time.time() - entry.get('checked_at', 0) < self.ttl
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers for a stale entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, result: Dict[str, Any]) -> None:
+        """Record a network result; transport errors are never cached"""
+        if result.get('error') or result.get('status') is None:
+            return
+        now = time.time()
+        with self._lock:
+            self.entries[result['url']] = {
+                'status': result['status'],
+                'final_url': result.get('final_url'),
+                'etag': result.get('etag'),
+                'last_modified': result.get('last_modified'),
+                'checked_at': now,
+                'last_used': now,
+            }
+            self._dirty = True
@@ -0,0 +1,424 @@
+"""
+Concurrent external link checking
+=================================
+Checks external URLs on a thread pool that shares one pooled HTTP session.
+Politeness is enforced per host rather than globally: every host gets a
+small number of sequential "lanes", and requests to a host start at least
+``host_delay`` seconds apart (``host_delay / per_host`` with several lanes),
+however the lanes come and go. Different hosts are checked in parallel, so total
+wall-clock time is bounded by the slowest host instead of the link count.
+URLs can be streamed in while the sources are still being scanned; a
+bounded number of pending checks applies backpressure to the scan.
+When a LinkResultCache is supplied, fresh results are served from it and
+stale ones are revalidated with conditional requests.
+
+A per-host circuit breaker stops hammering a host that is down: after
+``max_host_failures`` consecutive timeouts or connection errors, the
+remaining URLs of that host are answered with a ``host_unreachable`` result
+without a request or a politeness delay. In offline mode no request is made
+at all and every URL is answered from the cache, stale or not.
+
+Requests are kept few and small. URLs are deduplicated by their canonical
+form (``canonical_url``), so variants differing only in scheme, trailing
+slash, fragment or tracking parameters share one check. A URL already seen
+as the final target of a redirect is answered from that check. When a
+server refuses HEAD, the fallback GET asks for a single byte and closes the
+response without reading the body.
+"""
+
+import queue
+import threading
+import time
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from validation.linkcache import LinkResultCache
+
+USER_AGENT = 'BlazeMetrics-LinkValidator/1.0'
+# URLs queued or in flight before LinkCheckStream.submit blocks the scan
+DEFAULT_MAX_PENDING = 64
+# Consecutive transport failures after which a host is considered down
+DEFAULT_MAX_HOST_FAILURES = 3
+# Errors that say nothing about the URL itself, only about reaching its host
+TRANSPORT_ERRORS = ('timeout', 'connection')
+# Result sources that never went through a host lane
+IMMEDIATE_SOURCES = ('cache', 'offline', 'alias', 'redirect')
+# HEAD answers that mean "ask again with GET"
+HEAD_REFUSED = (405, 501)
+RANGE_HEADERS = {'Range': 'bytes=0-0'}
+# The answer to RANGE_HEADERS from an empty resource: it exists, there is just no first byte
+RANGE_NOT_SATISFIABLE = 416
+# Query parameters that never change what a URL points to
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', 'ref_src')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonical_url(url: str) -> str:
+    """Deduplication key of an external URL
+
+    Scheme, fragment, tracking parameters, default ports and trailing
+    slashes are dropped and the host is lowercased, so
+    ``http://Example.com/docs/?utm_source=x#intro`` and
+    ``https://example.com/docs`` share the key ``//example.com/docs``.
+    """
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or '').lower()
+        port = parts.port
+    except ValueError:
+        return url
+    if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+    query = '&'.join(param for param in parts.query.split('&')
+                     if param and not param.split('=', 1)[0].lower().startswith(TRACKING_PARAMS))
+    return urlunsplit(('', host, parts.path.rstrip('/') or '/', query, ''))
+
+
+def _result(url: str, source: str, error: Optional[str] = None) -> Dict[str, Any]:
+    return {'url': url, 'status': None, 'final_url': None, 'etag': None,
+            'last_modified': None, 'error': error, 'detail': None, 'source': source}
+
+
+class HostCircuitBreaker:
+    """Counts consecutive transport failures per host and opens once a host reaches the limit
+
+    An open circuit stays open for the rest of the run. A limit of 0
+    disables the breaker.
+    """
+
+    def __init__(self, max_failures: int = DEFAULT_MAX_HOST_FAILURES):
+        self.max_failures = max_failures
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.open_hosts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def is_open(self, host: str) -> bool:
+        return host in self.open_hosts
+
+    def record(self, host: str, result: Dict[str, Any]) -> None:
+        """Update the host's failure count from a network result"""
+        if not self.max_failures:
+            return
+        with self._lock:
+            if result['error'] in TRANSPORT_ERRORS:
+                self.failures[host] += 1
+                if self.failures[host] >= self.max_failures:
+                    self.open_hosts.setdefault(host, 0)
+            else:
+                self.failures[host] = 0
+
+    def short_circuit(self, url: str, host: str) -> Dict[str, Any]:
+        """The result given instead of a request to an open host"""
+        result = _result(url, 'breaker', 'host_unreachable')
+        with self._lock:
+            self.open_hosts[host] += 1
+            result['detail'] = f"{self.failures[host]} consecutive failures"
+        return result
+
+
+class ExternalLinkChecker:
+    def __init__(self, jobs: int = 8, per_host: int = 1, host_delay: float = 0.5,
+                 timeout: float = 10.0, cache: Optional[LinkResultCache] = None,
+                 max_host_failures: int = DEFAULT_MAX_HOST_FAILURES, offline: bool = False):
+        self.jobs = max(1, jobs)
+        self.per_host = max(1, per_host)
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+        self.breaker = HostCircuitBreaker(max(0, max_host_failures))
+        # Checked redirect targets by canonical URL, seeded from fresh cache entries
+        self.redirect_targets: Dict[str, Dict[str, Any]] = self._cached_redirect_targets()
+        self.deduplicated = 0
+        self.redirect_hits = 0
+        self.ranged_gets = 0
+        self.bytes_avoided = 0
+        # Duration of every network check, for latency percentiles
+        self.request_seconds = array('d')
+        self._lock = threading.Lock()
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        """Create one session whose connection pool is shared by all workers"""
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=self.jobs, pool_maxsize=self.jobs)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        self.session.close()
+
+    def canonical_key(self, url: str) -> str:
+        """Key under which URLs are deduplicated and redirect targets remembered"""
+        return canonical_url(url)
+
+    @property
+    def requests_saved(self) -> int:
+        return self.deduplicated + self.redirect_hits
+
+    def _cached_redirect_targets(self) -> Dict[str, Dict[str, Any]]:
+        targets = {}
+        for url, entry in (self.cache.entries.items() if self.cache else ()):
+            final_url = entry.get('final_url')
+            if final_url and entry['status'] < 400 and self.cache.is_fresh(entry) \
+                    and canonical_url(final_url) != canonical_url(url):
+                targets[canonical_url(final_url)] = entry
+        return targets
+
+    def _ranged_get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """GET only the first byte of url, closing the response without reading its body"""
+        response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True,
+                                    headers={**headers, **RANGE_HEADERS})
+        response.close()
+        # bytes 0-0/12345, or a Content-Length when the server ignored the range
+        total = response.headers.get('Content-Range', '').rpartition('/')[2] \
+            if response.status_code == 206 else response.headers.get('Content-Length')
+        with self._lock:
+            self.ranged_gets += 1
+            if total and total.isdigit():
+                self.bytes_avoided += max(0, int(total) - (1 if response.status_code == 206 else 0))
+        return response
+
+    def check_url(self, url: str, cached: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Check a single URL with HEAD, falling back to a one-byte GET when HEAD is refused
+
+        If a stale cache entry is given, the request is made conditional and a
+        304 answer reuses the cached status and redirect target.
+        """
+        result = _result(url, 'network')
+        headers = self.cache.conditional_headers(cached) if self.cache else {}
+        start = time.perf_counter()
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True,
+                                         headers=headers)
+
+            ranged = response.status_code in HEAD_REFUSED
+            if ranged:
+                response = self._ranged_get(url, headers)
+
+            if response.status_code == 304 and cached:
+                result['status'] = cached['status']
+                result['final_url'] = cached.get('final_url')
+                result['etag'] = response.headers.get('ETag') or cached.get('etag')
+                result['last_modified'] = (response.headers.get('Last-Modified')
+                                           or cached.get('last_modified'))
+                result['source'] = 'revalidated'
+            else:
+                result['status'] = 200 if ranged and response.status_code == RANGE_NOT_SATISFIABLE \
+                    else response.status_code
+                result['final_url'] = response.url
+                result['etag'] = response.headers.get('ETag')
+                result['last_modified'] = response.headers.get('Last-Modified')
+        except requests.exceptions.Timeout:
+            result['error'] = 'timeout'
+        except requests.exceptions.ConnectionError:
+            result['error'] = 'connection'
+        except Exception as e:
+            result['error'] = 'other'
+            result['detail'] = str(e)
+        self.request_seconds.append(time.perf_counter() - start)
+        return result
+
+    def _cache_hit(self, url: str) -> Optional[Dict[str, Any]]:
+        """A result served from a fresh cache entry, or None
+
+        Offline, stale entries are served too, and a URL missing from the
+        cache gets an 'offline' result instead of None.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if not (cached and (self.offline or self.cache.is_fresh(cached))):
+            return _result(url, 'offline', 'offline') if self.offline else None
+        self.cache.hits += 1
+        return {'url': url, 'status': cached['status'], 'final_url': cached.get('final_url'),
+                'etag': cached.get('etag'), 'last_modified': cached.get('last_modified'),
+                'error': None, 'detail': None, 'source': 'cache'}
+
+    def _redirect_hit(self, url: str, key: str) -> Optional[Dict[str, Any]]:
+        """A result for a URL that an earlier check was redirected to, or None"""
+        target = self.redirect_targets.get(key)
+        if target is None:
+            return None
+        self.redirect_hits += 1
+        return {'url': url, 'status': target['status'], 'final_url': target.get('final_url'),
+                'etag': None, 'last_modified': None, 'error': None, 'detail': None, 'source': 'redirect'}
+
+    def _note_redirect(self, result: Dict[str, Any]) -> None:
+        """Remember where a successful check ended up if it was redirected"""
+        final_url = result['final_url']
+        if final_url and not result['error'] and result['status'] < 400:
+            key = self.canonical_key(final_url)
+            if key != self.canonical_key(result['url']):
+                with self._lock:
+                    self.redirect_targets.setdefault(key, result)
+
+    def _record(self, result: Dict[str, Any]) -> None:
+        if self.cache:
+            if result['source'] == 'revalidated':
+                self.cache.revalidated += 1
+            self.cache.store(result)
+
+    def stream(self, max_pending: int = DEFAULT_MAX_PENDING) -> 'LinkCheckStream':
+        """Start a pipeline that checks URLs as they are submitted"""
+        return LinkCheckStream(self, max_pending)
+
+    def check_all(self, urls: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Check all URLs concurrently, yielding results as they complete"""
+        with self.stream() as stream:
+            for url in sorted(set(urls)):
+                stream.submit(url)
+                yield from stream.ready()
+            yield from stream.finish()
+
+
+class LinkCheckStream:
+    """Checks URLs while the caller is still discovering them
+
+    ``submit`` hands a URL to a per-host lane right away; fresh cache hits
+    complete immediately. At most ``max_pending`` URLs are queued or in
+    flight, so ``submit`` blocks (backpressure) when the network falls
+    behind the scan. Results are collected from ``ready()`` without waiting,
+    or from ``finish()`` which waits for the rest. Results and cache updates
+    are handled on the caller's thread.
+
+    A URL whose canonical form was already submitted is not checked again;
+    it gets a copy of that check's result (source ``'alias'``).
+
+    Each host has at most ``per_host`` lanes. A lane ends when its host's
+    queue runs dry, so the spacing is kept per host rather than per lane:
+    every request reserves the next start time of its host, ``host_delay /
+    per_host`` seconds after the previous one. Lanes of different hosts run
+    in parallel on ``jobs`` threads. URLs of a host whose circuit is open are answered
+    without a request and without waiting ``host_delay``.
+    """
+
+    def __init__(self, checker: ExternalLinkChecker, max_pending: int = DEFAULT_MAX_PENDING):
+        self.checker = checker
+        self.slots = threading.BoundedSemaphore(max(1, max_pending))
+        self.results: 'queue.Queue[Dict[str, Any]]' = queue.Queue()
+        self.lock = threading.Lock()
+        self.hosts: Dict[str, deque] = defaultdict(deque)
+        self.lanes: Dict[str, int] = defaultdict(int)
+        # Host -> earliest time.monotonic() its next request may start
+        self.next_request: Dict[str, float] = {}
+        self.outstanding = 0
+        # Canonical URL -> result once its check is done, or the aliases waiting for it
+        self.done: Dict[str, Dict[str, Any]] = {}
+        self.waiting: Dict[str, List[str]] = {}
+        self.executor = ThreadPoolExecutor(max_workers=checker.jobs)
+
+    def __enter__(self) -> 'LinkCheckStream':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self, url: str) -> None:
+        """Queue url for checking, waiting while max_pending URLs are outstanding"""
+        key = self.checker.canonical_key(url)
+        if key in self.done:
+            self.checker.deduplicated += 1
+            self.results.put(self._alias(url, self.done[key]))
+            return
+        if key in self.waiting:
+            self.checker.deduplicated += 1
+            self.waiting[key].append(url)
+            return
+
+        hit = self.checker._redirect_hit(url, key) or self.checker._cache_hit(url)
+        if hit is not None:
+            self.done[key] = hit
+            self.results.put(hit)
+            return
+
+        self.waiting[key] = []
+        self.slots.acquire()
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            self.outstanding += 1
+            self.hosts[host].append(url)
+            if self.lanes[host] < self.checker.per_host:
+                self.lanes[host] += 1
+                self.executor.submit(self._run_lane, host)
+
+    def _wait_turn(self, host: str) -> None:
+        """Reserve the next request start of host and sleep until it, whichever lane asks"""
+        delay = self.checker.host_delay / self.checker.per_host
+        if not delay:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_request.get(host, now))
+            self.next_request[host] = start + delay
+        if start > now:
+            time.sleep(start - now)
+
+    def _run_lane(self, host: str) -> None:
+        """Drain one host's queue sequentially, keeping the host's request spacing"""
+        while True:
+            with self.lock:
+                if not self.hosts[host]:
+                    self.lanes[host] -= 1
+                    return
+                url = self.hosts[host].popleft()
+            breaker = self.checker.breaker
+            # Posted if the check raises, so finish() still gets one result per URL
+            result = _result(url, 'network', 'other')
+            try:
+                if breaker.is_open(host):
+                    result = breaker.short_circuit(url, host)
+                else:
+                    self._wait_turn(host)
+                    cached = self.checker.cache.get(url) if self.checker.cache else None
+                    result = self.checker.check_url(url, cached)
+                    breaker.record(host, result)
+                    self.checker._note_redirect(result)
+            except Exception as e:
+                result = {**_result(url, 'network', 'other'), 'detail': str(e)}
+            finally:
+                self.slots.release()
+                self.results.put(result)
+
+    @staticmethod
+    def _alias(url: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        return {**result, 'url': url, 'source': 'alias'}
+
+    def _take(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if result['source'] not in IMMEDIATE_SOURCES:
+            with self.lock:
+                self.outstanding -= 1
+            self.checker._record(result)
+            key = self.checker.canonical_key(result['url'])
+            self.done[key] = result
+            for alias in self.waiting.pop(key, ()):
+                self.results.put(self._alias(alias, result))
+        return result
+
+    def ready(self) -> Iterator[Dict[str, Any]]:
+        """Results that are already available, without blocking"""
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                return
+            yield self._take(result)
+
+    def finish(self) -> Iterator[Dict[str, Any]]:
+        """All remaining results, waiting for outstanding checks"""
+        yield from self.ready()
+        while True:
+            with self.lock:
+                if self.outstanding == 0 and self.results.empty():
+                    return
+            yield self._take(self.results.get())
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,166 @@
+"""
+Content-hash manifest for incremental validation
+================================================
+Remembers, for every source file, the hash of its contents and the
+artifacts (extracted links, findings, pattern counts, ...) the validators
+derived from it. On the next run a file whose size and mtime are unchanged
+is trusted without being read; if only the stat changed the file is hashed
+and its artifacts are still reused when the hash matches. Everything else is
+reprocessed.
+
+With ``changed_files`` (typically from ``git diff --name-only``) the stat
+check is skipped as well: files outside that set are taken from the manifest
+and files inside it are always rebuilt.
+
+The manifest is invalidated as a whole whenever the validator code changes,
+tracked through a fingerprint of the scripts and this package.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST_FILE = Path(".validation-cache") / "manifest.json"
+MISSING = object()
+
+VALIDATOR_SOURCES = ('validate-links.py', 'validate-content.py', 'test-ux.py')
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def validator_fingerprint(root: Path = Path(__file__).resolve().parent.parent) -> str:
+    """Hash of the validator scripts and helper package, so code changes drop stale findings"""
+    digest = hashlib.blake2b(digest_size=16)
+    paths = [root / name for name in VALIDATOR_SOURCES]
+    paths += sorted((root / 'validation').rglob('*.py'))
+    for path in paths:
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+
+def git_changed_files(ref: str, cwd: Path = Path(".")) -> Set[str]:
+    """Files changed relative to ref, including untracked ones, as repo-relative paths"""
+    changed = set()
+    commands = [
+        ['git', 'diff', '--name-only', ref, '--'],
+        ['git', 'ls-files', '--others', '--exclude-standard'],
+    ]
+    for command in commands:
+        output = subprocess.run(command, cwd=cwd, check=True, capture_output=True, text=True).stdout
+        changed.update(line.strip() for line in output.splitlines() if line.strip())
+    return changed
+
+
+class Manifest:
+    def __init__(self, path: Path = DEFAULT_MANIFEST_FILE, fingerprint: str = '',
+                 changed_files: Optional[Iterable[str]] = None):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.changed_files = set(changed_files) if changed_files is not None else None
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.reused = 0
+        self.rebuilt = 0
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load the manifest, discarding it if the format or validator code changed"""
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION and data.get('fingerprint') == self.fingerprint:
+            self.entries = data.get('entries', {})
+        else:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest atomically, pruning entries for deleted files"""
+        for key in [key for key in self.entries if not os.path.exists(key)]:
+            del self.entries[key]
+            self._dirty = True
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp_path.write_text(json.dumps({
+            'version': MANIFEST_VERSION,
+            'fingerprint': self.fingerprint,
+            'entries': self.entries,
+        }), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _is_current(self, source, entry: Dict[str, Any]) -> bool:
+        """Whether a manifest entry still describes the file on disk"""
+        key = str(source.path)
+        if self.changed_files is not None:
+            return key not in self.changed_files
+
+        try:
+            stat = os.stat(source.path)
+        except OSError:
+            return False
+        if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+
+        # Touched but possibly not modified: fall back to the content hash
+        if content_hash(source.text) == entry['hash']:
+            entry['size'] = stat.st_size
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self._dirty = True
+            return True
+        return False
+
+    def lookup(self, source, name: str) -> Any:
+        """Cached artifact for a file, or MISSING if the file changed or was never seen"""
+        entry = self.entries.get(str(source.path))
+        if entry is None or name not in entry['artifacts'] or not self._is_current(source, entry):
+            return MISSING
+        self.reused += 1
+        return entry['artifacts'][name]
+
+    def record(self, source, name: str, value: Any) -> None:
+        """Store a freshly built artifact against the file's current content hash"""
+        key = str(source.path)
+        digest = content_hash(source.text)
+        entry = self.entries.get(key)
+        if entry is None or entry['hash'] != digest:
+            stat = os.stat(source.path)
+            entry = self.entries[key] = {
+                'hash': digest,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'artifacts': {},
+            }
+        entry['artifacts'][name] = value
+        self.rebuilt += 1
+        self._dirty = True
+
+
+def add_manifest_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the incremental validation options on a parser"""
+    parser.add_argument("--no-incremental", action="store_true",
+                        help="reprocess every file instead of reusing manifest results")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_FILE,
+                        help=f"incremental validation manifest (default: {DEFAULT_MANIFEST_FILE})")
+    parser.add_argument("--changed-since", metavar="REF",
+                        help="only reprocess files reported by 'git diff REF' plus untracked files")
+
+
+def build_manifest(args: argparse.Namespace) -> Optional[Manifest]:
+    """Create the manifest described by the parsed options, or None for full runs"""
+    if args.no_incremental:
+        return None
+    changed = git_changed_files(args.changed_since) if args.changed_since else None
+    return Manifest(args.manifest, fingerprint=validator_fingerprint(), changed_files=changed)
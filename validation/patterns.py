@@ -0,0 +1,94 @@
+"""
+Per-file pattern counting
+=========================
+``PatternCounter`` counts a fixed set of literal patterns in a text with
+``str.count``, once per distinct pattern, so patterns listed under several
+checks (``aria-label`` is both an ARIA label and alt text) are counted a
+single time. The UX checks cache the counts per file, so every file is
+counted once for all of them.
+
+``AutomatonCounter`` is the single-pass alternative: an Aho-Corasick
+automaton that visits every character once for all patterns. It gives the
+same counts but runs in Python, and ``benchmark-validators.py ux-patterns``
+measures it several times slower than the C-level ``str.count`` calls
+(a one-regex scan over all patterns lost as well). So the UX checks use
+``PatternCounter``, and the saving comes from counting each file once and
+caching the counts.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Mapping
+
+
+class PatternCounter:
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = sorted(set(patterns))
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Occurrences of every pattern in text, as text.count(pattern) reports them"""
+        return {pattern: text.count(pattern) for pattern in self.patterns}
+
+    @staticmethod
+    def by_category(counts: Mapping[str, int], categories: Mapping[str, Iterable[str]]) -> Dict[str, int]:
+        """Sum pattern counts into named categories; a pattern may sit in several"""
+        return {category: sum(counts.get(pattern, 0) for pattern in patterns)
+                for category, patterns in categories.items()}
+
+
+class AutomatonCounter(PatternCounter):
+    """Aho-Corasick automaton counting every pattern in one pass over the text
+
+    Counts are exactly those of ``str.count``: occurrences of one pattern
+    never overlap. Kept as the single-pass alternative that ``ux-patterns``
+    measures against ``PatternCounter``.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        super().__init__(patterns)
+        # Trie: transitions, failure links and the patterns ending at each state
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(index)
+
+        # Failure links in breadth-first order, so a state's fallback is always resolved first
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for char, child in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(char, 0)
+                outputs[child] = outputs[child] + outputs[fail[child]]
+                queue.append(child)
+
+        # Resolve failure links into full transition tables, so the scan never backtracks
+        self._delta: List[Dict[str, int]] = [dict(goto[0])] * len(goto)
+        for state in order:
+            self._delta[state] = {**self._delta[fail[state]], **goto[state]}
+        self._outputs = [tuple((index, len(self.patterns[index])) for index in output) for output in outputs]
+
+    def count(self, text: str) -> Dict[str, int]:
+        counts = [0] * len(self.patterns)
+        # End of the last counted occurrence of each pattern, for str.count's non-overlapping semantics
+        last_end = [0] * len(self.patterns)
+        delta, outputs = self._delta, self._outputs
+        state = 0
+        for position, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            for index, length in outputs[state]:
+                if position - length >= last_end[index]:
+                    counts[index] += 1
+                    last_end[index] = position
+        return dict(zip(self.patterns, counts))
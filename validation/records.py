@@ -0,0 +1,87 @@
+"""
+Compact link and finding records
+================================
+A large documentation tree yields hundreds of thousands of link occurrences
+and can yield as many findings. Keeping each link as a ``{'url', 'file',
+'line'}`` dict repeats the file path string per match, and keeping each
+finding as a formatted message stores mostly the same text again and again.
+
+``Link`` is a ``__slots__`` record with an interned URL and a small file id
+from a ``FileTable``. ``FindingLog`` keeps findings as columns: an ``array``
+of message template ids plus the arguments of each message, so a finding
+costs one tuple of references to strings that exist anyway. Messages are
+formatted only when they are printed or reported.
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class FileTable:
+    """Small integer ids for file paths, each path string stored once"""
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id(self, path: Any) -> int:
+        key = str(path)
+        file_id = self._ids.get(key)
+        if file_id is None:
+            file_id = self._ids[key] = len(self.paths)
+            self.paths.append(sys.intern(key))
+        return file_id
+
+    def path(self, file_id: int) -> str:
+        return self.paths[file_id]
+
+
+class Link:
+    """One link occurrence: interned URL, id of the file it is in and line number"""
+
+    __slots__ = ('url', 'file_id', 'line')
+
+    def __init__(self, url: str, file_id: int, line: int):
+        self.url = sys.intern(url)
+        self.file_id = file_id
+        self.line = line
+
+    def __repr__(self) -> str:
+        return f"Link({self.url!r}, {self.file_id}, {self.line})"
+
+
+class FindingLog:
+    """Findings as (template id, arguments) columns, formatted on demand
+
+    Iterating yields the formatted messages, so a FindingLog can stand in
+    for the list of strings it replaces. A message logged without arguments
+    is its own template and is not passed through str.format.
+    """
+
+    def __init__(self):
+        self.templates: List[str] = []
+        self._template_ids: Dict[str, int] = {}
+        self.template_ids = array('I')
+        self.args: List[Tuple[Any, ...]] = []
+
+    def add(self, template: str, args: Tuple[Any, ...] = ()) -> str:
+        """Record a finding and return its formatted message"""
+        template_id = self._template_ids.get(template)
+        if template_id is None:
+            template_id = self._template_ids[template] = len(self.templates)
+            self.templates.append(template)
+        self.template_ids.append(template_id)
+        self.args.append(args)
+        return self.format(len(self.args) - 1)
+
+    def format(self, index: int) -> str:
+        template = self.templates[self.template_ids[index]]
+        args = self.args[index]
+        return template.format(*args) if args else template
+
+    def __len__(self) -> int:
+        return len(self.args)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.format(index) for index in range(len(self.args)))
@@ -0,0 +1,235 @@
+"""
+Streaming finding reporters
+===========================
+Validators hand every finding to a ``Reporter`` the moment they log it,
+instead of printing it and replaying it in their summary. A reporter only
+writes failures unless it is verbose, in which case passing checks are
+written too.
+
+- ``TextReporter``: the emoji lines the validators have always printed
+- ``CompactReporter``: one ``tool: level: message`` line per finding
+- ``JsonLinesReporter``: one JSON object per finding
+- ``SarifReporter``: a SARIF 2.1.0 log with one run per validator
+
+Structured reports are streamed too: each JSON line or SARIF result is
+written as it is logged, and the SARIF rules and tool description follow
+the results of each run. validate-all shares one reporter between its
+validators, so a single pass produces one merged report.
+
+Messages carry their location as text (``in src/pages/Home.tsx:12``);
+``finding_location`` recovers it for the structured formats and
+``rule_id`` turns a message template into a stable rule id.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+FORMATS = ('text', 'compact', 'jsonl', 'sarif')
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+# A project file path and line, path:line, that is not part of a URL. Paths without a line
+# are usually what a finding is about (a missing file), not where it was found
+LOCATION_REGEX = re.compile(r'(?<![\w/:.@-])([\w.@-]+(?:/[\w.@-]+)*\.(?:tsx|ts|css|json|py)):(\d+)')
+# str.format fields of a message template: {}, {:.1f}, ...
+PLACEHOLDER_REGEX = re.compile(r'\{[^{}]*\}')
+# Rules are named by the part of a template before its location or details
+RULE_HEAD_REGEX = re.compile(r'^(.*?)(?:\s+in\s+|:|$)')
+RULE_WORDS = 6
+
+
+def finding_location(message: str) -> Tuple[Optional[str], Optional[int]]:
+    """(file, line) a finding message was found at, or (None, None)"""
+    match = LOCATION_REGEX.search(message)
+    if match is None:
+        return None, None
+    return match.group(1), int(match.group(2))
+
+
+def rule_text(template: str) -> str:
+    """The part of a message template before its location or details, fields shown as …"""
+    return RULE_HEAD_REGEX.match(PLACEHOLDER_REGEX.sub('…', template).strip()).group(1)
+
+
+def rule_id(template: str) -> str:
+    """A kebab-case rule id from the leading words of a message template"""
+    words = re.findall(r'[a-z0-9]+', rule_text(template).lower())[:RULE_WORDS]
+    return '-'.join(words) or 'finding'
+
+
+class Reporter:
+    """Receives every finding as it is logged; this base class discards them
+
+    ``tool`` names the validator (script) that logged the finding and
+    ``template`` is the message before formatting, which identifies its rule.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, verbose: bool = False):
+        self._stream = stream
+        self.verbose = verbose
+        self.counts = {'error': 0, 'warning': 0, 'success': 0}
+
+    @property
+    def stream(self) -> TextIO:
+        # Resolved per write by default, so redirect_stdout applies like it does to print
+        return self._stream if self._stream is not None else sys.stdout
+
+    def report(self, tool: str, level: str, message: str, template: Optional[str] = None) -> None:
+        """Count a finding and emit it; successes are only emitted when verbose"""
+        self.counts[level] += 1
+        if level != 'success' or self.verbose:
+            self.emit(tool, level, message, template or message)
+
+    def emit(self, tool: str, level: str, message: str, template: str) -> None:
+        pass
+
+    def close(self) -> None:
+        """Finish the report; nothing more may be reported afterwards"""
+        if self._stream is not None:
+            self._stream.flush()
+
+
+class TextReporter(Reporter):
+    """Emoji lines for a terminal"""
+
+    PREFIXES = {'error': "❌ ERROR: ", 'warning': "⚠️  WARNING: ", 'success': "✅ "}
+
+    def emit(self, tool: str, level: str, message: str, template: str) -> None:
+        self.stream.write(f"{self.PREFIXES[level]}{message}\n")
+
+
+class CompactReporter(Reporter):
+    """One plain tool: level: message line per finding, for CI logs"""
+
+    def emit(self, tool: str, level: str, message: str, template: str) -> None:
+        self.stream.write(f"{tool}: {level}: {message}\n")
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per finding"""
+
+    def emit(self, tool: str, level: str, message: str, template: str) -> None:
+        file, line = finding_location(message)
+        record = {'tool': tool, 'level': level, 'rule': rule_id(template), 'message': message,
+                  'file': file, 'line': line}
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class SarifReporter(Reporter):
+    """A SARIF 2.1.0 log, one run per tool, written result by result
+
+    Successes have no SARIF representation and are never written.
+    """
+
+    LEVELS = {'error': 'error', 'warning': 'warning'}
+
+    def __init__(self, stream: Optional[TextIO] = None, verbose: bool = False):
+        super().__init__(stream, verbose)
+        self.tool: Optional[str] = None
+        self.rules: Dict[str, int] = {}
+        self.rule_texts: List[str] = []
+        self.results = 0
+        self.started = False
+
+    def _start(self) -> None:
+        if not self.started:
+            self.stream.write(f'{{"$schema": "{SARIF_SCHEMA}", "version": "{SARIF_VERSION}", "runs": [\n')
+            self.started = True
+
+    def _begin_run(self, tool: str) -> None:
+        self._start()
+        if self.tool is not None:
+            self._end_run()
+            self.stream.write(",\n")
+        self.tool = tool
+        self.rules, self.rule_texts, self.results = {}, [], 0
+        self.stream.write('{"results": [\n')
+
+    def _end_run(self) -> None:
+        rules = [{'id': rule, 'shortDescription': {'text': text}}
+                 for rule, text in zip(self.rules, self.rule_texts)]
+        driver = {'name': self.tool, 'rules': rules}
+        self.stream.write(f'\n], "tool": {{"driver": {json.dumps(driver, ensure_ascii=False)}}}}}')
+
+    def emit(self, tool: str, level: str, message: str, template: str) -> None:
+        if level not in self.LEVELS:
+            return
+        if tool != self.tool:
+            self._begin_run(tool)
+        rule = rule_id(template)
+        if rule not in self.rules:
+            self.rules[rule] = len(self.rules)
+            self.rule_texts.append(rule_text(template) or template)
+        result: Dict[str, Any] = {'ruleId': rule, 'ruleIndex': self.rules[rule], 'level': self.LEVELS[level],
+                                  'message': {'text': message}}
+        file, line = finding_location(message)
+        if file is not None:
+            result['locations'] = [{'physicalLocation': {'artifactLocation': {'uri': file},
+                                                         'region': {'startLine': line}}}]
+        self.stream.write(("" if self.results == 0 else ",\n") + json.dumps(result, ensure_ascii=False))
+        self.results += 1
+
+    def close(self) -> None:
+        self._start()
+        if self.tool is not None:
+            self._end_run()
+            self.tool = None
+        self.stream.write("\n]}\n")
+        super().close()
+
+
+def print_finding_summary(errors: Iterable[str], warnings: Iterable[str], verbose: bool = False,
+                          leading: str = "") -> None:
+    """Print the error and warning counts of a validator, listing them again only when verbose"""
+    for findings, emoji, label in ((errors, "❌", "errors"), (warnings, "⚠️ ", "warnings")):
+        if findings:
+            print(f"{leading}{emoji} {len(findings)} {label} found{':' if verbose else ''}")
+            if verbose:
+                for finding in findings:
+                    print(f"   • {finding}")
+
+
+REPORTERS = {
+    'text': TextReporter,
+    'compact': CompactReporter,
+    'jsonl': JsonLinesReporter,
+    'sarif': SarifReporter,
+}
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the report format options on a parser"""
+    parser.add_argument("--format", choices=FORMATS, default='text',
+                        help="how findings are written as they are found (default: text)")
+    parser.add_argument("--output", type=Path, metavar="PATH",
+                        help="write findings to PATH instead of stdout")
+    parser.add_argument("--verbose", action="store_true",
+                        help="also report passing checks and list every finding again in the summary")
+    parser.add_argument("--quiet", action="store_true",
+                        help="write only the findings, without progress messages and summaries")
+
+
+@contextlib.contextmanager
+def reporting(args: argparse.Namespace) -> Iterator[Reporter]:
+    """The reporter chosen on the command line, closed when the block ends
+
+    Progress messages go to stderr when a structured report is written to
+    stdout, and nowhere with --quiet, so the report stays parseable.
+    """
+    with contextlib.ExitStack() as stack:
+        stream = stack.enter_context(open(args.output, 'w', encoding='utf-8')) if args.output else sys.stdout
+        reporter = REPORTERS[args.format](stream, verbose=args.verbose)
+        if args.quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        elif args.format in ('jsonl', 'sarif') and not args.output:
+            stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        try:
+            yield reporter
+        finally:
+            reporter.close()
@@ -0,0 +1,206 @@
+"""
+Route index derived from the router declarations in App.tsx
+===========================================================
+Parses the page imports (static and ``lazy(() => import(...))``) and the
+``<Route path=... element={<Page />}>`` declarations of ``src/App.tsx``,
+resolving every element to its source file. Nested ``<Route>`` children
+are joined onto their parent path. The manifest caches the parsed
+declarations; files are resolved against the disk on every build, since
+pages come and go without App.tsx changing.
+
+``RouteIndex.resolve`` looks plain paths up in a dict and falls back to a
+segment trie for ``:param`` and ``*`` routes, so each lookup costs O(1) or
+O(path depth). The catch-all ``*`` route is kept separate: a link that only
+matches it is not a real page.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from validation.textscan import tag_end
+
+APP_FILE = Path("src") / "App.tsx"
+MODULE_SUFFIXES = ('.tsx', '.ts', '.jsx', '.js')
+
+IMPORT_REGEX = re.compile(r'''^\s*import\s+(\w+)\s+from\s+["']([^"']+)["']''', re.MULTILINE)
+LAZY_IMPORT_REGEX = re.compile(
+    r'''(?:const|let|var)\s+(\w+)\s*=\s*(?:React\.)?lazy\(\s*\(\)\s*=>\s*import\(\s*["']([^"']+)["']\s*\)''')
+ROUTE_TAG_REGEX = re.compile(r'<Route\b|</Route>')
+PATH_ATTR_REGEX = re.compile(r'''\bpath=(?:["']([^"']*)["']|\{\s*["']([^"']*)["']\s*\})''')
+ELEMENT_ATTR_REGEX = re.compile(r'\belement=\{\s*<\s*(\w+)')
+INDEX_ATTR_REGEX = re.compile(r'\bindex\b(?!=\{false\})')
+
+
+def resolve_module(specifier: str, importer: Path, src_root: Path,
+                   aliases: Optional[Dict[str, Path]] = None) -> Optional[Path]:
+    """Map an import specifier to a source file, honouring path aliases (default: @/ for src)"""
+    if aliases is None:
+        aliases = {'@': src_root}
+    base = None
+    if specifier.startswith('.'):
+        base = importer.parent / specifier
+    else:
+        for alias, target in aliases.items():
+            if specifier.startswith(alias + '/'):
+                base = target / specifier[len(alias) + 1:]
+                break
+    if base is None:
+        return None
+
+    candidates = [base] if base.suffix in MODULE_SUFFIXES else []
+    candidates += [base.with_name(base.name + suffix) for suffix in MODULE_SUFFIXES]
+    candidates += [base / f"index{suffix}" for suffix in MODULE_SUFFIXES]
+    for candidate in candidates:
+        if candidate.is_file():
+            return Path(os.path.normpath(candidate))
+    return None
+
+
+def join_route(parent: str, path: str) -> str:
+    if path.startswith('/'):
+        return path
+    if not parent or parent == '/':
+        return '/' + path
+    return parent.rstrip('/') + '/' + path
+
+
+def parse_route_declarations(content: str) -> List[Dict[str, Any]]:
+    """Extract {'path', 'component', 'specifier'} for every <Route> in an App component
+
+    ``specifier`` is the module the element component is imported from, or
+    None when it is not imported.
+    """
+    imports = {}
+    for regex in (IMPORT_REGEX, LAZY_IMPORT_REGEX):
+        for match in regex.finditer(content):
+            imports[match.group(1)] = match.group(2)
+
+    routes = []
+    parents: List[str] = []
+    for match in ROUTE_TAG_REGEX.finditer(content):
+        if match.group(0) == '</Route>':
+            if parents:
+                parents.pop()
+            continue
+
+        end = tag_end(content, match.start())
+        tag = content[match.start():end]
+        # Only look at the tag's own attributes, not at its element's children
+        path_match = PATH_ATTR_REGEX.search(tag)
+        element_match = ELEMENT_ATTR_REGEX.search(tag)
+        parent = parents[-1] if parents else ''
+
+        if path_match:
+            path = join_route(parent, path_match.group(1) if path_match.group(1) is not None
+                              else path_match.group(2))
+        elif INDEX_ATTR_REGEX.search(tag):
+            path = parent or '/'
+        else:
+            path = parent
+
+        component = element_match.group(1) if element_match else None
+        if component:
+            routes.append({'path': path, 'component': component, 'specifier': imports.get(component)})
+
+        if not tag.rstrip().endswith('/>'):
+            parents.append(path)
+
+    return routes
+
+
+def resolve_routes(declarations: List[Dict[str, Any]], app_file: Path, src_root: Path) -> List[Dict[str, Any]]:
+    """{'path', 'component', 'file'} for route declarations, resolving their modules on disk now"""
+    routes = []
+    for route in declarations:
+        resolved = resolve_module(route['specifier'], app_file, src_root) if route['specifier'] else None
+        routes.append({'path': route['path'], 'component': route['component'],
+                       'file': str(resolved) if resolved else None})
+    return routes
+
+
+def parse_routes(content: str, app_file: Path, src_root: Path) -> List[Dict[str, Any]]:
+    """Extract {'path', 'component', 'file'} for every <Route> in an App component"""
+    return resolve_routes(parse_route_declarations(content), app_file, src_root)
+
+
+def normalize_path(path: str) -> str:
+    """Strip query, fragment and trailing slash from an internal link"""
+    path = path.split('?')[0].split('#')[0]
+    if len(path) > 1:
+        path = path.rstrip('/')
+    return path or '/'
+
+
+class RouteIndex:
+    """Exact-path map plus a segment trie for parameterised and wildcard routes"""
+
+    def __init__(self, routes: List[Dict[str, Any]]):
+        self.routes = routes
+        self.exact: Dict[str, Dict[str, Any]] = {}
+        self.catch_all: Optional[Dict[str, Any]] = None
+        self._trie: Dict[str, Any] = {}
+
+        for route in routes:
+            path = route['path']
+            if path in ('*', '/*'):
+                self.catch_all = route
+            elif ':' not in path and '*' not in path:
+                key = normalize_path(path)
+                # A layout route shares its path with its index child; prefer the page
+                if key not in self.exact or self.exact[key]['file'] is None:
+                    self.exact[key] = route
+            else:
+                self._insert(path, route)
+
+    def _insert(self, path: str, route: Dict[str, Any]) -> None:
+        node = self._trie
+        for segment in [part for part in path.split('/') if part]:
+            if segment == '*':
+                node.setdefault('*', route)
+                return
+            key = ':' if segment.startswith(':') else segment
+            node = node.setdefault('children', {}).setdefault(key, {})
+        node.setdefault('route', route)
+
+    def _match(self, node: Dict[str, Any], segments: List[str], i: int) -> Optional[Dict[str, Any]]:
+        if i == len(segments):
+            return node.get('route') or node.get('*')
+        children = node.get('children', {})
+        # Literal segments win over params, params over a splat
+        for key in (segments[i], ':'):
+            child = children.get(key)
+            if child is not None:
+                route = self._match(child, segments, i + 1)
+                if route is not None:
+                    return route
+        return node.get('*')
+
+    def resolve(self, link: str) -> Optional[Dict[str, Any]]:
+        """The route serving an internal link, ignoring the catch-all route"""
+        path = normalize_path(link)
+        route = self.exact.get(path)
+        if route is None and self._trie:
+            route = self._match(self._trie, [part for part in path.split('/') if part], 0)
+        return route
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'routes': self.routes}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RouteIndex':
+        return cls(data['routes'])
+
+
+def build_route_index(corpus, root: Path = Path("."), app_file: Path = APP_FILE) -> RouteIndex:
+    """Parse App.tsx through the corpus once and resolve its routes to the files on disk now
+
+    Only the declarations are cached in the manifest: a page file can be
+    added or renamed without App.tsx changing, so the files are resolved on
+    every call.
+    """
+    source = corpus.get(root / app_file)
+    declarations = source.artifact('route_declarations', lambda source: parse_route_declarations(source.text),
+                                   persist=True)
+    return RouteIndex(resolve_routes(declarations, source.path, root / 'src'))
@@ -0,0 +1,224 @@
+"""
+Sandboxed execution of documentation snippets
+=============================================
+Runs ``from blazemetrics ...`` snippets against the stub backend in
+``validation/stubs``. Workers are forked up front and import the stub
+before the first task, so a snippet costs a pipe round trip rather than
+an interpreter start. Each worker runs under an address-space limit. A
+snippet that exceeds its timeout gets its worker killed and replaced.
+
+Workers are reused, so nothing a snippet does may reach the next one: each
+snippet runs in a fresh scratch directory that is deleted afterwards, and
+once it has finished the worker drops every module imported since
+warm-up, re-imports the stub (undoing monkeypatches and module globals)
+and restores ``sys.path``. The stub client accepts the config parameters
+of the sandbox's ``api``, the backend index when validate-content has one.
+
+Results are plain dicts:
+``{'status': 'ok' | 'error' | 'skipped' | 'timeout', 'error': str, 'stdout': str}``.
+A snippet is "skipped" when it needs a third-party module that is not
+installed, since that says nothing about our documentation.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Set
+
+from validation.apiindex import BUILTIN_API, ApiIndex
+from validation.stubs import STUB_PATH, set_stub_api
+
+STUB_MODULES = (
+    'blazemetrics',
+    'blazemetrics.llm_judge',
+    'blazemetrics.agent_eval',
+    'blazemetrics.code_evaluator',
+    'blazemetrics.factuality_evaluator',
+)
+MAX_STDOUT = 4096
+
+
+def _limit_resources(memory_mb: int) -> None:
+    """Cap the worker's address space; silently skipped where unsupported"""
+    try:
+        import resource
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def execute_snippet(code: str) -> Dict[str, Any]:
+    """Execute one snippet in a fresh namespace, capturing its output"""
+    stdout = io.StringIO()
+    result = {'status': 'ok', 'error': None, 'stdout': ''}
+    try:
+        compiled = compile(code, '<snippet>', 'exec')
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stdout):
+            exec(compiled, {'__name__': '__snippet__'})
+    except ModuleNotFoundError as e:
+        if e.name and e.name.split('.')[0] != 'blazemetrics':
+            result['status'] = 'skipped'
+        else:
+            result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    except MemoryError:
+        result['status'] = 'error'
+        result['error'] = "MemoryError: snippet exceeded the sandbox memory limit"
+    except BaseException as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['stdout'] = stdout.getvalue()[:MAX_STDOUT]
+    return result
+
+
+def _reset_interpreter(baseline_modules: Set[str], baseline_path: List[str]) -> None:
+    """Undo what a snippet did to the worker: new modules, stub state and sys.path"""
+    for name in list(sys.modules):
+        if name not in baseline_modules or name.split('.')[0] == 'blazemetrics':
+            del sys.modules[name]
+    sys.path[:] = baseline_path
+    for module in STUB_MODULES:
+        __import__(module)
+
+
+def _worker_main(conn, memory_mb: int, scratch_root: str, api: ApiIndex) -> None:
+    """Worker loop: warm up the stub, then execute snippets until told to stop"""
+    set_stub_api(api)
+    sys.path.insert(0, str(STUB_PATH))
+    for module in STUB_MODULES:
+        __import__(module)
+    baseline_modules, baseline_path = set(sys.modules), list(sys.path)
+    _limit_resources(memory_mb)
+
+    while True:
+        try:
+            code = conn.recv()
+        except EOFError:
+            break
+        if code is None:
+            break
+        scratch = tempfile.mkdtemp(dir=scratch_root)
+        os.chdir(scratch)
+        conn.send(execute_snippet(code))
+        # Clean up while the parent handles the result
+        os.chdir(scratch_root)
+        shutil.rmtree(scratch, ignore_errors=True)
+        _reset_interpreter(baseline_modules, baseline_path)
+
+
+class _Worker:
+    def __init__(self, context, memory_mb: int, api: ApiIndex):
+        self.conn, child_conn = context.Pipe()
+        # Owned by the parent, so it is removed even when the worker is killed
+        self.scratch = tempfile.mkdtemp(prefix='blazemetrics-snippet-')
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_mb, self.scratch, api),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task: Optional[int] = None
+        self.deadline = 0.0
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+
+class SnippetSandbox:
+    """Pool of pre-forked, pre-warmed workers that execute snippets"""
+
+    def __init__(self, workers: int = 4, timeout: float = 5.0, memory_mb: int = 512,
+                 api: ApiIndex = BUILTIN_API):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.api = api
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        self._pool: List[_Worker] = []
+
+    def __enter__(self) -> 'SnippetSandbox':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def use_api(self, api: ApiIndex) -> None:
+        """Check the stub client's config keywords against api, restarting running workers"""
+        if api is not self.api:
+            self.api = api
+            self.close()
+
+    def start(self) -> None:
+        while len(self._pool) < self.workers:
+            self._pool.append(_Worker(self._context, self.memory_mb, self.api))
+
+    def close(self) -> None:
+        for worker in self._pool:
+            worker.stop()
+        self._pool = []
+
+    def run_all(self, snippets: List[str]) -> List[Dict[str, Any]]:
+        """Execute snippets on the pool; results are returned in input order"""
+        self.start()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(snippets)
+        next_task = 0
+        busy: Dict[Any, _Worker] = {}
+
+        while next_task < len(snippets) or busy:
+            # Hand out work to idle workers
+            for worker in self._pool:
+                if worker.task is None and next_task < len(snippets):
+                    worker.task = next_task
+                    worker.deadline = time.monotonic() + self.timeout
+                    worker.conn.send(snippets[next_task])
+                    busy[worker.conn] = worker
+                    next_task += 1
+
+            soonest = min(worker.deadline for worker in busy.values())
+            ready = wait(list(busy), timeout=max(0.0, soonest - time.monotonic()))
+
+            for conn in ready:
+                worker = busy.pop(conn)
+                try:
+                    results[worker.task] = conn.recv()
+                except (EOFError, OSError):
+                    # The worker died, most likely from the memory limit
+                    results[worker.task] = {'status': 'error', 'stdout': '',
+                                            'error': "worker crashed (memory limit exceeded?)"}
+                    self._replace(worker)
+                    continue
+                worker.task = None
+
+            now = time.monotonic()
+            for conn, worker in list(busy.items()):
+                if worker.deadline <= now:
+                    del busy[conn]
+                    results[worker.task] = {'status': 'timeout', 'stdout': '',
+                                            'error': f"timed out after {self.timeout:g}s"}
+                    self._replace(worker)
+
+        return results
+
+    def _replace(self, worker: _Worker) -> None:
+        """Kill a stuck or dead worker and fork a fresh one in its place"""
+        worker.kill()
+        self._pool[self._pool.index(worker)] = _Worker(self._context, self.memory_mb, self.api)
@@ -0,0 +1,24 @@
+"""
+Loading the hyphenated validation scripts
+=========================================
+validate-links.py, validate-content.py and test-ux.py are not importable by
+name, so combined runners and benchmarks load them from their file path.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_script(filename: str):
+    """Import one of the hyphenated validation scripts as a module"""
+    name = filename.replace('-', '_').rsplit('.', 1)[0]
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, ROOT / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,196 @@
+"""
+Documentation code snippet analysis
+===================================
+Each snippet is parsed once and walked once by ``SnippetVisitor``, which
+reports unknown imports, unknown client methods and unknown config
+parameters together, looking each up in the ``ApiIndex`` of the backend
+(see ``validation.apiindex``). For a given index results depend only on the
+snippet text, so ``SnippetAnalyzer`` caches them by content hash and
+identical snippets repeated across pages are analyzed a single time.
+
+Findings are stored as ``(level, label, detail)`` triples without a source
+location; the caller formats them as ``"{label} in {source}: {detail}"``.
+
+``collect_code_findings`` runs extraction and analysis for a whole file.
+``pool_code_findings`` is its process pool variant: it only takes plain
+arguments, checks the code blocks of files the parent has already scanned
+without lexing them again, and sends the scan items it lexes back to the
+parent. ``set_worker_api`` gives the pool workers the parent's index.
+"""
+
+import ast
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from validation.apiindex import BUILTIN_API, PACKAGE, ApiIndex
+from validation.textscan import LineIndex, iter_code_block_matches, scan_source
+
+METRIC_VALUE_REGEX = re.compile(r':\s*(\d+\.\d+)')
+
+Finding = Tuple[str, str, str]
+
+# Blocks shorter than this (after stripping) are not worth validating
+MIN_SNIPPET_LENGTH = 10
+
+
+class SnippetVisitor(ast.NodeVisitor):
+    """Single-pass visitor emitting import and API usage findings"""
+
+    def __init__(self, mentions_client: bool, api: ApiIndex = BUILTIN_API):
+        self.mentions_client = mentions_client
+        self.api = api
+        self.import_findings: List[Finding] = []
+        self.api_findings: List[Finding] = []
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module
+        if module and module.startswith(PACKAGE):
+            exports = self.api.exports(module)
+            if exports is None:
+                self.import_findings.append(('warning', 'Unknown module import', module))
+            else:
+                for alias in node.names:
+                    if alias.name not in exports:
+                        self.import_findings.append(
+                            ('warning', 'Unknown import', f"{alias.name} from {module}"))
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == 'client':
+            if func.attr not in self.api.client_methods:
+                self.api_findings.append(('warning', 'Unknown client method', func.attr))
+        self.generic_visit(node)
+
+    def visit_keyword(self, node: ast.keyword) -> None:
+        # Only meaningful for snippets that construct a BlazeMetricsClient
+        if node.arg and self.mentions_client and not self.api.is_config_param(node.arg):
+            self.api_findings.append(('warning', 'Unknown config parameter', node.arg))
+        self.generic_visit(node)
+
+
+def check_expected_outputs(code: str) -> List[Finding]:
+    """Flag metric values above 1.0 in example outputs"""
+    if 'rouge1_f1:' in code or 'bleu:' in code:
+        for num_str in METRIC_VALUE_REGEX.findall(code):
+            num = float(num_str)
+            if num > 1.0:
+                return [('error', 'Metric value > 1.0', str(num))]
+    return []
+
+
+def analyze_snippet(code: str, api: ApiIndex = BUILTIN_API) -> Dict[str, Any]:
+    """Parse a snippet once and collect every finding for it against an API index"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return {'ok': False, 'parsed': False, 'findings': [('error', 'Syntax error', str(e))]}
+
+    visitor = SnippetVisitor(mentions_client='BlazeMetricsClient' in code, api=api)
+    visitor.visit(tree)
+    output_findings = check_expected_outputs(code)
+    return {
+        'ok': not output_findings,
+        'parsed': True,
+        'findings': visitor.import_findings + visitor.api_findings + output_findings,
+    }
+
+
+def snippet_key(code: str) -> str:
+    return hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class SnippetAnalyzer:
+    """Memoizes analyze_snippet results against one API index by snippet hash"""
+
+    def __init__(self, api: ApiIndex = BUILTIN_API):
+        self.api = api
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+
+    def analyze(self, code: str) -> Dict[str, Any]:
+        key = snippet_key(code)
+        result = self.results.get(key)
+        if result is None:
+            result = self.results[key] = analyze_snippet(code, self.api)
+        else:
+            self.hits += 1
+        return result
+
+
+# Per-process analyzer used by pool workers
+_worker_analyzer = SnippetAnalyzer()
+
+
+def set_worker_api(api: ApiIndex) -> None:
+    """Pool initializer: analyze this worker's snippets against the parent's API index"""
+    global _worker_analyzer
+    _worker_analyzer = SnippetAnalyzer(api)
+
+
+def scan_code_blocks(text: str, file: str, items: Optional[List[Tuple[str, str, int]]] = None
+                     ) -> List[Dict[str, Any]]:
+    """Extract embedded Python code blocks from a TypeScript/React source, or from its scan items"""
+    line_index = LineIndex(text)
+    code_blocks = []
+    for code, offset in iter_code_block_matches(text, items):
+        # Clean up the code
+        code = code.replace('\\n', '\n').replace('\\"', '"')
+        code_blocks.append({
+            'code': code,
+            'file': file,
+            'line': line_index.line_of(offset)
+        })
+    return code_blocks
+
+
+def check_code_blocks(code_blocks: List[Dict[str, Any]], analyzer: Optional[SnippetAnalyzer] = None
+                      ) -> Dict[str, Any]:
+    """Validate already extracted code blocks
+
+    Returns ``{'ok': bool, 'findings': [(level, message), ...]}`` with the
+    messages already formatted against their file and line.
+    """
+    analyzer = analyzer or _worker_analyzer
+    ok = True
+    findings = []
+    for block in code_blocks:
+        code = block['code']
+        if len(code.strip()) < MIN_SNIPPET_LENGTH:
+            continue
+        source = f"{block['file']}:{block['line']}"
+        result = analyzer.analyze(code)
+        for level, label, detail in result['findings']:
+            findings.append((level, f"{label} in {source}: {detail}"))
+        ok = ok and result['ok']
+    return {'ok': ok, 'findings': findings}
+
+
+def collect_code_findings(text: str, file: str, analyzer: Optional[SnippetAnalyzer] = None,
+                          items: Optional[List[Tuple[str, str, int]]] = None) -> Dict[str, Any]:
+    """Extract and validate all code blocks of one file, as check_code_blocks reports them"""
+    try:
+        code_blocks = scan_code_blocks(text, file, items)
+    except Exception as e:
+        return {'ok': True, 'findings': [('error', f"Failed to extract code from {file}: {e}")]}
+    return check_code_blocks(code_blocks, analyzer)
+
+
+def pool_code_findings(file: str, text: Optional[str] = None,
+                       code_blocks: Optional[List[Dict[str, Any]]] = None
+                       ) -> Tuple[Dict[str, Any], Optional[List[Tuple[str, str, int]]]]:
+    """Process pool task: the findings of one file and the scan items lexed for them
+
+    Files the parent has already scanned are sent as their code blocks and
+    are not lexed again. Otherwise the text is lexed here and its scan items
+    are returned, so the parent's other checks need not lex it either.
+    """
+    if code_blocks is not None:
+        return check_code_blocks(code_blocks), None
+    try:
+        items = scan_source(text)
+    except Exception:
+        # collect_code_findings reports the failure
+        items = None
+    return collect_code_findings(text, file, items=items), items
@@ -0,0 +1,28 @@
+"""
+Stub backend packages for sandboxed snippet execution
+=====================================================
+This directory is put at the front of ``sys.path`` inside sandbox workers so
+that ``import blazemetrics`` resolves to the stub API instead of the real
+backend.
+
+The stub client checks its constructor keywords against ``api``, the
+built-in API by default. ``set_stub_api`` gives a sandbox worker the API
+indexed from the backend, as ``set_worker_api`` does for the analysis pool,
+so executed and statically checked snippets agree. It lives here rather
+than in the stub package because workers re-import the stub after every
+snippet.
+"""
+
+from pathlib import Path
+
+from validation.apiindex import BUILTIN_API, ApiIndex
+
+STUB_PATH = Path(__file__).resolve().parent
+
+api: ApiIndex = BUILTIN_API
+
+
+def set_stub_api(index: ApiIndex) -> None:
+    """Check the stub client's constructor keywords against index in this process"""
+    global api
+    api = index
@@ -0,0 +1,94 @@
+"""
+Stub of the public blazemetrics API
+===================================
+Mirrors the documented surface of ``BlazeMetricsClient`` closely enough to
+run documentation snippets: constructor keywords are checked against the
+config parameters of the API the sandbox was given (``validation.stubs.api``),
+the known client methods return plausible data and anything else raises
+AttributeError/TypeError like the real client.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from validation import stubs
+
+DEFAULT_METRICS = ['rouge1_f1', 'rouge2_f1', 'rougeL_f1', 'bleu', 'chrf', 'meteor', 'wer']
+
+
+def _score(*parts: Any) -> float:
+    """Deterministic pseudo score in [0, 1]"""
+    return round((sum(len(str(part)) for part in parts) % 97) / 100 + 0.02, 3)
+
+
+class BlazeMetricsClient:
+    def __init__(self, **kwargs: Any):
+        unknown = sorted(name for name in kwargs if not stubs.api.is_config_param(name))
+        if unknown:
+            raise TypeError(f"BlazeMetricsClient() got unexpected keyword argument(s): {', '.join(unknown)}")
+        self.config = dict(kwargs)
+        self._analytics: List[Dict[str, float]] = []
+        self._factuality_scorer = None
+
+    def _metric_names(self) -> List[str]:
+        include = self.config.get('metrics_include')
+        if not include:
+            return list(DEFAULT_METRICS)
+        return [name if name in DEFAULT_METRICS else f"{name}_f1" if name.startswith('rouge') else name
+                for name in include]
+
+    def compute_metrics(self, candidates: List[str], references: List[List[str]],
+                        **kwargs: Any) -> Dict[str, List[float]]:
+        if len(candidates) != len(references):
+            raise ValueError("candidates and references must have the same length")
+        return {name: [_score(name, candidate) for candidate in candidates]
+                for name in self._metric_names()}
+
+    def aggregate_metrics(self, metrics: Dict[str, List[float]],
+                          weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        return {name: round(sum(values) / len(values), 3) if values else 0.0
+                for name, values in metrics.items()}
+
+    def check_safety(self, texts: List[str]) -> List[Dict[str, Any]]:
+        blocklist = [word.lower() for word in self.config.get('blocklist', [])]
+        results = []
+        for text in texts:
+            blocked = any(word in str(text).lower() for word in blocklist)
+            results.append({
+                'original': text,
+                'blocked': blocked,
+                'redacted': text,
+                'final_output': '' if blocked else text,
+                'safety_score': 0.0 if blocked else 1.0,
+            })
+        return results
+
+    def add_metrics(self, metrics: Dict[str, float]) -> None:
+        self._analytics.append(dict(metrics))
+
+    def get_analytics_summary(self) -> Dict[str, Any]:
+        return {'window': len(self._analytics), 'alerts': [], 'trends': {}}
+
+    def evaluate_agent(self, *args: Any, **kwargs: Any) -> Dict[str, float]:
+        return {'goal_completion': 0.9, 'tool_efficiency': 0.85, 'safety_compliance': 1.0}
+
+    def evaluate_code(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return {'correctness': 0.9, 'security_issues': [], 'style_score': 0.8}
+
+    def set_factuality_scorer(self, scorer: Any) -> None:
+        if not callable(scorer):
+            raise TypeError("factuality scorer must be callable")
+        self._factuality_scorer = scorer
+
+    def evaluate_factuality(self, outputs: List[str], references: Optional[List[str]] = None,
+                            **kwargs: Any) -> List[Dict[str, Any]]:
+        if self._factuality_scorer is None:
+            raise RuntimeError("call set_factuality_scorer() before evaluate_factuality()")
+        references = references or [None] * len(outputs)
+        return [self._factuality_scorer(output, reference)
+                for output, reference in zip(outputs, references)]
+
+    def generate_model_card(self, *args: Any, **kwargs: Any) -> str:
+        return "# Model Card\n"
+
+    def generate_data_card(self, *args: Any, **kwargs: Any) -> str:
+        return "# Data Card\n"
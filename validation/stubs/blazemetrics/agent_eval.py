@@ -0,0 +1,11 @@
+"""Stub of blazemetrics.agent_eval"""
+
+from typing import Any, Dict
+
+
+class AgentEvaluator:
+    def __init__(self, *args: Any, **kwargs: Any):
+        self.options = kwargs
+
+    def evaluate(self, *args: Any, **kwargs: Any) -> Dict[str, float]:
+        return {'goal_completion': 0.9, 'tool_efficiency': 0.85, 'safety_compliance': 1.0}
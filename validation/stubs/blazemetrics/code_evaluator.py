@@ -0,0 +1,11 @@
+"""Stub of blazemetrics.code_evaluator"""
+
+from typing import Any, Dict
+
+
+class CodeEvaluator:
+    def __init__(self, *args: Any, **kwargs: Any):
+        self.options = kwargs
+
+    def evaluate(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return {'correctness': 0.9, 'security_issues': [], 'style_score': 0.8}
@@ -0,0 +1,11 @@
+"""Stub of blazemetrics.factuality_evaluator"""
+
+from typing import Any, Dict
+
+
+class FactualityEvaluator:
+    def __init__(self, *args: Any, **kwargs: Any):
+        self.options = kwargs
+
+    def evaluate(self, *args: Any, **kwargs: Any) -> Dict[str, float]:
+        return {'factuality': 0.9, 'hallucination': 0.05}
@@ -0,0 +1,15 @@
+"""Stub of blazemetrics.llm_judge"""
+
+from typing import Any, Dict, List, Optional
+
+
+class LLMJudge:
+    def __init__(self, provider: str = "openai", api_key: Optional[str] = None,
+                 model: Optional[str] = None, **kwargs: Any):
+        self.provider = provider
+        self.model = model
+
+    def score(self, outputs: List[str], references: Optional[List[str]] = None,
+              **kwargs: Any) -> List[Dict[str, Any]]:
+        return [{'score': 0.8, 'faithfulness': 0.85, 'hallucination': 0.1, 'explanation': 'stub'}
+                for _ in outputs]
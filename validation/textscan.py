@@ -0,0 +1,159 @@
+"""
+Single-pass text scanning helpers
+=================================
+``LineIndex`` maps character offsets to 1-based line numbers by bisecting a
+precomputed table of newline offsets, so resolving the line of every match
+in a file is O(log n) each instead of rescanning the prefix.
+
+``scan_source`` turns the tokens of one ``validation.lexer`` pass into
+everything the validators extract from a file: link candidates, the
+fragment targets a page renders (element ids, headings, SectionIndicator)
+and embedded Python code blocks. Since the lexer knows whether text is a JSX
+attribute, a string, a template literal, a comment or JSX text, URLs quoted
+inside code samples and comments are no longer taken for links.
+"""
+
+import html
+import re
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+from validation.lexer import tokenize
+
+# JSX attributes whose string values are links
+LINK_ATTRIBUTES = ('href', 'to', 'src')
+URL_PREFIXES = ('http://', 'https://')
+# String and template literals holding a Python sample are code blocks, not link sources
+CODE_BLOCK_MARKER = 'from blazemetrics'
+CODE_BLOCK_OWNERS = ('const', 'code')
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Links in markdown-like content
+MARKDOWN_LINK_REGEX = re.compile(r'\[[^\]\n]*\]\(([^)\s]+)\)')
+# A JSX expression container holding nothing but one literal: id={"x"}, href={`/docs`}
+STATIC_EXPRESSION_REGEX = re.compile(r'''\s*(["'`])([^"'`$]*)\1\s*''')
+
+NON_PAGE_LINK_PREFIXES = ('javascript:', 'mailto:', 'tel:')
+
+
+class LineIndex:
+    """Offset to line number lookup backed by a sorted list of line starts"""
+
+    def __init__(self, content: str):
+        starts = [0]
+        find = content.find
+        pos = find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        self.line_starts = starts
+
+    def line_of(self, offset: int) -> int:
+        """Return the 1-based line containing the character at offset"""
+        return bisect_right(self.line_starts, offset)
+
+    def __len__(self) -> int:
+        return len(self.line_starts)
+
+
+def tag_end(content: str, start: int) -> int:
+    """Offset just past the '>' closing the JSX tag opened at start, skipping {...}"""
+    depth = 0
+    i = start
+    while i < len(content):
+        char = content[i]
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        elif char == '>' and depth == 0:
+            return i + 1
+        i += 1
+    return len(content)
+
+
+def scan_source(content: str) -> List[Tuple[str, str, int]]:
+    """(kind, value, offset) of every link, anchor target and code block, from one lexer pass
+
+    Kinds are 'link', 'fragment' (an in-page #link), 'id', 'dynamic_id',
+    'heading', 'section_indicator' and 'code_block'.
+    """
+    items = []
+    # Kinds of the two previous tokens, for plain-text headings: <h2>...>Text</h2>
+    previous = before_previous = None
+    previous_value, previous_offset = '', 0
+
+    def add_link(url: str, offset: int) -> None:
+        if not url or url.startswith(NON_PAGE_LINK_PREFIXES):
+            return
+        if url.startswith('#'):
+            items.append(('fragment', url[1:], offset))
+        else:
+            items.append(('link', url, offset))
+
+    for kind, value, offset, attribute in tokenize(content):
+        if kind == 'attribute':
+            if attribute == 'id':
+                items.append(('id', value, offset))
+            elif attribute in LINK_ATTRIBUTES or value.startswith(URL_PREFIXES):
+                add_link(value, offset)
+        elif kind in ('string', 'template', 'dynamic_template'):
+            if CODE_BLOCK_MARKER in value:
+                # A Python sample: checked as code when it is a named constant or a code={...} prop,
+                # never mined for links
+                if attribute in CODE_BLOCK_OWNERS:
+                    items.append(('code_block', value, offset))
+            elif kind == 'dynamic_template':
+                # Substitutions make any URL in it unknowable statically
+                pass
+            elif value.startswith(URL_PREFIXES):
+                add_link(value, offset)
+            else:
+                for match in MARKDOWN_LINK_REGEX.finditer(value):
+                    add_link(match.group(1), offset + 1 + match.start())
+        elif kind == 'expression' and attribute is not None:
+            literal = STATIC_EXPRESSION_REGEX.fullmatch(value)
+            if attribute == 'id':
+                items.append(('id', literal.group(2), offset) if literal else ('dynamic_id', value, offset))
+            elif attribute in LINK_ATTRIBUTES and literal and not literal.group(2).startswith(URL_PREFIXES):
+                # Literal URLs were already taken from the string token inside the container
+                add_link(literal.group(2), offset)
+        elif kind == 'text':
+            for match in MARKDOWN_LINK_REGEX.finditer(value):
+                add_link(match.group(1), offset + match.start())
+        elif kind == 'tag' and value == 'SectionIndicator':
+            items.append(('section_indicator', value, offset))
+        elif kind == 'close_tag' and value in HEADING_TAGS and previous == 'text' \
+                and before_previous in ('tag', 'close_tag'):
+            items.append(('heading', previous_value, previous_offset))
+
+        before_previous, previous = previous, kind
+        previous_value, previous_offset = value, offset
+    return items
+
+
+def iter_code_block_matches(content: str, items: Optional[List[Tuple[str, str, int]]] = None
+                            ) -> Iterator[Tuple[str, int]]:
+    """Yield (code, offset) for every embedded Python code block, from items if already scanned"""
+    for kind, value, offset in (scan_source(content) if items is None else items):
+        if kind == 'code_block':
+            yield value, offset
+
+
+def iter_page_matches(content: str, items: Optional[List[Tuple[str, str, int]]] = None
+                      ) -> Iterator[Tuple[str, str, int]]:
+    """Yield (kind, value, offset) for links and anchor targets, from items if already scanned
+
+    Kinds are 'link', 'fragment' (an in-page #link), 'id', 'dynamic_id',
+    'heading' and 'section_indicator'.
+    """
+    for item in (scan_source(content) if items is None else items):
+        if item[0] != 'code_block':
+            yield item
+
+
+def heading_slug(text: str) -> str:
+    """The id SectionIndicator gives a heading: its text lowercased, whitespace runs as '-'"""
+    # JSX drops the line breaks and indentation around text, like textContent would see it
+    text = ' '.join(line.strip() for line in html.unescape(text).splitlines() if line.strip())
+    return re.sub(r'\s+', '-', text.lower())
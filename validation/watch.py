@@ -0,0 +1,358 @@
+"""
+Watch mode: revalidate saved files against warm in-memory state
+================================================================
+``create_watcher`` reports changed source files. On Linux it uses inotify
+through ctypes; elsewhere, or when inotify is unavailable, it polls file
+stats. Editors often save by writing a temporary file and renaming it, so
+events are collected until the tree has been quiet for ``DEBOUNCE_S``.
+
+``WatchSession`` keeps the corpus, the page scans, the route and anchor
+indexes, the snippet AST cache and the external link results of a
+validate-all run in memory. When a file changes, only that file and the
+files whose internal links resolve to a route rendering it are
+revalidated. The session prints the findings that appeared and the ones
+that were resolved, rather than the full report. A change to App.tsx
+re-resolves every internal link. The route index is only rebuilt when
+App.tsx changes or a file is created or deleted; an edit of an existing
+file updates the anchor index for that file alone.
+
+Findings are compared without their line numbers, so editing above a
+finding does not report it as resolved and new again.
+"""
+
+import contextlib
+import ctypes
+import ctypes.util
+import io
+import os
+import re
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from validation.records import FindingLog
+from validation.report import Reporter
+from validation.routes import APP_FILE, build_route_index, normalize_path
+
+# Quiet period that ends a burst of change events
+DEBOUNCE_S = 0.02
+DEFAULT_POLL_INTERVAL = 0.25
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+LINE_NUMBER_REGEX = re.compile(r':\d+(?=[:\s]|$)')
+
+Finding = Tuple[str, str]
+
+
+class InotifyWatcher:
+    """Recursive inotify watch of directories, reporting changed files with one of the suffixes"""
+
+    def __init__(self, directories: Iterable[Path], suffixes: Tuple[str, ...]):
+        self.suffixes = suffixes
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories: Dict[int, Path] = {}
+        self.overflowed = False
+        for directory in directories:
+            self._watch_tree(Path(directory))
+
+    def _watch_tree(self, root: Path) -> None:
+        for dirpath, dirnames, _ in os.walk(root):
+            self._watch(Path(dirpath))
+
+    def _watch(self, directory: Path) -> None:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.directories[wd] = directory
+
+    def _read(self, changed: Set[Path]) -> None:
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            directory = self.directories.get(wd)
+            if directory is None or mask & IN_IGNORED:
+                self.directories.pop(wd, None)
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_tree(path)
+                    changed.update(p for p in path.rglob('*') if p.name.endswith(self.suffixes))
+            elif path.name.endswith(self.suffixes):
+                changed.add(path)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until files change, then return them once events have been quiet for DEBOUNCE_S"""
+        changed: Set[Path] = set()
+        if select.select([self.fd], [], [], timeout)[0]:
+            self._read(changed)
+            while select.select([self.fd], [], [], DEBOUNCE_S)[0]:
+                self._read(changed)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher comparing size and mtime of every matching file on each poll"""
+
+    def __init__(self, directories: Iterable[Path], suffixes: Tuple[str, ...],
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        self.directories = [Path(directory) for directory in directories]
+        self.suffixes = suffixes
+        self.interval = interval
+        self.overflowed = False
+        self.stats = self._snapshot()
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        stats = {}
+        for root in self.directories:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    if filename.endswith(self.suffixes):
+                        path = Path(dirpath) / filename
+                        try:
+                            stat = path.stat()
+                        except OSError:
+                            continue
+                        stats[path] = (stat.st_size, stat.st_mtime_ns)
+        return stats
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            stats = self._snapshot()
+            changed = {path for path in stats.keys() | self.stats.keys() if stats.get(path) != self.stats.get(path)}
+            self.stats = stats
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+def create_watcher(directories: Iterable[Path], suffixes: Tuple[str, ...], poll: bool = False):
+    """An InotifyWatcher where supported, otherwise a PollingWatcher"""
+    directories = list(directories)
+    if not poll:
+        try:
+            return InotifyWatcher(directories, suffixes)
+        except (OSError, AttributeError):
+            # Not Linux, no libc symbol or out of watches
+            pass
+    return PollingWatcher(directories, suffixes)
+
+
+def finding_key(finding: Finding) -> Finding:
+    """A finding without line numbers, so moving it does not count as a change"""
+    return finding[0], LINE_NUMBER_REGEX.sub('', finding[1])
+
+
+class WatchSession:
+    """Per-file findings of the link and content validators, kept current as files change"""
+
+    def __init__(self, corpus, links_validator, content_validator, root: Path = Path(".")):
+        self.corpus = corpus
+        self.links = links_validator
+        self.content = content_validator
+        self.root = root
+        self.checker = links_validator.build_checker()
+        self.route_index = None
+        self.findings: Dict[Path, Set[Finding]] = {}
+        # Route path -> files with an internal link resolving to it
+        self.linkers: Dict[str, Set[Path]] = {}
+        self.linked_routes: Dict[Path, Set[str]] = {}
+
+    def close(self) -> None:
+        self.checker.close()
+
+    def _indexes(self):
+        if self.route_index is None:
+            self.route_index = build_route_index(self.corpus, self.root)
+            self.links.anchor_index = None
+        return self.route_index, self.links.build_anchor_index(self.route_index.routes)
+
+    @contextlib.contextmanager
+    def _captured(self):
+        """Collect what the link validator logs, keeping its own logs and stdout untouched"""
+        errors, warnings, reporter = self.links.errors, self.links.warnings, self.links.reporter
+        self.links.errors, self.links.warnings, self.links.reporter = FindingLog(), FindingLog(), Reporter()
+        captured: List[Finding] = []
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                yield captured
+        finally:
+            captured.extend(('error', message) for message in self.links.errors)
+            captured.extend(('warning', message) for message in self.links.warnings)
+            self.links.errors, self.links.warnings, self.links.reporter = errors, warnings, reporter
+
+    def _check_external(self, urls: List[str]) -> None:
+        """Check the URLs that have no result yet from the initial run or an earlier save"""
+        new = [url for url in urls if url not in self.links.external_results]
+        if new:
+            for result in self.checker.check_all(new):
+                self.links.external_results[result['url']] = result
+
+    def file_findings(self, source) -> Set[Finding]:
+        """Link and code example findings of one file, using the warm indexes and caches"""
+        route_index, anchor_index = self._indexes()
+        findings: List[Finding] = []
+        with self._captured() as captured:
+            links = self.links.extract_links_from_file(source.path)
+            self.links.check_common_issues(links)
+            external, routes = [], set()
+            for link in links:
+                url = link.url
+                if url.startswith(('http://', 'https://')):
+                    external.append(url)
+                elif url.startswith('/') or not url.startswith(('http', 'mailto', 'tel')):
+                    self.links.check_internal_link(url, route_index, anchor_index)
+                    route = route_index.resolve(normalize_path(url))
+                    if route is not None:
+                        routes.add(route['path'])
+            self.links.validate_in_page_fragments([source])
+            self._check_external(external)
+            for url in dict.fromkeys(external):
+                self.links.report_external_result(self.links.external_results[url])
+        findings.extend(captured)
+        self._set_linked_routes(source.path, routes)
+
+        if source.suffix == '.tsx' and self.content.is_doc_file(source.path):
+            result = source.artifact(self.content.findings_artifact, self.content._collect_code_findings,
+                                     persist=True)
+            # Findings read back from the manifest are JSON lists
+            findings.extend(tuple(finding) for finding in result['findings'])
+        return set(findings)
+
+    def _set_linked_routes(self, path: Path, routes: Set[str]) -> None:
+        for route in self.linked_routes.get(path, ()):
+            self.linkers.get(route, set()).discard(path)
+        self.linked_routes[path] = routes
+        for route in routes:
+            self.linkers.setdefault(route, set()).add(path)
+
+    def start(self) -> Tuple[int, int]:
+        """Validate every file once; returns the error and warning counts"""
+        for source in self.corpus.files(('.tsx', '.ts')):
+            self.findings[source.path] = self.file_findings(source)
+        return self.counts()
+
+    def counts(self) -> Tuple[int, int]:
+        levels = [level for findings in self.findings.values() for level, _ in findings]
+        return levels.count('error'), levels.count('warning')
+
+    def affected_files(self, changed: Set[Path]) -> Set[Path]:
+        """The changed files plus the files linking to a route whose page renders one of them"""
+        if self.root / APP_FILE in changed:
+            return set(self.findings) | changed
+        _, anchor_index = self._indexes()
+        affected = set(changed)
+        for path in changed:
+            for route in anchor_index.routes_of_module(path):
+                affected.update(self.linkers.get(route, ()))
+            for route in self.route_index.routes:
+                if route['file'] is not None and Path(route['file']) == path:
+                    affected.update(self.linkers.get(route['path'], ()))
+        return affected
+
+    def update(self, changed: Set[Path]) -> Dict[Path, Tuple[List[Finding], List[Finding]]]:
+        """Revalidate after changes; (new, resolved) findings per file that has any"""
+        for path in changed:
+            self.corpus.refresh(path)
+        structural = self.root / APP_FILE in changed or any(
+            path.is_file() != (path in self.findings) for path in changed)
+        if structural:
+            # Route declarations, or the files imports resolve to, changed
+            self.route_index = None
+        elif self.links.anchor_index is not None:
+            for path in changed:
+                self.links.anchor_index.update_module(path)
+        affected = self.affected_files(changed)
+        self._indexes()
+
+        diffs = {}
+        for path in sorted(affected):
+            source = self.corpus.get(path) if path.is_file() else None
+            before = self.findings.pop(path, set())
+            after = self.file_findings(source) if source is not None else set()
+            if source is not None:
+                self.findings[path] = after
+            else:
+                self._set_linked_routes(path, set())
+            old_keys = {finding_key(finding) for finding in before}
+            new_keys = {finding_key(finding) for finding in after}
+            new = sorted(finding for finding in after if finding_key(finding) not in old_keys)
+            resolved = sorted(finding for finding in before if finding_key(finding) not in new_keys)
+            if new or resolved:
+                diffs[path] = (new, resolved)
+        return diffs
+
+
+def print_diffs(diffs: Dict[Path, Tuple[List[Finding], List[Finding]]]) -> None:
+    labels = {'error': '❌ ERROR', 'warning': '⚠️  WARNING'}
+    for path, (new, resolved) in diffs.items():
+        print(f"   {path}")
+        for level, message in new:
+            print(f"      ➕ {labels[level]}: {message}")
+        for level, message in resolved:
+            print(f"      ✔️  resolved {level}: {message}")
+
+
+def watch(session: WatchSession, directories: Iterable[Path], suffixes: Tuple[str, ...], poll: bool = False) -> None:
+    """Validate once, then revalidate on every save until interrupted"""
+    start = time.perf_counter()
+    errors, warnings = session.start()
+    watcher = create_watcher(directories, suffixes, poll)
+    print(f"👀 Watching {len(session.findings)} files ({type(watcher).__name__}): {errors} errors, "
+          f"{warnings} warnings, ready in {time.perf_counter() - start:.2f}s. Ctrl-C to stop.")
+    try:
+        while True:
+            changed = watcher.wait()
+            if watcher.overflowed:
+                # Events were dropped; treat every file as changed
+                watcher.overflowed = False
+                changed = set(session.findings) | changed
+            if not changed:
+                continue
+            start = time.perf_counter()
+            diffs = session.update(changed)
+            elapsed = (time.perf_counter() - start) * 1000
+            errors, warnings = session.counts()
+            names = ', '.join(sorted(str(path) for path in changed)[:3]) + (' ...' if len(changed) > 3 else '')
+            print(f"\n📝 {names}: revalidated in {elapsed:.0f} ms, {errors} errors, {warnings} warnings"
+                  + ("" if diffs else ", no change in findings"))
+            print_diffs(diffs)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+        session.close()